@@ -2,6 +2,8 @@ from fastapi import FastAPI, HTTPException, status
 from pydantic import BaseModel, Field
 from typing import List, Optional
 
+from store import TaskStore
+
 # Starte die App mit mehr Informationen
 app = FastAPI(
     title="Paul's Task API - Easy Version",
@@ -32,9 +34,8 @@ class TaskUpdate(BaseModel):
     done: Optional[bool] = Field(None, description="Neuer Status der Task")
 
 
-# Temporärer Speicher (statt Datenbank)
-tasks: List[Task] = []
-next_id = 1
+# Temporärer Speicher (statt Datenbank), indiziert nach ID und Status
+store = TaskStore()
 
 
 # Root-Endpunkt
@@ -53,7 +54,7 @@ def get_tasks():
     """
     Gibt alle Tasks zurück
     """
-    return tasks
+    return store.all()
 
 
 # GET eine spezifische Task
@@ -62,7 +63,7 @@ def get_task(task_id: int):
     """
     Gibt eine spezifische Task basierend auf der ID zurück
     """
-    task = next((t for t in tasks if t.id == task_id), None)
+    task = store.get(task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -79,14 +80,7 @@ def create_task(task_data: TaskCreate):
     """
     Erstellt eine neue Task
     """
-    global next_id
-
-    new_task = Task(id=next_id, title=task_data.title, done=task_data.done)
-
-    tasks.append(new_task)
-    next_id += 1
-
-    return new_task
+    return store.add(task_data.title, task_data.done)
 
 
 # PUT Task aktualisieren
@@ -95,18 +89,13 @@ def update_task(task_id: int, task_update: TaskUpdate):
     """
     Aktualisiert eine existierende Task
     """
-    task = next((t for t in tasks if t.id == task_id), None)
+    task = store.update(task_id, title=task_update.title, done=task_update.done)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task mit ID {task_id} nicht gefunden",
         )
 
-    if task_update.title is not None:
-        task.title = task_update.title
-    if task_update.done is not None:
-        task.done = task_update.done
-
     return task
 
 
@@ -116,15 +105,12 @@ def delete_task(task_id: int):
     """
     Löscht eine Task basierend auf der ID
     """
-    global tasks
-    task = next((t for t in tasks if t.id == task_id), None)
-    if not task:
+    if not store.delete(task_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task mit ID {task_id} nicht gefunden",
         )
 
-    tasks = [t for t in tasks if t.id != task_id]
     return None
 
 
@@ -134,14 +120,13 @@ def mark_task_complete(task_id: int):
     """
     Markiert eine Task als erledigt
     """
-    task = next((t for t in tasks if t.id == task_id), None)
+    task = store.update(task_id, done=True)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task mit ID {task_id} nicht gefunden",
         )
 
-    task.done = True
     return task
 
 
@@ -150,14 +135,13 @@ def mark_task_incomplete(task_id: int):
     """
     Markiert eine Task als nicht erledigt
     """
-    task = next((t for t in tasks if t.id == task_id), None)
+    task = store.update(task_id, done=False)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task mit ID {task_id} nicht gefunden",
         )
 
-    task.done = False
     return task
 
 
@@ -173,7 +157,4 @@ def get_tasks_by_status(status_filter: str):
             detail="Status muss 'completed' oder 'pending' sein",
         )
 
-    if status_filter == "completed":
-        return [task for task in tasks if task.done]
-    else:
-        return [task for task in tasks if not task.done]
\ No newline at end of file
+    return store.by_status(status_filter == "completed")
\ No newline at end of file
@@ -0,0 +1,98 @@
+from array import array
+from typing import Dict, List, Optional, Set
+
+
+class TaskStore:
+    """
+    Spaltenbasierter In-Memory-Speicher für Tasks.
+
+    Statt einer Liste von Pydantic-Objekten liegen die Felder in kompakten
+    Spalten (array/bytearray/list). Ein Dict ``id -> Slot`` macht Zugriffe per
+    ID zu O(1); zwei Sets mit den IDs erledigter und offener Tasks machen
+    Filtern und Zählen nach Status unabhängig von der Gesamtzahl der Tasks.
+    Gefiltert wird nach ID (= Anlage-Reihenfolge) sortiert, wie bei ``all()``.
+    """
+
+    def __init__(self) -> None:
+        self._ids = array("q")
+        self._titles: List[Optional[str]] = []
+        self._done = bytearray()
+        self._slots: Dict[int, int] = {}  # behält die Einfügereihenfolge
+        self._free: List[int] = []  # freie Slots gelöschter Tasks
+        self._completed: Set[int] = set()
+        self._pending: Set[int] = set()
+        self._next_id = 1
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _row(self, slot: int) -> dict:
+        return {
+            "id": self._ids[slot],
+            "title": self._titles[slot],
+            "done": bool(self._done[slot]),
+        }
+
+    def _set_done(self, task_id: int, slot: int, done: bool) -> None:
+        self._done[slot] = done
+        if done:
+            self._pending.discard(task_id)
+            self._completed.add(task_id)
+        else:
+            self._completed.discard(task_id)
+            self._pending.add(task_id)
+
+    def add(self, title: str, done: bool = False) -> dict:
+        task_id = self._next_id
+        self._next_id += 1
+        if self._free:
+            slot = self._free.pop()
+            self._ids[slot] = task_id
+            self._titles[slot] = title
+        else:
+            slot = len(self._ids)
+            self._ids.append(task_id)
+            self._titles.append(title)
+            self._done.append(0)
+        self._slots[task_id] = slot
+        self._set_done(task_id, slot, done)
+        return self._row(slot)
+
+    def get(self, task_id: int) -> Optional[dict]:
+        slot = self._slots.get(task_id)
+        return None if slot is None else self._row(slot)
+
+    def update(
+        self, task_id: int, title: Optional[str] = None, done: Optional[bool] = None
+    ) -> Optional[dict]:
+        slot = self._slots.get(task_id)
+        if slot is None:
+            return None
+        if title is not None:
+            self._titles[slot] = title
+        if done is not None:
+            self._set_done(task_id, slot, done)
+        return self._row(slot)
+
+    def delete(self, task_id: int) -> bool:
+        slot = self._slots.pop(task_id, None)
+        if slot is None:
+            return False
+        self._titles[slot] = None
+        self._completed.discard(task_id)
+        self._pending.discard(task_id)
+        self._free.append(slot)
+        return True
+
+    def all(self) -> List[dict]:
+        return [self._row(slot) for slot in self._slots.values()]
+
+    def by_status(self, done: bool) -> List[dict]:
+        # Sortiert wird nur das Ergebnis, nicht der ganze Speicher.
+        ids = sorted(self._completed if done else self._pending)
+        return [self._row(self._slots[task_id]) for task_id in ids]
+
+    def count(self, done: Optional[bool] = None) -> int:
+        if done is None:
+            return len(self._slots)
+        return len(self._completed if done else self._pending)
@@ -0,0 +1,66 @@
+from store import TaskStore
+
+
+def _titles(rows):
+    return [row["title"] for row in rows]
+
+
+def test_add_get_and_count():
+    store = TaskStore()
+    first = store.add("a")
+    second = store.add("b", done=True)
+    assert first == {"id": 1, "title": "a", "done": False}
+    assert store.get(second["id"]) == {"id": 2, "title": "b", "done": True}
+    assert store.get(99) is None
+    assert len(store) == store.count() == 2
+    assert store.count(done=True) == store.count(done=False) == 1
+
+
+def test_by_status_lists_tasks_in_id_order():
+    # Same order as all(), no matter when a task got its status.
+    store = TaskStore()
+    ids = [store.add(title)["id"] for title in "abcd"]
+    store.update(ids[2], done=True)
+    store.update(ids[0], done=True)
+    assert _titles(store.by_status(True)) == ["a", "c"]
+    assert _titles(store.by_status(False)) == ["b", "d"]
+    store.update(ids[2], done=False)
+    assert _titles(store.by_status(True)) == ["a"]
+    assert _titles(store.by_status(False)) == ["b", "c", "d"]
+
+
+def test_update_title_and_done():
+    store = TaskStore()
+    task_id = store.add("a")["id"]
+    assert store.update(task_id, title="renamed")["title"] == "renamed"
+    assert store.update(task_id, done=True)["done"] is True
+    assert store.count(done=True) == 1 and store.count(done=False) == 0
+    assert store.update(99, done=True) is None
+
+
+def test_delete_removes_from_every_index():
+    store = TaskStore()
+    keep = store.add("keep")["id"]
+    gone = store.add("gone", done=True)["id"]
+    assert store.delete(gone)
+    assert not store.delete(gone)
+    assert store.get(gone) is None
+    assert store.count(done=True) == 0
+    assert store.by_status(True) == []
+    assert [row["id"] for row in store.all()] == [keep]
+
+
+def test_freed_slot_is_reused_with_fresh_state():
+    store = TaskStore()
+    old = store.add("old", done=True)["id"]
+    store.add("other")
+    store.delete(old)
+    new = store.add("new")
+    # New id, same storage slot, and the old done flag doesn't leak through.
+    assert new["id"] == 3
+    assert store._slots[new["id"]] == 0
+    assert new == {"id": 3, "title": "new", "done": False}
+    assert store.get(old) is None
+    assert _titles(store.by_status(False)) == ["other", "new"]
+    assert store.by_status(True) == []
+    assert store.count() == 2
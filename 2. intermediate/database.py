@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine  # type: ignore
+from sqlalchemy import create_engine, event  # type: ignore
 from sqlalchemy.orm import sessionmaker, declarative_base  # type: ignore
 
 # SQLite-Datenbank im Projektordner
@@ -8,3 +8,21 @@ engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)  # type: ignore
 
 Base = declarative_base()  # type: ignore
+
+
+@event.listens_for(engine, "connect")  # type: ignore
+def set_sqlite_pragmas(dbapi_connection, connection_record):  # type: ignore
+    """Wird für jede neue Verbindung aufgerufen.
+
+    WAL: Leser blockieren nicht mehr, während geschrieben wird.
+    synchronous=NORMAL: weniger fsyncs, im WAL-Modus trotzdem konsistent.
+    mmap/cache: mehr Seiten im RAM statt von der Platte.
+    busy_timeout: bei gesperrter DB bis zu 5s warten statt Fehler.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
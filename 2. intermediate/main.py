@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException, status
 from sqlalchemy.orm import Session  # type: ignore[import]
 from typing import List
@@ -5,13 +6,21 @@ import models
 import schemas
 from database import SessionLocal, engine  # type: ignore
 
-# Tabellen erzeugen (falls noch nicht vorhanden)
-models.Base.metadata.create_all(bind=engine)  # type: ignore
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Beim Start statt beim Import: Tabellen erzeugen (falls noch nicht
+    # vorhanden), beim Beenden die Verbindungen schließen
+    models.Base.metadata.create_all(bind=engine)  # type: ignore
+    yield
+    engine.dispose()  # type: ignore
+
 
 app = FastAPI(
     title="Paul's Task API - Intermediate Version",
     description="Eine erweiterte Task-Management API mit SQLite Datenbank",
     version="2.0.0",
+    lifespan=lifespan,
 )
 
 
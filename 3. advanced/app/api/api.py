@@ -1,9 +1,57 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.api.routes import auth, tasks, users, health
+from app.api.routes import auth, tasks, task_export, task_import, users, health
+from app.core.config import settings
+from app.core.rate_limit import limiter
+
+
+def _prefer_async(sync_router: APIRouter, async_router: APIRouter) -> APIRouter:
+    # Async handlers replace their sync twins (same path + methods); routes that
+    # only exist in the sync module keep their position, so ordering-sensitive
+    # paths such as /tasks/{task_id} still resolve the same way.
+    overrides = {
+        (route.path, frozenset(route.methods)): route for route in async_router.routes
+    }
+    merged = APIRouter()
+    for route in sync_router.routes:
+        merged.routes.append(
+            overrides.pop((route.path, frozenset(route.methods)), route)
+        )
+    merged.routes.extend(overrides.values())
+    return merged
+
+
+if settings.async_db:
+    from app.api.routes.aio import auth as async_auth
+    from app.api.routes.aio import tasks as async_tasks
+    from app.api.routes.aio import users as async_users
+
+    auth_router = _prefer_async(auth.router, async_auth.router)
+    users_router = _prefer_async(users.router, async_users.router)
+    tasks_router = _prefer_async(tasks.router, async_tasks.router)
+else:
+    auth_router, users_router, tasks_router = auth.router, users.router, tasks.router
+
+# One bucket per route group and caller (user id, or IP without a token).
+auth_limit = Depends(limiter.dependency("auth", settings.rate_limit_auth))
+api_limit = Depends(limiter.dependency("api", settings.rate_limit_api))
+transfer_limit = Depends(limiter.dependency("transfer", settings.rate_limit_transfer))
 
 api_router = APIRouter()
 api_router.include_router(health.router, prefix="/health", tags=["Health"])
-api_router.include_router(auth.router, prefix="/auth", tags=["Auth"])
-api_router.include_router(users.router, prefix="/users", tags=["Users"])
-api_router.include_router(tasks.router, prefix="/tasks", tags=["Tasks"])
+api_router.include_router(
+    auth_router, prefix="/auth", tags=["Auth"], dependencies=[auth_limit]
+)
+api_router.include_router(
+    users_router, prefix="/users", tags=["Users"], dependencies=[api_limit]
+)
+# Fixed /tasks/... paths go before the task router's /tasks/{task_id}.
+api_router.include_router(
+    task_export.router, prefix="/tasks", tags=["Tasks"], dependencies=[transfer_limit]
+)
+api_router.include_router(
+    task_import.router, prefix="/tasks", tags=["Tasks"], dependencies=[transfer_limit]
+)
+api_router.include_router(
+    tasks_router, prefix="/tasks", tags=["Tasks"], dependencies=[api_limit]
+)
@@ -0,0 +1,304 @@
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, List, Optional
+
+from app.api.routes.tasks import (
+    archived_task_statement,
+    create_task_statement,
+    delete_task_statement,
+    list_tasks_query,
+    not_modified,
+    precondition_failed,
+    search_query,
+    set_list_headers,
+    set_next_cursor,
+    set_next_rank_cursor,
+    set_task_etag,
+    task_not_found,
+    task_stats,
+    task_version_statement,
+    update_task_statement,
+    write_new_task,
+    write_task_delete,
+    write_task_update,
+)
+from app.core.auth_cache import CurrentUser
+from app.core.config import settings
+from app.core.deps import (
+    get_async_current_active_user,
+    get_async_db,
+    get_async_read_current_active_user,
+    get_async_read_db,
+)
+from app.core.events import publish_task_events
+from app.core.etag import collection_etag, if_match_versions, none_match, task_etag
+from app.core.fast_json import only_task_read_columns, task_list_response
+from app.db.group_commit import group_write
+from app.db.task_counters import bump_collection_statement, collection_state_statement
+from app.models.task import Task
+from app.schemas.task import TaskCreate, TaskRead, TaskStats, TaskUpdate
+
+router = APIRouter()
+
+
+async def _bump_collection(
+    db: AsyncSession, owner_id: int, total: int = 0, done: int = 0
+) -> None:
+    await db.execute(bump_collection_statement(owner_id, total, done))
+
+
+async def _missing_task(
+    db: AsyncSession, task_id: int, owner_id: int, versions: Optional[list[int]]
+) -> HTTPException:
+    if versions is not None and (
+        await db.execute(task_version_statement(task_id, owner_id))
+    ).first():
+        return precondition_failed()
+    return task_not_found()
+
+
+async def _write_task_update(
+    db: AsyncSession,
+    task_id: int,
+    owner_id: int,
+    values: dict[str, Any],
+    versions: Optional[list[int]],
+) -> tuple[Row, Optional[str]]:
+    # Mirrors the sync version: guarded done flip first, then the rest.
+    values = dict(values)
+    done = values.pop("done", None)
+    row, done_delta, wrote = None, 0, False
+    if done is not None:
+        stmt = update_task_statement(task_id, owner_id, {"done": done}, versions, True)
+        row = (await db.execute(stmt)).first()
+        if row is not None:
+            done_delta, wrote, versions = (1 if done else -1), True, None
+    if values or row is None:
+        stmt = update_task_statement(task_id, owner_id, values, versions)
+        row = (await db.execute(stmt)).first()
+        if row is None:
+            raise await _missing_task(db, task_id, owner_id, versions)
+        wrote = wrote or stmt.is_dml
+    if not wrote:
+        return row, None
+    await _bump_collection(db, owner_id, done=done_delta)
+    return row, "completed" if done_delta > 0 else "updated"
+
+
+async def _update_owned_task(
+    db: AsyncSession,
+    task_id: int,
+    owner_id: int,
+    values: dict[str, Any],
+    versions: Optional[list[int]],
+) -> Row:
+    args = (task_id, owner_id, values, versions)
+    if settings.group_commit_enabled:
+        # The writer thread runs the sync twin in a shared transaction.
+        row, event_type = await group_write(write_task_update, *args)
+    else:
+        row, event_type = await _write_task_update(db, *args)
+        await db.commit()
+    if event_type:
+        publish_task_events(owner_id, event_type, [row])
+    return row
+
+
+async def _set_task_fields(
+    db: AsyncSession,
+    response: Response,
+    task_id: int,
+    owner_id: int,
+    values: dict[str, Any],
+    if_match: Optional[str],
+) -> Row:
+    versions = if_match_versions(if_match, task_id)
+    task = await _update_owned_task(db, task_id, owner_id, values, versions)
+    set_task_etag(response, task)
+    return task
+
+
+@router.post("/", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
+async def create_task(
+    task_in: TaskCreate,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_async_current_active_user),
+):
+    if settings.group_commit_enabled:
+        task = await group_write(write_new_task, current_user.id, task_in)
+    else:
+        stmt = create_task_statement(current_user.id, task_in)
+        task = (await db.execute(stmt)).first()
+        await _bump_collection(db, current_user.id, total=1, done=int(task.done))
+        await db.commit()
+    publish_task_events(current_user.id, "created", [task])
+    set_task_etag(response, task)
+    return task
+
+
+@router.get("/", response_model=List[TaskRead])
+async def list_tasks(
+    request: Request,
+    response: Response,
+    status_filter: Optional[str] = Query(None, description="completed|pending"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, description="Legacy paging, prefer cursor"),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from the X-Next-Cursor response header"
+    ),
+    include_total: bool = Query(
+        False, description="Send X-Total-Count, read from the per-user counters"
+    ),
+    include_archived: bool = Query(False, description="Also list archived tasks"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: CurrentUser = Depends(get_async_read_current_active_user),
+):
+    query = list_tasks_query(
+        current_user.id, status_filter, limit, offset, cursor, include_archived
+    )
+    state = (await db.execute(collection_state_statement(current_user.id))).first()
+    version = state.version if state else 0
+    etag = collection_etag(current_user.id, version, request.url.query)
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    if settings.fast_json:
+        tasks = (await db.execute(only_task_read_columns(query))).all()
+        response = task_list_response(tasks)
+    else:
+        tasks = (await db.execute(query)).scalars().all()
+    set_list_headers(
+        response, etag, state, status_filter, include_total, include_archived
+    )
+    set_next_cursor(response, tasks, limit)
+    return response if settings.fast_json else tasks
+
+
+@router.get("/stats", response_model=TaskStats)
+async def read_task_stats(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: CurrentUser = Depends(get_async_read_current_active_user),
+):
+    state = (await db.execute(collection_state_statement(current_user.id))).first()
+    return task_stats(state)
+
+
+@router.get("/search", response_model=List[TaskRead])
+async def search_tasks(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from the X-Next-Cursor response header"
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: CurrentUser = Depends(get_async_read_current_active_user),
+):
+    dialect_name = db.get_bind().dialect.name
+    query = search_query(dialect_name, current_user.id, q, limit, cursor)
+    rows = (await db.execute(query)).all()
+    set_next_rank_cursor(response, rows, limit)
+    return rows
+
+
+@router.get("/{task_id}", response_model=TaskRead)
+async def read_task(
+    task_id: int,
+    response: Response,
+    include_archived: bool = Query(False, description="Also look in the archive"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: CurrentUser = Depends(get_async_read_current_active_user),
+):
+    if if_none_match:
+        version = await db.scalar(
+            task_version_statement(task_id, current_user.id, include_archived)
+        )
+        if version is None:
+            raise task_not_found()
+        etag = task_etag(task_id, version)
+        if none_match(if_none_match, etag):
+            return not_modified(etag)
+    task = await db.scalar(
+        select(Task).where(Task.id == task_id, Task.owner_id == current_user.id)
+    )
+    if not task and include_archived:
+        stmt = archived_task_statement(task_id, current_user.id)
+        task = (await db.execute(stmt)).first()
+    if not task:
+        raise task_not_found()
+    set_task_etag(response, task)
+    return task
+
+
+@router.put("/{task_id}", response_model=TaskRead)
+async def update_task(
+    task_id: int,
+    task_in: TaskUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_async_current_active_user),
+):
+    values = task_in.model_dump(exclude_none=True)
+    return await _set_task_fields(
+        db, response, task_id, current_user.id, values, if_match
+    )
+
+
+@router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_task(
+    task_id: int,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_async_current_active_user),
+):
+    versions = if_match_versions(if_match, task_id)
+    if settings.group_commit_enabled:
+        await group_write(write_task_delete, task_id, current_user.id, versions)
+    else:
+        stmt = delete_task_statement(task_id, current_user.id, versions)
+        row = (await db.execute(stmt)).first()
+        if row is None:
+            raise await _missing_task(db, task_id, current_user.id, versions)
+        await _bump_collection(db, current_user.id, total=-1, done=-int(row.done))
+        await db.commit()
+    publish_task_events(current_user.id, "deleted", [task_id])
+    return None
+
+
+@router.patch("/{task_id}/complete", response_model=TaskRead)
+async def mark_complete(
+    task_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_async_current_active_user),
+):
+    return await _set_task_fields(
+        db, response, task_id, current_user.id, {"done": True}, if_match
+    )
+
+
+@router.patch("/{task_id}/incomplete", response_model=TaskRead)
+async def mark_incomplete(
+    task_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_async_current_active_user),
+):
+    return await _set_task_fields(
+        db, response, task_id, current_user.id, {"done": False}, if_match
+    )
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth_cache import CurrentUser
+from app.core.deps import (
+    get_async_db,
+    get_async_read_current_active_user,
+    get_async_read_db,
+)
+from app.models.user import User
+from app.schemas.user import UserRead
+
+router = APIRouter()
+
+
+@router.get("/me", response_model=UserRead)
+async def read_current_user(
+    current_user: CurrentUser = Depends(get_async_read_current_active_user),
+    db: AsyncSession = Depends(get_async_read_db),
+    primary: AsyncSession = Depends(get_async_db),
+):
+    user = await db.get(User, current_user.id)
+    if not user and db is not primary:  # not on the replica yet
+        user = await primary.get(User, current_user.id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    return user
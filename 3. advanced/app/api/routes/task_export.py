@@ -0,0 +1,119 @@
+import csv
+import io
+import json
+from enum import Enum
+from typing import Iterator
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, union_all
+
+from app.core.auth_cache import CurrentUser
+from app.core.config import settings
+from app.core.deps import get_current_active_user
+from app.db.session import SessionLocal
+from app.models.archived_task import ArchivedTask
+from app.models.task import Task
+
+router = APIRouter()
+tasks_table = Task.__table__
+archived_table = ArchivedTask.__table__
+
+EXPORT_COLUMNS = ("id", "title", "done", "owner_id", "created_at", "updated_at")
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+def _export_query(owner_id: int, include_archived: bool):
+    query = select(*(tasks_table.c[name] for name in EXPORT_COLUMNS)).where(
+        tasks_table.c.owner_id == owner_id
+    )
+    if include_archived:
+        archived = select(*(archived_table.c[name] for name in EXPORT_COLUMNS))
+        query = union_all(query, archived.where(archived_table.c.owner_id == owner_id))
+        return query.order_by(query.selected_columns.id)
+    return query.order_by(tasks_table.c.id)
+
+
+def _row_batches(owner_id: int, include_archived: bool) -> Iterator[list]:
+    # The response outlives the request-scoped session, so the stream owns its
+    # own. yield_per keeps at most one batch in memory and switches psycopg2
+    # to a server-side cursor.
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            _export_query(owner_id, include_archived).execution_options(
+                yield_per=settings.export_batch_size
+            )
+        )
+        yield from result.partitions()
+    finally:
+        db.close()
+
+
+def _ndjson_chunks(owner_id: int, include_archived: bool) -> Iterator[bytes]:
+    for rows in _row_batches(owner_id, include_archived):
+        yield "".join(
+            json.dumps(
+                {
+                    "id": row.id,
+                    "title": row.title,
+                    "done": row.done,
+                    "owner_id": row.owner_id,
+                    "created_at": row.created_at.isoformat(),
+                    "updated_at": row.updated_at.isoformat(),
+                },
+                ensure_ascii=False,
+            )
+            + "\n"
+            for row in rows
+        ).encode()
+
+
+def _csv_chunks(owner_id: int, include_archived: bool) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue().encode()
+    for rows in _row_batches(owner_id, include_archived):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            (
+                row.id,
+                row.title,
+                row.done,
+                row.owner_id,
+                row.created_at.isoformat(),
+                row.updated_at.isoformat(),
+            )
+            for row in rows
+        )
+        yield buffer.getvalue().encode()
+
+
+@router.get("/export", summary="Stream all tasks as NDJSON or CSV")
+def export_tasks(
+    format: ExportFormat = Query(ExportFormat.ndjson),
+    include_archived: bool = Query(False, description="Also export archived tasks"),
+    current_user: CurrentUser = Depends(get_current_active_user),
+):
+    chunks = (
+        _ndjson_chunks(current_user.id, include_archived)
+        if format is ExportFormat.ndjson
+        else _csv_chunks(current_user.id, include_archived)
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format.value}"'},
+    )
@@ -0,0 +1,184 @@
+import codecs
+import csv
+import io
+import json
+import time
+from enum import Enum
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.auth_cache import CurrentUser
+from app.core.config import settings
+from app.core.deps import get_current_active_user
+from app.db.session import SessionLocal
+from app.db.task_counters import bump_collection
+from app.models.task import Task
+from app.schemas.task import TaskCreate, TaskImportError, TaskImportResult
+
+router = APIRouter()
+tasks_table = Task.__table__
+
+# Far above any valid task; bounds what a stray CSV quote can buffer.
+MAX_RECORD_CHARS = 64 * 1024
+
+
+class ImportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+def _detect_format(request: Request) -> ImportFormat:
+    content_type = request.headers.get("content-type", "")
+    if "csv" in content_type:
+        return ImportFormat.csv
+    if "ndjson" in content_type or "jsonl" in content_type:
+        return ImportFormat.ndjson
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Send text/csv or application/x-ndjson, or pass ?format=",
+    )
+
+
+async def _records(
+    request: Request, fmt: ImportFormat
+) -> AsyncIterator[tuple[int, str]]:
+    # Split the body into (first line number, record) as it arrives. A CSV
+    # record only ends at a newline outside quotes; quotes are escaped by
+    # doubling, so the quote state flips with every quote character. It is
+    # carried across chunks, so each character is counted once. A record that
+    # is still open after MAX_RECORD_CHARS (a stray quote) ends at the next
+    # newline and fails to parse instead of buffering the rest of the body.
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    scanned = 0  # pending[:scanned] is already counted
+    in_quotes = False
+    line = 1
+    async for chunk in request.stream():
+        pending += decoder.decode(chunk)
+        record_start = 0
+        while (end := pending.find("\n", scanned)) != -1:
+            if fmt is ImportFormat.csv:
+                in_quotes ^= pending.count('"', scanned, end) % 2 == 1
+            scanned = end + 1
+            if in_quotes and end - record_start < MAX_RECORD_CHARS:
+                continue
+            yield line, pending[record_start:end].rstrip("\r")
+            line += pending.count("\n", record_start, scanned)
+            record_start = scanned
+            in_quotes = False
+        if fmt is ImportFormat.csv:
+            in_quotes ^= pending.count('"', scanned) % 2 == 1
+        pending = pending[record_start:]
+        scanned = len(pending)
+    pending += decoder.decode(b"", final=True)
+    if pending.strip():
+        yield line, pending.rstrip("\r")
+
+
+def _write_chunk(db: Session, owner_id: int, rows: list[dict], done: int) -> None:
+    _load_chunk(db, rows)
+    bump_collection(db, owner_id, len(rows), done)
+    db.commit()
+
+
+def _load_chunk(db: Session, rows: list[dict]) -> None:
+    connection = db.connection()
+    if connection.dialect.name == "postgresql" and connection.dialect.driver == (
+        "psycopg2"
+    ):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(
+            (row["title"], row["done"], row["owner_id"]) for row in rows
+        )
+        buffer.seek(0)
+        with connection.connection.dbapi_connection.cursor() as cursor:
+            cursor.copy_expert(
+                "COPY tasks (title, done, owner_id) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+    else:
+        connection.execute(insert(tasks_table), rows)
+
+
+@router.post("/import", response_model=TaskImportResult)
+async def import_tasks(
+    request: Request,
+    format: Optional[ImportFormat] = Query(
+        None, description="Defaults to the request Content-Type"
+    ),
+    current_user: CurrentUser = Depends(get_current_active_user),
+):
+    fmt = format or _detect_format(request)
+    started = time.perf_counter()
+    imported = failed = 0
+    errors: list[TaskImportError] = []
+    chunk: list[dict] = []
+    chunk_done = 0
+    header: Optional[list[str]] = None
+
+    # The body is consumed on the event loop. Every full chunk is written and
+    # committed together with its counter update from the threadpool, so no
+    # transaction stays open while waiting for a slow client. A failed upload
+    # keeps the chunks committed before the failure.
+    db = SessionLocal()
+    try:
+        async for line, record in _records(request, fmt):
+            if not record.strip():
+                continue
+            try:
+                if fmt is ImportFormat.ndjson:
+                    data = json.loads(record)
+                elif header is None:
+                    header = [name.strip() for name in next(csv.reader([record]))]
+                    continue
+                else:
+                    values = next(csv.reader([record], strict=True))
+                    data = dict(zip(header, values))
+                    if data.get("done") == "":
+                        del data["done"]
+                task_in = TaskCreate.model_validate(data)
+            except (ValueError, ValidationError, csv.Error) as exc:
+                failed += 1
+                if len(errors) < settings.import_max_errors:
+                    message = (
+                        exc.errors()[0]["msg"]
+                        if isinstance(exc, ValidationError)
+                        else str(exc)
+                    )
+                    errors.append(TaskImportError(line=line, error=message))
+                continue
+            chunk_done += task_in.done
+            chunk.append(
+                {
+                    "title": task_in.title,
+                    "done": task_in.done,
+                    "owner_id": current_user.id,
+                }
+            )
+            if len(chunk) >= settings.import_chunk_size:
+                await run_in_threadpool(
+                    _write_chunk, db, current_user.id, chunk, chunk_done
+                )
+                imported += len(chunk)
+                chunk, chunk_done = [], 0
+        if chunk:
+            await run_in_threadpool(
+                _write_chunk, db, current_user.id, chunk, chunk_done
+            )
+            imported += len(chunk)
+    finally:
+        await run_in_threadpool(db.close)
+
+    elapsed = time.perf_counter() - started
+    return TaskImportResult(
+        imported=imported,
+        failed=failed,
+        elapsed_seconds=round(elapsed, 3),
+        rows_per_second=round(imported / elapsed, 1) if elapsed else 0.0,
+        errors=errors,
+    )
@@ -1,66 +1,655 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from collections import defaultdict
+from datetime import datetime
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import (
+    Row,
+    Select,
+    case,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.orm import Session, aliased
+from typing import Any, List, Optional, Sequence
 
-from app.core.deps import get_current_active_user, get_db
+from app.core.auth_cache import CurrentUser
+from app.core.config import settings
+from app.core.deps import (
+    get_current_active_user,
+    get_db,
+    get_read_current_active_user,
+    get_read_db,
+)
+from app.core.events import publish_task_events, task_event_stream
+from app.core.etag import collection_etag, if_match_versions, none_match, task_etag
+from app.core.fast_json import only_task_read_columns, task_list_response
+from app.core.pagination import (
+    InvalidCursor,
+    decode_cursor,
+    decode_rank_cursor,
+    encode_cursor,
+    encode_rank_cursor,
+)
+from app.db.group_commit import commit_write
+from app.db.search import SEARCH_DIALECTS, search_tasks_query, search_terms
+from app.db.task_counters import bump_collection, collection_state_statement
+from app.models.archived_task import ArchivedTask
 from app.models.task import Task
-from app.models.user import User
-from app.schemas.task import TaskCreate, TaskRead, TaskUpdate
+from app.schemas.task import (
+    TaskBulkCreate,
+    TaskBulkDelete,
+    TaskBulkResult,
+    TaskBulkUpdate,
+    TaskCreate,
+    TaskRead,
+    TaskStats,
+    TaskUpdate,
+)
 
 router = APIRouter()
+tasks_table = Task.__table__
+archived_table = ArchivedTask.__table__
+
+
+def _owned_archived_rows(owner_id: int) -> Select:
+    return select(*(archived_table.c[column.name] for column in tasks_table.c)).where(
+        archived_table.c.owner_id == owner_id
+    )
+
+
+def owned_task_source(owner_id: int, include_archived: bool):
+    """`Task`, or `Task` mapped over the owner's hot and archived rows.
+
+    Either way the result is queried like Task and yields Task objects; only
+    ?include_archived=true pays for reading the second table.
+    """
+    if not include_archived:
+        return Task
+    rows = union_all(
+        select(tasks_table).where(tasks_table.c.owner_id == owner_id),
+        _owned_archived_rows(owner_id),
+    )
+    return aliased(Task, rows.subquery("all_tasks"), name="all_tasks")
+
+
+def _keyset_after(source, owner_id: int, created_at: datetime, task_id: int):
+    # Compare against the anchor row's stored timestamp so the predicate does not
+    # depend on how the driver round-trips datetimes (SQLite keeps them as text).
+    # The cursor's own timestamp is only used if the anchor row was deleted. The
+    # row-value comparison lets the owner/created_at/id index seek to the page.
+    anchor_created_at = func.coalesce(
+        select(source.created_at)
+        .where(source.id == task_id, source.owner_id == owner_id)
+        .scalar_subquery(),
+        created_at,
+    )
+    return tuple_(source.created_at, source.id) < tuple_(anchor_created_at, task_id)
+
+
+def list_tasks_query(
+    owner_id: int,
+    status_filter: Optional[str],
+    limit: int,
+    offset: int,
+    cursor: Optional[str],
+    include_archived: bool = False,
+) -> Select:
+    if status_filter and status_filter not in {"completed", "pending"}:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="status_filter must be 'completed' or 'pending'",
+        )
+    # Archived tasks are all done, pending lists never need the archive.
+    include_archived = include_archived and status_filter != "pending"
+    source = owned_task_source(owner_id, include_archived)
+    query = select(source).where(source.owner_id == owner_id)
+    if status_filter == "completed":
+        query = query.where(source.done.is_(True))
+    elif status_filter == "pending":
+        query = query.where(source.done.is_(False))
+    if cursor:
+        if offset:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="cursor and offset cannot be combined",
+            )
+        try:
+            created_at, task_id = decode_cursor(cursor)
+        except InvalidCursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+        query = query.where(_keyset_after(source, owner_id, created_at, task_id))
+    return (
+        query.order_by(source.created_at.desc(), source.id.desc())
+        .offset(offset)
+        .limit(limit)
+    )
+
+
+def search_query(
+    dialect_name: str, owner_id: int, q: str, limit: int, cursor: Optional[str]
+) -> Select:
+    if dialect_name not in SEARCH_DIALECTS:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"Search is not supported on {dialect_name}",
+        )
+    terms = search_terms(q)
+    if not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="q must contain at least one word",
+        )
+    after = None
+    if cursor:
+        try:
+            after = decode_rank_cursor(cursor)
+        except InvalidCursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+    return search_tasks_query(dialect_name, owner_id, terms, limit, after)
+
+
+def task_not_found() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+
+def precondition_failed() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Task was modified, reload it and retry",
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def _owned_task(task_id: int, owner_id: int, versions: Optional[list[int]] = None):
+    criteria = (tasks_table.c.id == task_id, tasks_table.c.owner_id == owner_id)
+    if versions is not None:
+        criteria += (tasks_table.c.version.in_(versions),)
+    return criteria
+
+
+def _owned_tasks(task_ids: Sequence[int], owner_id: int):
+    return tasks_table.c.id.in_(task_ids), tasks_table.c.owner_id == owner_id
+
+
+def update_task_statement(
+    task_id: int,
+    owner_id: int,
+    values: dict[str, Any],
+    versions: Optional[list[int]] = None,
+    only_if_changed: bool = False,
+):
+    criteria = _owned_task(task_id, owner_id, versions)
+    return _update_statement(criteria, values, only_if_changed)
+
+
+def _update_statement(criteria, values: dict[str, Any], only_if_changed=False):
+    # One owner-scoped UPDATE ... RETURNING replaces SELECT + COMMIT + refresh.
+    # updated_at only moves when a value actually changes, like the ORM flush
+    # used to behave, and so does the version; an empty update is a plain read.
+    # only_if_changed skips unchanged rows, so RETURNING lists exactly the rows
+    # whose values flipped.
+    if not values:
+        return select(tasks_table).where(*criteria)
+    changed = or_(
+        *(tasks_table.c[name].is_distinct_from(value) for name, value in values.items())
+    )
+    if only_if_changed:
+        criteria = (*criteria, changed)
+    return (
+        update(tasks_table)
+        .where(*criteria)
+        .values(
+            **values,
+            updated_at=case((changed, func.now()), else_=tasks_table.c.updated_at),
+            version=case(
+                (changed, tasks_table.c.version + 1), else_=tasks_table.c.version
+            ),
+        )
+        .returning(*tasks_table.c)
+    )
+
+
+def create_task_statement(owner_id: int, task_in: TaskCreate):
+    return (
+        insert(tasks_table)
+        .values(title=task_in.title, done=task_in.done, owner_id=owner_id)
+        .returning(*tasks_table.c)
+    )
+
+
+def delete_task_statement(
+    task_id: int, owner_id: int, versions: Optional[list[int]] = None
+):
+    return (
+        delete(tasks_table)
+        .where(*_owned_task(task_id, owner_id, versions))
+        .returning(tasks_table.c.id, tasks_table.c.done)
+    )
+
+
+def task_version_statement(task_id: int, owner_id: int, include_archived=False):
+    query = select(tasks_table.c.version).where(*_owned_task(task_id, owner_id))
+    if include_archived:
+        query = query.union_all(
+            select(archived_table.c.version).where(
+                archived_table.c.id == task_id, archived_table.c.owner_id == owner_id
+            )
+        )
+    return query
+
+
+def archived_task_statement(task_id: int, owner_id: int):
+    return _owned_archived_rows(owner_id).where(archived_table.c.id == task_id)
+
+
+def task_stats(state: Optional[Row]) -> TaskStats:
+    total, done = (state.total, state.done) if state else (0, 0)
+    return TaskStats(total=total, done=done, pending=total - done)
+
+
+def _missing_task(
+    db: Session, task_id: int, owner_id: int, versions: Optional[list[int]]
+) -> HTTPException:
+    # Only a failed If-Match needs the extra lookup to tell 412 from 404.
+    if versions is not None and db.execute(
+        task_version_statement(task_id, owner_id)
+    ).first():
+        return precondition_failed()
+    return task_not_found()
+
+
+# The write_* helpers stage a change without committing; commit_write()
+# commits it right away or, with GROUP_COMMIT_ENABLED, together with other
+# requests' writes.
+def write_new_task(db: Session, owner_id: int, task_in: TaskCreate) -> Row:
+    row = db.execute(create_task_statement(owner_id, task_in)).first()
+    bump_collection(db, owner_id, total=1, done=int(row.done))
+    return row
+
+
+def _create_task(db: Session, owner_id: int, task_in: TaskCreate) -> Row:
+    row = commit_write(db, write_new_task, owner_id, task_in)
+    publish_task_events(owner_id, "created", [row])
+    return row
+
+
+def write_task_update(
+    db: Session,
+    task_id: int,
+    owner_id: int,
+    values: dict[str, Any],
+    versions: Optional[list[int]],
+) -> tuple[Row, Optional[str]]:
+    # A done flip runs as its own guarded UPDATE (... AND done IS DISTINCT FROM
+    # :done) so its RETURNING row says whether the counters move, without
+    # reading the old row first. Remaining fields, or a plain read when the
+    # task already had that state, follow in a second statement.
+    values = dict(values)
+    done = values.pop("done", None)
+    row, done_delta, wrote = None, 0, False
+    if done is not None:
+        stmt = update_task_statement(task_id, owner_id, {"done": done}, versions, True)
+        row = db.execute(stmt).first()
+        if row is not None:
+            done_delta, wrote, versions = (1 if done else -1), True, None
+    if values or row is None:
+        stmt = update_task_statement(task_id, owner_id, values, versions)
+        row = db.execute(stmt).first()
+        if row is None:
+            raise _missing_task(db, task_id, owner_id, versions)
+        wrote = wrote or stmt.is_dml
+    if not wrote:
+        return row, None
+    bump_collection(db, owner_id, done=done_delta)
+    return row, "completed" if done_delta > 0 else "updated"
+
+
+def _update_owned_task(
+    db: Session,
+    task_id: int,
+    owner_id: int,
+    values: dict[str, Any],
+    versions: Optional[list[int]],
+) -> Row:
+    row, event_type = commit_write(
+        db, write_task_update, task_id, owner_id, values, versions
+    )
+    if event_type:
+        publish_task_events(owner_id, event_type, [row])
+    return row
+
+
+def write_task_delete(
+    db: Session, task_id: int, owner_id: int, versions: Optional[list[int]]
+) -> None:
+    row = db.execute(delete_task_statement(task_id, owner_id, versions)).first()
+    if row is None:
+        raise _missing_task(db, task_id, owner_id, versions)
+    bump_collection(db, owner_id, total=-1, done=-int(row.done))
+
+
+def _delete_owned_task(
+    db: Session, task_id: int, owner_id: int, versions: Optional[list[int]]
+) -> None:
+    commit_write(db, write_task_delete, task_id, owner_id, versions)
+    publish_task_events(owner_id, "deleted", [task_id])
+
+
+def _check_batch_size(size: int) -> None:
+    if size > settings.bulk_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.bulk_max_items} items per request",
+        )
+
+
+def set_task_etag(response: Response, task) -> None:
+    response.headers["ETag"] = task_etag(task.id, task.version)
+
+
+def set_list_headers(
+    response: Response,
+    etag: str,
+    state: Optional[Row],
+    status_filter: Optional[str],
+    include_total: bool,
+    include_archived: bool = False,
+) -> None:
+    response.headers["ETag"] = etag
+    if include_total:
+        stats = task_stats(state)
+        # The counters include archived tasks, which are all done.
+        archived = state.archived if state and not include_archived else 0
+        total = {"completed": stats.done - archived, "pending": stats.pending}.get(
+            status_filter, stats.total - archived
+        )
+        response.headers["X-Total-Count"] = str(total)
+
+
+def set_next_cursor(response: Response, tasks: Sequence[Task], limit: int) -> None:
+    if len(tasks) == limit:
+        last = tasks[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+
+
+def set_next_rank_cursor(response: Response, rows: Sequence[Row], limit: int) -> None:
+    if len(rows) == limit:
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = encode_rank_cursor(last.score, last.id)
 
 
 @router.post("/", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
 def create_task(
     task_in: TaskCreate,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
 ):
-    task = Task(title=task_in.title, done=task_in.done, owner_id=current_user.id)
-    db.add(task)
-    db.commit()
-    db.refresh(task)
+    task = _create_task(db, current_user.id, task_in)
+    set_task_etag(response, task)
     return task
 
 
+@router.post(
+    "/bulk",
+    response_model=List[TaskBulkResult],
+    status_code=status.HTTP_201_CREATED,
+)
+def bulk_create_tasks(
+    bulk_in: TaskBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user),
+):
+    _check_batch_size(len(bulk_in.items))
+    # Core rows instead of ORM objects: one multi-row INSERT ... RETURNING and
+    # nothing for the commit to expire and reload afterwards. RETURNING order
+    # is unspecified, but ids are handed out in VALUES order, so sorting by id
+    # restores the order of the request items. (sort_by_parameter_order would
+    # do the same, but SQLite falls back to one INSERT per row for it.)
+    rows = db.execute(
+        insert(tasks_table).returning(*tasks_table.c),
+        [
+            {"title": item.title, "done": item.done, "owner_id": current_user.id}
+            for item in bulk_in.items
+        ],
+    ).all()
+    rows.sort(key=lambda row: row.id)
+    done = sum(row.done for row in rows)
+    bump_collection(db, current_user.id, total=len(rows), done=done)
+    db.commit()
+    publish_task_events(current_user.id, "created", rows)
+    return [{"id": row.id, "status": "created", "task": row} for row in rows]
+
+
+@router.patch("/bulk", response_model=List[TaskBulkResult])
+def bulk_update_tasks(
+    bulk_in: TaskBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user),
+):
+    _check_batch_size(len(bulk_in.items))
+    # Items asking for the same change share one UPDATE ... WHERE id IN (...),
+    # so "complete these 300 tasks" is a single statement.
+    groups: dict[tuple, list[int]] = defaultdict(list)
+    for item in bulk_in.items:
+        changes = item.model_dump(exclude={"id"}, exclude_none=True)
+        groups[tuple(sorted(changes.items()))].append(item.id)
+
+    updated: dict[int, Row] = {}
+    completed, changed = [], []  # rows actually written, for the event stream
+    done_delta = 0
+    for changes, ids in groups.items():
+        # Same split as single updates: the guarded done flip tells which rows
+        # move the counters, the rest is applied (or read) afterwards.
+        values = dict(changes)
+        done = values.pop("done", None)
+        if done is not None:
+            stmt = _update_statement(
+                _owned_tasks(ids, current_user.id), {"done": done}, True
+            )
+            flipped = {row.id: row for row in db.execute(stmt)}
+            done_delta += len(flipped) if done else -len(flipped)
+            updated.update(flipped)
+            (completed if done else changed).extend(flipped.values())
+            if not values:
+                ids = [task_id for task_id in ids if task_id not in flipped]
+        if ids:
+            stmt = _update_statement(_owned_tasks(ids, current_user.id), values)
+            rows = db.execute(stmt).all()
+            updated.update((row.id, row) for row in rows)
+            if stmt.is_dml:
+                changed.extend(rows)
+    if updated:
+        bump_collection(db, current_user.id, done=done_delta)
+    db.commit()
+    # A task that was completed and edited in one item shows up in both lists;
+    # its later "updated" event carries the final state.
+    publish_task_events(current_user.id, "completed", completed)
+    publish_task_events(current_user.id, "updated", changed)
+    return [
+        (
+            {"id": item.id, "status": "updated", "task": updated[item.id]}
+            if item.id in updated
+            else {"id": item.id, "status": "not_found"}
+        )
+        for item in bulk_in.items
+    ]
+
+
+@router.delete("/bulk", response_model=List[TaskBulkResult])
+def bulk_delete_tasks(
+    bulk_in: TaskBulkDelete,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user),
+):
+    _check_batch_size(len(bulk_in.ids))
+    rows = db.execute(
+        delete(tasks_table)
+        .where(*_owned_tasks(bulk_in.ids, current_user.id))
+        .returning(tasks_table.c.id, tasks_table.c.done)
+    ).all()
+    deleted = {row.id for row in rows}
+    if deleted:
+        done = sum(row.done for row in rows)
+        bump_collection(db, current_user.id, total=-len(rows), done=-done)
+    db.commit()
+    publish_task_events(current_user.id, "deleted", sorted(deleted))
+    return [
+        {"id": task_id, "status": "deleted" if task_id in deleted else "not_found"}
+        for task_id in bulk_in.ids
+    ]
+
+
 @router.get("/", response_model=List[TaskRead])
 def list_tasks(
+    request: Request,
+    response: Response,
     status_filter: Optional[str] = Query(None, description="completed|pending"),
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Legacy paging, prefer cursor"),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from the X-Next-Cursor response header"
+    ),
+    include_total: bool = Query(
+        False, description="Send X-Total-Count, read from the per-user counters"
+    ),
+    include_archived: bool = Query(False, description="Also list archived tasks"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+    current_user: CurrentUser = Depends(get_read_current_active_user),
+):
+    query = list_tasks_query(
+        current_user.id, status_filter, limit, offset, cursor, include_archived
+    )
+    # Read the version before the rows: a concurrent write can only make the
+    # ETag older than the body, which costs the client one extra refetch.
+    state = db.execute(collection_state_statement(current_user.id)).first()
+    version = state.version if state else 0
+    etag = collection_etag(current_user.id, version, request.url.query)
+    if none_match(if_none_match, etag):
+        return not_modified(etag)
+    if settings.fast_json:
+        # Core rows straight into orjson: no identity map, no TaskRead pass.
+        tasks = db.execute(only_task_read_columns(query)).all()
+        response = task_list_response(tasks)
+    else:
+        tasks = db.execute(query).scalars().all()
+    set_list_headers(
+        response, etag, state, status_filter, include_total, include_archived
+    )
+    set_next_cursor(response, tasks, limit)
+    return response if settings.fast_json else tasks
+
+
+@router.get("/stats", response_model=TaskStats)
+def read_task_stats(
+    db: Session = Depends(get_read_db),
+    current_user: CurrentUser = Depends(get_read_current_active_user),
+):
+    state = db.execute(collection_state_statement(current_user.id)).first()
+    return task_stats(state)
+
+
+@router.get("/search", response_model=List[TaskRead])
+def search_tasks(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from the X-Next-Cursor response header"
+    ),
+    db: Session = Depends(get_read_db),
+    current_user: CurrentUser = Depends(get_read_current_active_user),
+):
+    dialect_name = db.get_bind().dialect.name
+    query = search_query(dialect_name, current_user.id, q, limit, cursor)
+    rows = db.execute(query).all()
+    set_next_rank_cursor(response, rows, limit)
+    return rows
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_tasks(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
 ):
-    query = db.query(Task).filter(Task.owner_id == current_user.id)
-    if status_filter:
-        if status_filter not in {"completed", "pending"}:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="status_filter must be 'completed' or 'pending'",
-            )
-        if status_filter == "completed":
-            query = query.filter(Task.done.is_(True))
-        else:
-            query = query.filter(Task.done.is_(False))
-    tasks = query.order_by(Task.created_at.desc()).offset(offset).limit(limit).all()
-    return tasks
+    """Server-Sent Events for the caller's task writes: created, updated,
+    completed, deleted. Reconnecting clients should refetch `GET /tasks`."""
+    # The auth lookup may have checked out a connection; hand it back instead
+    # of holding it for the lifetime of the stream.
+    db.close()
+    return StreamingResponse(
+        task_event_stream(current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{task_id}", response_model=TaskRead)
 def read_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    response: Response,
+    include_archived: bool = Query(False, description="Also look in the archive"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+    current_user: CurrentUser = Depends(get_read_current_active_user),
 ):
+    if if_none_match:
+        # Revalidation only needs the version column, not the row.
+        version = db.scalar(
+            task_version_statement(task_id, current_user.id, include_archived)
+        )
+        if version is None:
+            raise task_not_found()
+        etag = task_etag(task_id, version)
+        if none_match(if_none_match, etag):
+            return not_modified(etag)
     task = (
         db.query(Task)
         .filter(Task.id == task_id, Task.owner_id == current_user.id)
         .first()
     )
+    if not task and include_archived:
+        task = db.execute(archived_task_statement(task_id, current_user.id)).first()
     if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
-        )
+        raise task_not_found()
+    set_task_etag(response, task)
+    return task
+
+
+def _set_task_fields(
+    db: Session,
+    response: Response,
+    task_id: int,
+    owner_id: int,
+    values: dict[str, Any],
+    if_match: Optional[str],
+) -> Row:
+    versions = if_match_versions(if_match, task_id)
+    task = _update_owned_task(db, task_id, owner_id, values, versions)
+    set_task_etag(response, task)
     return task
 
 
@@ -68,86 +657,46 @@ def read_task(
 def update_task(
     task_id: int,
     task_in: TaskUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
 ):
-    task = (
-        db.query(Task)
-        .filter(Task.id == task_id, Task.owner_id == current_user.id)
-        .first()
-    )
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
-        )
-
-    if task_in.title is not None:
-        task.title = task_in.title
-    if task_in.done is not None:
-        task.done = task_in.done
-
-    db.commit()
-    db.refresh(task)
-    return task
+    values = task_in.model_dump(exclude_none=True)
+    return _set_task_fields(db, response, task_id, current_user.id, values, if_match)
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_task(
     task_id: int,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
 ):
-    task = (
-        db.query(Task)
-        .filter(Task.id == task_id, Task.owner_id == current_user.id)
-        .first()
-    )
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
-        )
-    db.delete(task)
-    db.commit()
+    versions = if_match_versions(if_match, task_id)
+    _delete_owned_task(db, task_id, current_user.id, versions)
     return None
 
 
 @router.patch("/{task_id}/complete", response_model=TaskRead)
 def mark_complete(
     task_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
 ):
-    task = (
-        db.query(Task)
-        .filter(Task.id == task_id, Task.owner_id == current_user.id)
-        .first()
-    )
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
-        )
-    task.done = True
-    db.commit()
-    db.refresh(task)
-    return task
+    values = {"done": True}
+    return _set_task_fields(db, response, task_id, current_user.id, values, if_match)
 
 
 @router.patch("/{task_id}/incomplete", response_model=TaskRead)
 def mark_incomplete(
     task_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
 ):
-    task = (
-        db.query(Task)
-        .filter(Task.id == task_id, Task.owner_id == current_user.id)
-        .first()
-    )
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
-        )
-    task.done = False
-    db.commit()
-    db.refresh(task)
-    return task
+    values = {"done": False}
+    return _set_task_fields(db, response, task_id, current_user.id, values, if_match)
@@ -1,7 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_active_user, get_db
+from app.core.auth_cache import CurrentUser
+from app.core.config import settings
+from app.core.deps import (
+    get_current_superuser,
+    get_db,
+    get_read_current_active_user,
+    get_read_db,
+)
+from app.db import user_deletion
+from app.db.session import SessionLocal
 from app.models.user import User
 from app.schemas.user import UserRead
 
@@ -10,6 +19,76 @@ router = APIRouter()
 
 @router.get("/me", response_model=UserRead)
 def read_current_user(
-    current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_read_current_active_user),
+    db: Session = Depends(get_read_db),
+    primary: Session = Depends(get_db),
 ):
-    return current_user
+    user = db.get(User, current_user.id)
+    if not user and db is not primary:  # not on the replica yet
+        user = primary.get(User, current_user.id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    return user
+
+
+def _other_user(db: Session, user_id: int, admin: CurrentUser) -> User:
+    if user_id == admin.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Superusers can't deactivate or delete themselves",
+        )
+    user = db.get(User, user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    return user
+
+
+@router.patch("/{user_id}/deactivate", response_model=UserRead)
+def deactivate_user(
+    user_id: int,
+    db: Session = Depends(get_db),
+    admin: CurrentUser = Depends(get_current_superuser),
+):
+    user = _other_user(db, user_id, admin)
+    user.is_active = False
+    db.commit()  # the ORM flush also drops the user's cached tokens
+    return user
+
+
+@router.delete(
+    "/{user_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "description": "Deactivated; the tasks are deleted in the background"
+        }
+    },
+)
+def delete_user(
+    user_id: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    admin: CurrentUser = Depends(get_current_superuser),
+):
+    user = _other_user(db, user_id, admin)
+    owned = user_deletion.owned_task_count(db, user_id)
+    # Deactivated first, so the user's tokens stop working right away even
+    # while a large deletion is still running.
+    user.is_active = False
+    db.commit()
+    batch_size = settings.user_delete_batch_size
+    if owned > batch_size:
+        background_tasks.add_task(
+            user_deletion.delete_user,
+            SessionLocal,
+            user_id,
+            batch_size,
+            settings.user_delete_batch_pause_ms / 1000,
+        )
+        return Response(status_code=status.HTTP_202_ACCEPTED)
+    user_deletion.delete_user(SessionLocal, user_id, batch_size)
+    return None
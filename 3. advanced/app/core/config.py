@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -8,7 +10,60 @@ class Settings(BaseSettings):
     secret_key: str = Field("change-me", env="SECRET_KEY")
     algorithm: str = "HS256"
     access_token_expire_minutes: int = Field(60, env="ACCESS_TOKEN_EXPIRE_MINUTES")
+    bcrypt_rounds: int = Field(12, env="BCRYPT_ROUNDS")
+    password_hash_workers: int = Field(4, env="PASSWORD_HASH_WORKERS")
+    password_hash_max_pending: int = Field(64, env="PASSWORD_HASH_MAX_PENDING")
+    auth_cache_ttl_seconds: float = Field(30, env="AUTH_CACHE_TTL_SECONDS")
+    auth_cache_max_size: int = Field(10_000, env="AUTH_CACHE_MAX_SIZE")
     database_url: str = Field("sqlite:///./tasks.db", env="DATABASE_URL")
+    async_db: bool = Field(False, env="ASYNC_DB")
+    db_auto_create: bool = Field(False, env="DB_AUTO_CREATE")
+    db_pool_size: int = Field(5, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(10, env="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(30, env="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(1800, env="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(False, env="DB_POOL_PRE_PING")
+    database_read_urls: str = Field("", env="DATABASE_READ_URLS")
+    db_read_strategy: str = Field("round_robin", env="DB_READ_STRATEGY")
+    db_read_your_writes_seconds: float = Field(5, env="DB_READ_YOUR_WRITES_SECONDS")
+    db_replica_retry_seconds: float = Field(30, env="DB_REPLICA_RETRY_SECONDS")
+    sqlite_journal_mode: str = Field("WAL", env="SQLITE_JOURNAL_MODE")
+    sqlite_synchronous: str = Field("NORMAL", env="SQLITE_SYNCHRONOUS")
+    sqlite_mmap_size: int = Field(256 * 1024 * 1024, env="SQLITE_MMAP_SIZE")
+    sqlite_cache_size_kib: int = Field(64 * 1024, env="SQLITE_CACHE_SIZE_KIB")
+    sqlite_busy_timeout_ms: int = Field(5000, env="SQLITE_BUSY_TIMEOUT_MS")
+    group_commit_enabled: bool = Field(False, env="GROUP_COMMIT_ENABLED")
+    group_commit_max_batch: int = Field(64, env="GROUP_COMMIT_MAX_BATCH")
+    group_commit_max_wait_ms: float = Field(2, env="GROUP_COMMIT_MAX_WAIT_MS")
+    archive_after_days: float = Field(365, env="ARCHIVE_AFTER_DAYS")
+    archive_batch_size: int = Field(1000, env="ARCHIVE_BATCH_SIZE")
+    archive_batch_pause_ms: float = Field(50, env="ARCHIVE_BATCH_PAUSE_MS")
+    archive_interval_seconds: float = Field(0, env="ARCHIVE_INTERVAL_SECONDS")
+    user_delete_batch_size: int = Field(10_000, env="USER_DELETE_BATCH_SIZE")
+    user_delete_batch_pause_ms: float = Field(10, env="USER_DELETE_BATCH_PAUSE_MS")
+    bulk_max_items: int = Field(500, env="BULK_MAX_ITEMS")
+    export_batch_size: int = Field(1000, env="EXPORT_BATCH_SIZE")
+    import_chunk_size: int = Field(5000, env="IMPORT_CHUNK_SIZE")
+    import_max_errors: int = Field(100, env="IMPORT_MAX_ERRORS")
+    fast_json: bool = Field(False, env="FAST_JSON")
+    stream_queue_size: int = Field(100, env="STREAM_QUEUE_SIZE")
+    stream_heartbeat_seconds: float = Field(15, env="STREAM_HEARTBEAT_SECONDS")
+    stream_max_seconds: float = Field(300, env="STREAM_MAX_SECONDS")
+    stream_retry_ms: int = Field(3000, env="STREAM_RETRY_MS")
+    rate_limit_enabled: bool = Field(False, env="RATE_LIMIT_ENABLED")
+    rate_limit_auth: str = Field("10/minute", env="RATE_LIMIT_AUTH")
+    rate_limit_api: str = Field("600/minute", env="RATE_LIMIT_API")
+    rate_limit_transfer: str = Field("10/minute", env="RATE_LIMIT_TRANSFER")
+    rate_limit_max_keys: int = Field(100_000, env="RATE_LIMIT_MAX_KEYS")
+    metrics_enabled: bool = Field(False, env="METRICS_ENABLED")
+    metrics_token: str = Field("", env="METRICS_TOKEN")
+    profiling_enabled: bool = Field(False, env="PROFILING_ENABLED")
+    profiling_sample_rate: float = Field(0.0, env="PROFILING_SAMPLE_RATE")
+    profiling_secret: str = Field("", env="PROFILING_SECRET")
+    profiling_mode: str = Field("sampling", env="PROFILING_MODE")
+    profiling_format: str = Field("speedscope", env="PROFILING_FORMAT")
+    profiling_interval_ms: float = Field(1, env="PROFILING_INTERVAL_MS")
+    profiling_dir: str = Field("profiles", env="PROFILING_DIR")
     cors_origins: str = Field("*", env="CORS_ORIGINS")
 
     model_config = {
@@ -23,5 +78,24 @@ class Settings(BaseSettings):
             origin.strip() for origin in self.cors_origins.split(",") if origin.strip()
         ]
 
+    def read_urls(self) -> list[str]:
+        urls = self.database_read_urls.split(",")
+        return [url.strip() for url in urls if url.strip()]
+
+    def is_sqlite(self) -> bool:
+        return self.database_url.startswith("sqlite")
+
+    def async_database_url(self, url: Optional[str] = None) -> str:
+        url = url or self.database_url
+        for sync_prefix, async_prefix in (
+            ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+            ("postgresql://", "postgresql+asyncpg://"),
+            ("sqlite+pysqlite://", "sqlite+aiosqlite://"),
+            ("sqlite://", "sqlite+aiosqlite://"),
+        ):
+            if url.startswith(sync_prefix):
+                return async_prefix + url[len(sync_prefix) :]
+        return url
+
 
 settings = Settings()
@@ -1,43 +1,109 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+from typing import Optional
+
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError
+from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.auth_cache import CurrentUser, auth_cache
+from app.core.config import settings
 from app.core.security import decode_access_token
+from app.db import session as db_session
+from app.db.replicas import read_router
 from app.db.session import SessionLocal
 from app.models.user import User
 from app.schemas.auth import TokenPayload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
 
-def get_db():
+def get_db(request: Request):
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+        _note_write_done(request)
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
+async def get_async_db(request: Request):
+    if db_session.AsyncSessionLocal is None:
+        raise RuntimeError("Async database access is disabled, set ASYNC_DB=true")
+    async with db_session.AsyncSessionLocal() as db:
+        try:
+            yield db
+        finally:
+            _note_write_done(request)
+
+
+def _routing_user_id(token: str) -> Optional[int]:
+    # Only picks the database; the token is verified by the auth dependency.
+    try:
+        return int(jwt.get_unverified_claims(token)["sub"])
+    except (JWTError, KeyError, TypeError, ValueError):
+        return None
+
+
+def get_read_db(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    """Session for read-only handlers: a replica, or the primary `db` when no
+    replicas are configured or the user has just written."""
+    if not read_router:
+        yield db
+        return
+    with read_router.session(_routing_user_id(token), db) as read_db:
+        yield read_db
+
+
+async def get_async_read_db(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+):
+    if not read_router:
+        yield db
+        return
+    async with read_router.async_session(_routing_user_id(token), db) as read_db:
+        yield read_db
+
+
+def _note_write(request: Request, user: CurrentUser) -> None:
+    # Read-your-writes: the window starts with the write request and starts
+    # over once its session is closed (_note_write_done).
+    if read_router and request.method not in SAFE_METHODS:
+        request.state.writer_id = user.id
+        read_router.note_write(user.id)
+
+
+def _note_write_done(request: Request) -> None:
+    if read_router:
+        read_router.note_write(getattr(request.state, "writer_id", None))
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_token(token: str) -> TokenPayload:
     try:
-        payload = decode_access_token(token)
-        token_data = TokenPayload(**payload)
+        token_data = TokenPayload(**decode_access_token(token))
         if token_data.sub is None:
-            raise credentials_exception
+            raise _credentials_exception()
+        int(token_data.sub)
+        return token_data
     except (JWTError, ValueError):
-        raise credentials_exception
+        raise _credentials_exception()
 
-    user = db.query(User).filter(User.id == int(token_data.sub)).first()
+
+def _ensure_active(user: Optional[CurrentUser]) -> CurrentUser:
     if not user:
-        raise credentials_exception
+        raise _credentials_exception()
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
@@ -45,5 +111,117 @@ def get_current_user(
     return user
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+def _remember(token: str, token_data: TokenPayload, user: Optional[User]):
+    if user is None:
+        return None
+    current_user = CurrentUser.from_user(user)
+    auth_cache.put(token, current_user, token_data.exp)
     return current_user
+
+
+def _lookup_user(
+    token: str, db: Session, primary: Optional[Session] = None
+) -> CurrentUser:
+    cached = auth_cache.get(token)
+    if cached is not None:
+        return _ensure_active(cached)
+    token_data = _decode_token(token)
+    user = db.query(User).filter(User.id == int(token_data.sub)).first()
+    if user is None and primary is not None and primary is not db:
+        # Signed up a moment ago and not on the replica yet.
+        user = primary.get(User, int(token_data.sub))
+    return _ensure_active(_remember(token, token_data, user))
+
+
+def get_current_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> CurrentUser:
+    user = _lookup_user(token, db)
+    _note_write(request, user)
+    return user
+
+
+def get_current_active_user(
+    current_user: CurrentUser = Depends(get_current_user),
+) -> CurrentUser:
+    return current_user
+
+
+def get_current_superuser(
+    current_user: CurrentUser = Depends(get_current_active_user),
+) -> CurrentUser:
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough privileges"
+        )
+    return current_user
+
+
+def get_read_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_read_db),
+    primary: Session = Depends(get_db),
+) -> CurrentUser:
+    """get_current_user for read-only handlers: looks the user up on the
+    session the handler reads from."""
+    return _lookup_user(token, db, primary)
+
+
+def get_read_current_active_user(
+    current_user: CurrentUser = Depends(get_read_current_user),
+) -> CurrentUser:
+    return current_user
+
+
+async def _async_lookup_user(
+    token: str, db: AsyncSession, primary: Optional[AsyncSession] = None
+) -> CurrentUser:
+    cached = auth_cache.get(token)
+    if cached is not None:
+        return _ensure_active(cached)
+    token_data = _decode_token(token)
+    user = await db.scalar(select(User).where(User.id == int(token_data.sub)))
+    if user is None and primary is not None and primary is not db:
+        user = await primary.get(User, int(token_data.sub))
+    return _ensure_active(_remember(token, token_data, user))
+
+
+async def get_async_current_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> CurrentUser:
+    user = await _async_lookup_user(token, db)
+    _note_write(request, user)
+    return user
+
+
+async def get_async_current_active_user(
+    current_user: CurrentUser = Depends(get_async_current_user),
+) -> CurrentUser:
+    return current_user
+
+
+async def get_async_read_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_read_db),
+    primary: AsyncSession = Depends(get_async_db),
+) -> CurrentUser:
+    return await _async_lookup_user(token, db, primary)
+
+
+async def get_async_read_current_active_user(
+    current_user: CurrentUser = Depends(get_async_read_current_user),
+) -> CurrentUser:
+    return current_user
+
+
+def require_metrics_token(authorization: Optional[str] = Header(None)) -> None:
+    # With METRICS_TOKEN set, scrapers send it as a bearer token.
+    expected = settings.metrics_token
+    if expected and not hmac.compare_digest(
+        (authorization or "").encode(), f"Bearer {expected}".encode()
+    ):
+        raise _credentials_exception()
@@ -0,0 +1,49 @@
+import zlib
+from typing import Optional
+
+
+def task_etag(task_id: int, version: int) -> str:
+    return f'"{task_id}-{version}"'
+
+
+def collection_etag(owner_id: int, version: int, query: str) -> str:
+    # Owner and query string are folded in so every user and every page/filter
+    # of the list gets its own validator, even if a client shares ETags
+    # across accounts or URLs.
+    return f'"c{owner_id}-{version}-{zlib.crc32(query.encode()):08x}"'
+
+
+def _entity_tags(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def none_match(header: Optional[str], etag: str) -> bool:
+    """True if If-None-Match matches etag, i.e. the client copy is current."""
+    if not header:
+        return False
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored.
+    tags = [tag.removeprefix("W/") for tag in _entity_tags(header)]
+    return "*" in tags or etag in tags
+
+
+def if_match_versions(header: Optional[str], task_id: int) -> Optional[list[int]]:
+    """Task versions an If-Match header accepts.
+
+    None means there is no precondition (header missing or "*"). Otherwise the
+    write must only apply to one of the returned versions, possibly none.
+    """
+    if not header:
+        return None
+    tags = _entity_tags(header)
+    if "*" in tags:
+        return None
+    prefix = f'"{task_id}-'
+    versions = []
+    # If-Match uses the strong comparison: weak tags never match.
+    for tag in tags:
+        if tag.startswith(prefix) and tag.endswith('"'):
+            try:
+                versions.append(int(tag[len(prefix) : -1]))
+            except ValueError:
+                continue
+    return versions
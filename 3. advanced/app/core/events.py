@@ -0,0 +1,182 @@
+import asyncio
+import json
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Any, AsyncIterator, Iterable, Optional, Sequence
+
+from app.core.config import settings
+from app.schemas.task import TaskRead
+
+
+def task_event(event_type: str, task: Any) -> str:
+    """One SSE frame: created/updated/completed carry the task (any row or
+    object with the TaskRead fields), deleted only its id."""
+    if event_type == "deleted":
+        data = {"id": task}
+    else:
+        task_data = TaskRead.model_validate(task).model_dump(mode="json")
+        data = {"id": task.id, "task": task_data}
+    payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return f"event: {event_type}\ndata: {payload}\n\n"
+
+
+class Subscription:
+    # Lives on the event loop of the streaming request; everything that
+    # touches the queue runs there.
+    def __init__(self, owner_id: int, max_pending: int):
+        self.owner_id = owner_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue(max_pending)
+        self.evicted = False
+        self.closed = False
+
+    def push(self, frames: str) -> None:
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(frames)
+        except asyncio.QueueFull:
+            # Slow consumer: drop it instead of buffering without bound. The
+            # client reconnects and refetches the list.
+            self.evicted = True
+            self.close()
+
+    def close(self) -> None:
+        # Frames already queued are still sent, unless the queue is full and
+        # the end marker needs the room.
+        if self.closed:
+            return
+        self.closed = True
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def frames(
+        self, heartbeat: float, max_seconds: float
+    ) -> AsyncIterator[str]:
+        deadline = self.loop.time() + max_seconds
+        while True:
+            timeout = min(heartbeat, deadline - self.loop.time())
+            if timeout <= 0:
+                return  # the client reconnects, possibly to another worker
+            try:
+                frames = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"  # keeps proxies from closing an idle stream
+                continue
+            if frames is None:
+                if self.evicted:
+                    yield "event: evicted\ndata: {}\n\n"
+                return
+            yield frames
+
+
+class Broker(ABC):
+    """Fan-out of task events to the open streams of their owner.
+
+    `publish` may be called from any thread (sync handlers run in the
+    threadpool) and must not block. A broker for several workers publishes to
+    a shared channel (Redis pub/sub, Postgres LISTEN/NOTIFY) and hands what it
+    receives to `LocalBroker.deliver` in each worker.
+    """
+
+    @abstractmethod
+    def publish(self, owner_id: int, frames: Sequence[str]) -> None:
+        ...
+
+    @abstractmethod
+    def subscribe(self, owner_id: int) -> Subscription:
+        ...
+
+    @abstractmethod
+    def unsubscribe(self, subscription: Subscription) -> None:
+        ...
+
+    def listening(self, owner_id: int) -> bool:
+        # Lets publishers skip building events nobody reads.
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class LocalBroker(Broker):
+    # In-process pub/sub: enough for a single worker and for tests.
+    def __init__(self, max_pending: int):
+        self.max_pending = max_pending
+        self._subscriptions: dict[int, set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, owner_id: int, frames: Sequence[str]) -> None:
+        self.deliver(owner_id, frames)
+
+    def deliver(self, owner_id: int, frames: Sequence[str]) -> None:
+        if not frames:
+            return
+        # A batch (bulk write) is one queue slot, so the bound is per write.
+        batch = "".join(frames)
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(owner_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, batch)
+            except RuntimeError:  # loop already closed
+                self.unsubscribe(subscription)
+
+    def subscribe(self, owner_id: int) -> Subscription:
+        subscription = Subscription(owner_id, self.max_pending)
+        with self._lock:
+            self._subscriptions[owner_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.owner_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.owner_id]
+
+    def listening(self, owner_id: int) -> bool:
+        return owner_id in self._subscriptions
+
+    def close(self) -> None:
+        with self._lock:
+            subscriptions = [
+                subscription
+                for group in self._subscriptions.values()
+                for subscription in group
+            ]
+            self._subscriptions.clear()
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.close)
+            except RuntimeError:
+                pass
+
+    def __len__(self) -> int:
+        return sum(len(group) for group in self._subscriptions.values())
+
+
+broker: Broker = LocalBroker(settings.stream_queue_size)
+
+
+async def task_event_stream(owner_id: int) -> AsyncIterator[str]:
+    subscription = broker.subscribe(owner_id)
+    try:
+        # Reconnect delay for EventSource after eviction or the max duration.
+        yield f"retry: {settings.stream_retry_ms}\n\n"
+        async for frames in subscription.frames(
+            settings.stream_heartbeat_seconds, settings.stream_max_seconds
+        ):
+            yield frames
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def publish_task_events(owner_id: int, event_type: str, tasks: Iterable[Any]) -> None:
+    """Call after commit, so streams never see a write that was rolled back."""
+    if broker.listening(owner_id):
+        broker.publish(owner_id, [task_event(event_type, task) for task in tasks])
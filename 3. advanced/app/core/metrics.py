@@ -0,0 +1,258 @@
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+LabelSet = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# The middleware publishes one RequestStats per request; sync handlers see the
+# same object because the threadpool copies the context.
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.requests: dict[LabelSet, int] = {}
+        self.latency: dict[LabelSet, Histogram] = {}
+        self.queries_per_request: dict[LabelSet, Histogram] = {}
+        self.db_time_per_request: dict[LabelSet, Histogram] = {}
+        self.queries_total = 0
+        self.pool_wait = Histogram(LATENCY_BUCKETS)
+        self._pool_wait_lock = threading.Lock()
+        self._queries_lock = threading.Lock()
+        self.engines: list[Engine] = []
+
+    def record_request(
+        self, method: str, route: str, status: int, seconds: float, stats: RequestStats
+    ) -> None:
+        labels = (("method", method), ("route", route), ("status", str(status)))
+        self.requests[labels] = self.requests.get(labels, 0) + 1
+        histogram = self.latency.get(labels)
+        if histogram is None:
+            histogram = self.latency[labels] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+
+        route_labels = (("route", route),)
+        histogram = self.queries_per_request.get(route_labels)
+        if histogram is None:
+            histogram = self.queries_per_request[route_labels] = Histogram(
+                QUERY_COUNT_BUCKETS
+            )
+        histogram.observe(stats.queries)
+        histogram = self.db_time_per_request.get(route_labels)
+        if histogram is None:
+            histogram = self.db_time_per_request[route_labels] = Histogram(
+                LATENCY_BUCKETS
+            )
+        histogram.observe(stats.db_seconds)
+
+    def observe_pool_wait(self, seconds: float) -> None:
+        with self._pool_wait_lock:
+            self.pool_wait.observe(seconds)
+
+    def instrument_engine(self, engine: Engine) -> None:
+        self.engines.append(engine)
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        # Runs on whichever threadpool worker executed the statement.
+        with self._queries_lock:
+            self.queries_total += 1
+        stats = _request_stats.get()
+        started = getattr(context, "_metrics_started", None)
+        if stats is not None and started is not None:
+            stats.queries += 1
+            stats.db_seconds += perf_counter() - started
+
+    def render(self, extra_gauges: Iterable[tuple[str, str, float]] = ()) -> str:
+        lines: list[str] = []
+        _render_counter(
+            lines, "http_requests_total", "HTTP requests handled", self.requests
+        )
+        _render_histograms(
+            lines,
+            "http_request_duration_seconds",
+            "HTTP request latency",
+            self.latency,
+        )
+        _render_histograms(
+            lines,
+            "db_queries_per_request",
+            "SQL statements executed per request",
+            self.queries_per_request,
+        )
+        _render_histograms(
+            lines,
+            "db_time_per_request_seconds",
+            "Time spent in SQL statements per request",
+            self.db_time_per_request,
+        )
+        _render_counter(
+            lines,
+            "db_queries_total",
+            "SQL statements executed",
+            {(): self.queries_total},
+        )
+        _render_histograms(
+            lines,
+            "db_pool_wait_seconds",
+            "Time spent getting a connection from the pool",
+            {(): self.pool_wait},
+        )
+        gauges = list(extra_gauges)
+        for index, engine in enumerate(self.engines):
+            pool = engine.pool
+            if not isinstance(pool, QueuePool):
+                continue
+            engine_label = f'{{engine="{index}"}}'
+            gauges += [
+                ("db_pool_size" + engine_label, "Configured pool size", pool.size()),
+                (
+                    "db_pool_checked_out" + engine_label,
+                    "Connections in use",
+                    pool.checkedout(),
+                ),
+                (
+                    "db_pool_checked_in" + engine_label,
+                    "Idle connections in the pool",
+                    pool.checkedin(),
+                ),
+                (
+                    "db_pool_overflow" + engine_label,
+                    "Connections beyond pool_size",
+                    pool.overflow(),
+                ),
+            ]
+        seen = set()
+        for name, help_text, value in gauges:
+            base = name.split("{", 1)[0]
+            if base not in seen:
+                seen.add(base)
+                lines.append(f"# HELP {base} {help_text}")
+                lines.append(f"# TYPE {base} gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = perf_counter()
+
+
+def _format_labels(labels: LabelSet, extra: str = "") -> str:
+    parts = [f'{name}="{value}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _render_counter(
+    lines: list[str], name: str, help_text: str, values: dict[LabelSet, float]
+) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for labels, value in values.items():
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+
+def _render_histograms(
+    lines: list[str], name: str, help_text: str, values: dict[LabelSet, Histogram]
+) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, histogram in list(values.items()):
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            le = _format_labels(labels, f'le="{bound}"')
+            lines.append(f"{name}_bucket{le} {cumulative}")
+        le = _format_labels(labels, 'le="+Inf"')
+        lines.append(f"{name}_bucket{le} {histogram.count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {histogram.total}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+
+metrics = MetricsRegistry()
+
+
+class TimedQueuePool(QueuePool):
+    # QueuePool that reports how long callers waited for a connection
+    # (including opening a new one when the pool grows).
+    def connect(self):
+        started = perf_counter()
+        try:
+            return super().connect()
+        finally:
+            metrics.observe_pool_wait(perf_counter() - started)
+
+
+class MetricsMiddleware:
+    # Plain ASGI middleware: a couple of perf_counter calls, one ContextVar and
+    # a few dict updates per request, no extra task or response buffering.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            route = scope.get("route")
+            metrics.record_request(
+                scope["method"],
+                getattr(route, "path", "<unmatched>"),
+                status_code,
+                perf_counter() - started,
+                stats,
+            )
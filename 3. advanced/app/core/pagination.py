@@ -0,0 +1,44 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Tuple
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _encode(key: str, task_id: int) -> str:
+    raw = f"{key}|{task_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> Tuple[str, int]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    key, task_id = base64.urlsafe_b64decode(padded.encode()).decode().rsplit("|", 1)
+    return key, int(task_id)
+
+
+def encode_cursor(created_at: datetime, task_id: int) -> str:
+    return _encode(created_at.isoformat(), task_id)
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, task_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), task_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+def encode_rank_cursor(score: float, task_id: int) -> str:
+    # repr() round-trips the float exactly, so the keyset resumes precisely.
+    return _encode(repr(score), task_id)
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        score, task_id = _decode(cursor)
+        return float(score), task_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
@@ -0,0 +1,335 @@
+"""On-demand request profiling (PROFILING_ENABLED=true).
+
+ProfilingMiddleware is only added when profiling is enabled, so it costs
+nothing otherwise. A request is profiled when
+
+- it is picked at random (PROFILING_SAMPLE_RATE, 0.0 to 1.0), or
+- it carries an `X-Profile` token signed with PROFILING_SECRET that hasn't
+  expired yet (`python -m app.scripts.profile_token`).
+
+Modes (PROFILING_MODE, or `X-Profile-Mode` next to a token):
+
+- `sampling`: a background thread records the stack of every busy thread
+  each PROFILING_INTERVAL_MS and writes a speedscope file
+  (https://www.speedscope.app) or, with format `folded`, collapsed stacks
+  for flamegraph.pl.
+- `tracemalloc`: the memory allocated and freed while the request ran, by
+  source line, plus the peak.
+
+The result goes to PROFILING_DIR, named in the `X-Profile-File` header. With
+a token and `X-Profile-Output: inline` it replaces the response body instead
+(the original status is in `X-Profile-Status`). Both profilers see the whole
+worker process, so on a busy worker other requests show up as well.
+"""
+import hashlib
+import hmac
+import json
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+MODES = ("sampling", "tracemalloc")
+FORMATS = ("speedscope", "folded")
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+# A thread whose innermost Python frame is in one of these modules is waiting
+# (idle pool workers, the event loop in select), not working.
+_IDLE_MODULES = ("threading.py", "queue.py", "selectors.py", "futures/thread.py")
+
+Frame = tuple[str, str, int]  # function, file, first line
+
+
+def sign_token(secret: str, expires: int) -> str:
+    """`X-Profile` token valid until the Unix time `expires`."""
+    signature = hmac.new(
+        secret.encode(), f"profile:{expires}".encode(), hashlib.sha256
+    ).hexdigest()
+    return f"{expires}.{signature}"
+
+
+def verify_token(secret: str, token: str) -> bool:
+    if not secret:
+        return False
+    expires, _, _ = token.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(sign_token(secret, int(expires)), token)
+
+
+class StackSampler:
+    """Samples the stacks of all threads but its own from a background thread."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        # (thread name, stack from root to leaf, seconds since the last sample)
+        self.samples: list[tuple[str, tuple[Frame, ...], float]] = []
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names: dict[int, str] = {}
+        last = time.perf_counter()
+        while not self._stopped.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            for ident, frame in sys._current_frames().items():
+                if ident == own or frame.f_code.co_filename.endswith(_IDLE_MODULES):
+                    continue
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack = _stack(frame)
+                self.samples.append((names.get(ident, str(ident)), stack, elapsed))
+
+    def speedscope(self, name: str) -> dict:
+        """One sampled profile per thread, weights in milliseconds."""
+        frames: list[dict] = []
+        index: dict[Frame, int] = {}
+        profiles: dict[str, dict] = {}
+        for thread, stack, elapsed in self.samples:
+            ids = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    function, file, line = frame
+                    frames.append({"name": function, "file": file, "line": line})
+                ids.append(index[frame])
+            profile = profiles.setdefault(
+                thread,
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": 0,
+                    "samples": [],
+                    "weights": [],
+                },
+            )
+            weight = round(elapsed * 1000, 3)
+            profile["samples"].append(ids)
+            profile["weights"].append(weight)
+            profile["endValue"] = round(profile["endValue"] + weight, 3)
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "tasks-api",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": list(profiles.values()),
+        }
+
+    def folded(self) -> str:
+        """`thread;root;...;leaf count` lines, as flamegraph.pl reads them."""
+        counts = Counter(
+            ";".join([thread, *(f"{f} ({file}:{line})" for f, file, line in stack)])
+            for thread, stack, _ in self.samples
+        )
+        return "".join(f"{stack} {count}\n" for stack, count in counts.items())
+
+
+def _stack(frame) -> tuple[Frame, ...]:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_qualname, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+
+class AllocationTracer:
+    """tracemalloc snapshots before and after a request.
+
+    Tracing runs only while at least one traced request is in flight (unless
+    something else started it).
+    """
+
+    _lock = threading.Lock()
+    _active = 0
+    _started = False
+
+    def start(self) -> None:
+        cls = type(self)
+        with cls._lock:
+            if cls._active == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                cls._started = True
+            cls._active += 1
+        tracemalloc.reset_peak()
+        self.before = tracemalloc.take_snapshot()
+
+    def stop(self) -> None:
+        self.after = tracemalloc.take_snapshot()
+        self.peak = tracemalloc.get_traced_memory()[1]
+        cls = type(self)
+        with cls._lock:
+            cls._active -= 1
+            if cls._active == 0 and cls._started:
+                tracemalloc.stop()
+                cls._started = False
+
+    def report(self, name: str, limit: int = 30) -> str:
+        ignore = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        )
+        stats = self.after.filter_traces(ignore).compare_to(
+            self.before.filter_traces(ignore), "lineno"
+        )
+        size = sum(stat.size_diff for stat in stats)
+        blocks = sum(stat.count_diff for stat in stats)
+        lines = [
+            f"tracemalloc: {name}",
+            f"net {size / 1024:+.1f} KiB in {blocks:+d} blocks, "
+            f"peak traced {self.peak / 1024:.1f} KiB",
+            "",
+            *(str(stat) for stat in stats[:limit]),
+        ]
+        return "\n".join(lines) + "\n"
+
+
+@dataclass
+class ProfileRequest:
+    mode: str
+    fmt: str
+    inline: bool
+
+
+class ProfilingMiddleware:
+    # Plain ASGI middleware like MetricsMiddleware; main.py only adds it with
+    # PROFILING_ENABLED=true.
+    def __init__(
+        self,
+        app,
+        sample_rate: Optional[float] = None,
+        secret: Optional[str] = None,
+        mode: Optional[str] = None,
+        fmt: Optional[str] = None,
+        interval_ms: Optional[float] = None,
+        directory: Optional[str] = None,
+    ):
+        self.app = app
+        self.sample_rate = (
+            settings.profiling_sample_rate if sample_rate is None else sample_rate
+        )
+        self.secret = settings.profiling_secret if secret is None else secret
+        self.mode = mode or settings.profiling_mode
+        self.fmt = fmt or settings.profiling_format
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown profiling mode {self.mode!r}, expected {MODES}")
+        if self.fmt not in FORMATS:
+            raise ValueError(f"Unknown profile format {self.fmt!r}, expected {FORMATS}")
+        if interval_ms is None:
+            interval_ms = settings.profiling_interval_ms
+        self.interval = interval_ms / 1000
+        self.directory = Path(directory or settings.profiling_dir)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        wanted = self._wanted(scope)
+        if wanted is None:
+            await self.app(scope, receive, send)
+            return
+
+        name = f"{scope['method']} {scope['path']}"
+        filename = _filename(scope, wanted)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if wanted.inline:
+                    return
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-file", filename.encode()))
+                message = {**message, "headers": headers}
+            elif wanted.inline:
+                return
+            await send(message)
+
+        profiler = (
+            StackSampler(self.interval)
+            if wanted.mode == "sampling"
+            else AllocationTracer()
+        )
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            body, media_type = await run_in_threadpool(
+                self._finish, profiler, wanted, name, filename
+            )
+        if wanted.inline:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [
+                        (b"content-type", media_type.encode()),
+                        (b"content-length", str(len(body)).encode()),
+                        (b"x-profile-status", str(status_code).encode()),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+
+    def _wanted(self, scope) -> Optional[ProfileRequest]:
+        headers = dict(scope["headers"])
+        token = headers.get(b"x-profile")
+        if token is not None and verify_token(self.secret, token.decode("latin-1")):
+            mode = headers.get(b"x-profile-mode", b"").decode("latin-1")
+            fmt = headers.get(b"x-profile-format", b"").decode("latin-1")
+            return ProfileRequest(
+                mode=mode if mode in MODES else self.mode,
+                fmt=fmt if fmt in FORMATS else self.fmt,
+                inline=headers.get(b"x-profile-output") == b"inline",
+            )
+        if self.sample_rate and random.random() < self.sample_rate:
+            return ProfileRequest(self.mode, self.fmt, inline=False)
+        return None
+
+    def _finish(self, profiler, wanted: ProfileRequest, name: str, filename: str):
+        profiler.stop()
+        if isinstance(profiler, AllocationTracer):
+            body, media_type = profiler.report(name).encode(), "text/plain"
+        elif wanted.fmt == "folded":
+            body, media_type = profiler.folded().encode(), "text/plain"
+        else:
+            body = json.dumps(profiler.speedscope(name)).encode()
+            media_type = "application/json"
+        if not wanted.inline:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / filename).write_bytes(body)
+        return body, media_type
+
+
+def _filename(scope, wanted: ProfileRequest) -> str:
+    path = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+    if wanted.mode == "tracemalloc":
+        suffix = "tracemalloc.txt"
+    else:
+        suffix = "folded.txt" if wanted.fmt == "folded" else "speedscope.json"
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return f"{stamp}-{scope['method']}-{path}-{uuid.uuid4().hex[:6]}.{suffix}"
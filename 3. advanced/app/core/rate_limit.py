@@ -0,0 +1,174 @@
+import math
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+from jose import JWTError
+
+from app.core.config import settings
+from app.core.security import decode_access_token
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_RATE_RE = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*$")
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    """A token bucket: `limit` requests burst, refilled over `period` seconds."""
+
+    name: str
+    limit: int
+    period: float
+
+    @classmethod
+    def parse(cls, name: str, rate: str) -> "RateLimit":
+        # "10/minute", "300/hour", "5/30second"
+        match = _RATE_RE.match(rate.lower())
+        if not match:
+            raise ValueError(f"Invalid rate limit {rate!r}, expected e.g. '10/minute'")
+        count, multiplier, unit = match.groups()
+        return cls(name, int(count), int(multiplier or 1) * _PERIODS[unit])
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitResult:
+    allowed: bool
+    limit: RateLimit
+    remaining: int
+    reset_after: float
+    retry_after: float
+
+
+class RateLimitBackend(ABC):
+    """Storage for the buckets; a shared store (e.g. Redis) can implement the
+    same interface so several workers share one limit."""
+
+    @abstractmethod
+    def hit(self, key: str, limit: RateLimit, cost: int = 1) -> RateLimitResult:
+        ...
+
+    @abstractmethod
+    def reset(self) -> None:
+        ...
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    # O(1) per hit: one dict lookup, a float update and an LRU move. At most
+    # max_keys buckets are kept; evicting the least recently used one only
+    # hands that client a full bucket again.
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: RateLimit, cost: int = 1) -> RateLimitResult:
+        rate = limit.limit / limit.period
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (limit.limit, now))
+            tokens = min(limit.limit, tokens + (now - updated_at) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return RateLimitResult(
+            allowed=allowed,
+            limit=limit,
+            remaining=int(tokens),
+            reset_after=(limit.limit - tokens) / rate,
+            retry_after=0.0 if allowed else (cost - tokens) / rate,
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RateLimiter:
+    def __init__(self, backend: RateLimitBackend):
+        self.backend = backend
+
+    def dependency(self, name: str, rate: str):
+        """Router dependency enforcing `rate` ("10/minute") for one route group."""
+        limit = RateLimit.parse(name, rate)
+
+        async def enforce_rate_limit(request: Request) -> None:
+            if not settings.rate_limit_enabled:
+                return
+            key = f"{limit.name}:{client_key(request)}"
+            result = self.backend.hit(key, limit)
+            request.state.rate_limit = result
+            if not result.allowed:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Rate limit exceeded",
+                    headers={"Retry-After": str(math.ceil(result.retry_after))},
+                )
+
+        return enforce_rate_limit
+
+
+def client_key(request: Request) -> str:
+    """The user id from a valid bearer token, otherwise the client IP."""
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            subject = decode_access_token(token).get("sub")
+        except JWTError:
+            subject = None
+        if subject is not None:
+            return f"user:{subject}"
+    # Behind a proxy run uvicorn with --proxy-headers so this is the real client.
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}"
+
+
+def rate_limit_headers(result: RateLimitResult) -> list[tuple[bytes, bytes]]:
+    limit = result.limit
+    return [
+        (b"ratelimit-limit", str(limit.limit).encode()),
+        (b"ratelimit-remaining", str(result.remaining).encode()),
+        (b"ratelimit-reset", str(math.ceil(result.reset_after)).encode()),
+        (b"ratelimit-policy", f"{limit.limit};w={math.ceil(limit.period)}".encode()),
+    ]
+
+
+class RateLimitHeadersMiddleware:
+    # The limit is checked in a router dependency; this adds its RateLimit-*
+    # headers to whatever response goes out, including 304s, 429s and
+    # responses handlers build themselves.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        state = scope.setdefault("state", {})
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                result: Optional[RateLimitResult] = state.get("rate_limit")
+                if result is not None:
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        *rate_limit_headers(result),
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+limiter = RateLimiter(MemoryRateLimitBackend(settings.rate_limit_max_keys))
@@ -1,12 +1,58 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Callable, Optional, TypeVar
 
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+T = TypeVar("T")
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds
+)
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+class PasswordWorkerPool:
+    # bcrypt releases the GIL, so a small dedicated thread pool keeps password
+    # work off Starlette's shared threadpool. Callers beyond max_pending are
+    # rejected instead of queueing behind a login storm. The threads start
+    # with the first call and again after shutdown() (lifespan end).
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        if self.pending >= self.max_pending:
+            raise PasswordHasherBusy()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hash"
+            )
+        self.pending += 1
+        try:
+            return await asyncio.wrap_future(self._executor.submit(func, *args))
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_pool = PasswordWorkerPool(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
 
 
 def create_access_token(subject: str, expires_minutes: Optional[int] = None) -> str:
@@ -20,9 +66,14 @@ def decode_access_token(token: str) -> dict[str, Any]:
     return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def hash_password(password: str) -> str:
+    return await password_pool.run(pwd_context.hash, password)
 
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    # Returns a fresh hash when the stored one uses an outdated cost factor.
+    return await password_pool.run(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
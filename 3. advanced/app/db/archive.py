@@ -0,0 +1,114 @@
+"""Move completed tasks older than ARCHIVE_AFTER_DAYS to archived_tasks.
+
+Runs as `python -m app.scripts.archive_tasks` or, with
+ARCHIVE_INTERVAL_SECONDS > 0, periodically inside each app worker. Each batch
+is one short transaction that copies up to ARCHIVE_BATCH_SIZE rows to
+`archived_tasks`, deletes them from `tasks` and updates the owners'
+counters, so writers never wait for more than one batch. Concurrent runs
+(one per worker) skip each other's rows instead of moving them twice.
+"""
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.archived_task import ArchivedTask
+from app.models.task import Task
+from app.models.task_collection import TaskCollection
+
+tasks_table = Task.__table__
+archived_table = ArchivedTask.__table__
+collections_table = TaskCollection.__table__
+
+logger = logging.getLogger(__name__)
+
+
+def archive_cutoff(older_than_days: float) -> datetime:
+    return datetime.now(timezone.utc) - timedelta(days=older_than_days)
+
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+    """Move up to `batch_size` completed tasks last changed before `cutoff`;
+    the caller commits. Returns how many were moved."""
+    # Copied in SQL, so values land exactly as stored (SQLite keeps datetimes
+    # as text, and a Python round trip would change their format). FOR UPDATE
+    # SKIP LOCKED (Postgres) keeps the rows from changing until the DELETE;
+    # SQLite takes the write lock when the INSERT starts.
+    columns = [column.name for column in tasks_table.c]
+    candidates = (
+        select(tasks_table)
+        .where(tasks_table.c.done, tasks_table.c.updated_at < cutoff)
+        .order_by(tasks_table.c.updated_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    moved = db.execute(
+        insert(archived_table)
+        .from_select(columns, candidates)
+        .returning(archived_table.c.id, archived_table.c.owner_id)
+    ).all()
+    if not moved:
+        return 0
+    moved_ids = [row.id for row in moved]
+    db.execute(delete(tasks_table).where(tasks_table.c.id.in_(moved_ids)))
+    for owner_id, count in Counter(row.owner_id for row in moved).items():
+        # total/done stay: archived tasks still count. The version moves
+        # because the default list no longer shows them.
+        db.execute(
+            update(collections_table)
+            .where(collections_table.c.owner_id == owner_id)
+            .values(
+                archived=collections_table.c.archived + count,
+                version=collections_table.c.version + 1,
+            )
+        )
+    return len(moved)
+
+
+def archive_completed_tasks(
+    session_factory: Callable[[], Session],
+    older_than_days: float,
+    batch_size: int,
+    pause: float = 0.0,
+    max_batches: Optional[int] = None,
+) -> int:
+    """Archive batch after batch until nothing is left; returns the total."""
+    cutoff = archive_cutoff(older_than_days)
+    moved = batches = 0
+    while max_batches is None or batches < max_batches:
+        with session_factory() as db:
+            count = archive_batch(db, cutoff, batch_size)
+            db.commit()
+        moved += count
+        batches += 1
+        if count < batch_size:
+            break
+        if pause:
+            time.sleep(pause)  # let queued writers have the lock
+    return moved
+
+
+async def archive_periodically(interval: float) -> None:
+    """Lifespan task for ARCHIVE_INTERVAL_SECONDS > 0; cancel it to stop."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            moved = await asyncio.to_thread(
+                archive_completed_tasks,
+                SessionLocal,
+                settings.archive_after_days,
+                settings.archive_batch_size,
+                settings.archive_batch_pause_ms / 1000,
+            )
+        except Exception:
+            logger.exception("Archiving completed tasks failed")
+            continue
+        if moved:
+            logger.info("Archived %d completed task(s)", moved)
@@ -1,3 +1,6 @@
 # Import models here so Alembic or metadata.create_all sees them
 from app.models.user import User  # noqa: F401
 from app.models.task import Task  # noqa: F401
+from app.models.task_collection import TaskCollection  # noqa: F401
+from app.models.archived_task import ArchivedTask  # noqa: F401
+import app.db.search  # noqa: F401,E402  (FTS DDL events on the tasks table)
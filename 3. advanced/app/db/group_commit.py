@@ -0,0 +1,218 @@
+"""Group commit for single-task writes (GROUP_COMMIT_ENABLED=true).
+
+Request threads hand their write to one writer thread and wait for the
+result. The writer collects whatever arrives within GROUP_COMMIT_MAX_WAIT_MS
+(up to GROUP_COMMIT_MAX_BATCH writes), runs each in its own SAVEPOINT and
+commits them together, so N concurrent writes cost one commit and one fsync
+instead of N. On SQLite it also means writers no longer queue on the
+database lock.
+
+Each caller gets its own result or exception: a write that fails only rolls
+back its savepoint. If the shared commit fails, the writes that had
+succeeded are retried one transaction each, so one bad batch never fails
+writes that would have gone through on their own. Results are handed out
+only after the commit, so callers never report a write that was rolled back.
+"""
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Optional, TypeVar
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.session import SessionLocal, apply_sqlite_pragmas, connect_args
+
+T = TypeVar("T")
+
+_STOP = object()
+
+
+def writer_sessionmaker() -> sessionmaker:
+    """Sessions for the writer thread.
+
+    Postgres can use the app's engine. pysqlite, however, only opens a
+    transaction at the first INSERT/UPDATE/DELETE, so a leading SAVEPOINT
+    starts one on its own and its RELEASE commits - every write would still
+    be its own commit. The writer therefore gets a one-connection engine that
+    issues BEGIN IMMEDIATE itself (the writer always writes).
+    """
+    if not settings.is_sqlite():
+        return SessionLocal
+    writer_engine = create_engine(
+        settings.database_url, connect_args=connect_args, pool_size=1
+    )
+    event.listen(writer_engine, "connect", apply_sqlite_pragmas)
+
+    @event.listens_for(writer_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(writer_engine, "begin")
+    def _begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return sessionmaker(bind=writer_engine, autoflush=False)
+
+
+class GroupCommitter:
+    def __init__(
+        self,
+        session_factory: Optional[sessionmaker],
+        max_batch: int,
+        max_wait: float,
+    ):
+        # None: writer_sessionmaker() once the first write comes in.
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.commits = 0
+        self.writes = 0
+        self._last_batch_size = 0
+        self._jobs: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, write: Callable[..., T], *args: Any) -> "Future[T]":
+        """Queue `write(db, *args)`; it must not commit itself."""
+        future: "Future[T]" = Future()
+        self._ensure_started()
+        self._jobs.put((write, args, future))
+        return future
+
+    def run(self, write: Callable[..., T], *args: Any) -> T:
+        return self.submit(write, *args).result()
+
+    def close(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._jobs.put(_STOP)
+            thread.join()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                if self.session_factory is None:
+                    self.session_factory = writer_sessionmaker()
+                self._thread = threading.Thread(
+                    target=self._work, name="group-commit", daemon=True
+                )
+                self._thread.start()
+
+    def _work(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is _STOP:
+                return
+            batch, stop = self._collect(job)
+            try:
+                self._run_batch(batch)
+            except Exception as exc:  # e.g. no connection; never strand callers
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            if stop:
+                return
+
+    def _collect(self, first) -> tuple[list, bool]:
+        batch = [first]
+        # Whatever queued up during the previous commit is always taken along.
+        # Beyond that, wait (up to max_wait) only for as many writers as the
+        # last batch had: a lone writer never waits, and a steady load stops
+        # waiting once everyone is in.
+        expected = min(self._last_batch_size, self.max_batch)
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if len(batch) >= expected:
+                timeout = 0.0
+            try:
+                job = self._jobs.get(timeout=max(0.0, timeout))
+            except queue.Empty:
+                break
+            if job is _STOP:
+                return batch, True
+            batch.append(job)
+        self._last_batch_size = len(batch)
+        return batch, False
+
+    def _run_batch(self, batch: list) -> None:
+        batch = [job for job in batch if job[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        if len(batch) == 1:
+            # Nothing to share the commit with: skip the savepoint.
+            self._run_individually(batch)
+            return
+        outcomes = []
+        with self.session_factory() as db:
+            for write, args, future in batch:
+                try:
+                    with db.begin_nested():
+                        outcomes.append((future, write(db, *args), None))
+                except Exception as exc:
+                    outcomes.append((future, None, exc))
+            try:
+                db.commit()
+            except Exception:
+                db.rollback()
+                self._run_individually(batch, [error for _, _, error in outcomes])
+                return
+        self.commits += 1
+        self.writes += len(batch)
+        _resolve(outcomes)
+
+    def _run_individually(self, batch: list, errors: Optional[list] = None) -> None:
+        # One transaction per write; `errors` are failures from a batch attempt
+        # that are passed on instead of being retried.
+        retried = []
+        for (write, args, future), error in zip(batch, errors or [None] * len(batch)):
+            if error is not None:
+                retried.append((future, None, error))
+                continue
+            with self.session_factory() as db:
+                try:
+                    result = write(db, *args)
+                    db.commit()
+                    retried.append((future, result, None))
+                except Exception as exc:
+                    db.rollback()
+                    retried.append((future, None, exc))
+        self.commits += len(batch)
+        self.writes += len(batch)
+        _resolve(retried)
+
+
+def _resolve(outcomes: list) -> None:
+    for future, result, error in outcomes:
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+
+group_committer = GroupCommitter(
+    None,
+    max_batch=settings.group_commit_max_batch,
+    max_wait=settings.group_commit_max_wait_ms / 1000,
+)
+
+
+async def group_write(write: Callable[..., T], *args: Any) -> T:
+    """For async handlers: wait for the writer thread without blocking the loop."""
+    return await asyncio.wrap_future(group_committer.submit(write, *args))
+
+
+def commit_write(db: Session, write: Callable[..., T], *args: Any) -> T:
+    """Run `write(db, *args)` and commit, or let the group committer do both."""
+    if settings.group_commit_enabled:
+        return group_committer.run(write, *args)
+    result = write(db, *args)
+    db.commit()
+    return result
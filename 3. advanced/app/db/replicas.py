@@ -0,0 +1,211 @@
+"""Read replicas (DATABASE_READ_URLS).
+
+Read-only handlers get their session through `read_router` (see
+app.core.deps.get_read_db). It picks a replica round robin or by fewest open read sessions
+(DB_READ_STRATEGY) and falls back to the primary when
+
+- no replicas are configured,
+- the user wrote within the last DB_READ_YOUR_WRITES_SECONDS, so they see
+  their own writes despite replication lag, or
+- every replica failed to connect within the last DB_REPLICA_RETRY_SECONDS.
+"""
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator, Optional
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import TimedQueuePool, metrics
+from app.db.session import apply_sqlite_pragmas, pool_options
+
+STRATEGIES = ("round_robin", "least_connections")
+
+
+@dataclass(eq=False)
+class Replica:
+    name: str
+    engine: Engine
+    session_factory: sessionmaker
+    async_engine: Optional[AsyncEngine] = None
+    async_session_factory: Optional[async_sessionmaker] = None
+    in_use: int = 0  # open read sessions, for least_connections
+    down_until: float = 0.0  # monotonic time until which it is skipped
+
+
+def create_replica(url: str, async_db: bool = False) -> Replica:
+    """Engines for one replica, configured like the primary's."""
+    is_sqlite = url.startswith("sqlite")
+    connect_args = {"check_same_thread": False} if is_sqlite else {}
+    engine_options = dict(pool_options)
+    if pool_options and settings.metrics_enabled:
+        engine_options["poolclass"] = TimedQueuePool
+    engine = create_engine(url, connect_args=connect_args, **engine_options)
+    if is_sqlite:
+        event.listen(engine, "connect", apply_sqlite_pragmas)
+    if settings.metrics_enabled:
+        metrics.instrument_engine(engine)
+    replica = Replica(
+        name=engine.url.render_as_string(hide_password=True),
+        engine=engine,
+        session_factory=sessionmaker(autoflush=False, bind=engine),
+    )
+    if async_db:
+        replica.async_engine = create_async_engine(
+            settings.async_database_url(url),
+            **({} if is_sqlite else pool_options),
+        )
+        if is_sqlite:
+            event.listen(
+                replica.async_engine.sync_engine, "connect", apply_sqlite_pragmas
+            )
+        replica.async_session_factory = async_sessionmaker(
+            replica.async_engine, autoflush=False, expire_on_commit=False
+        )
+    return replica
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        replicas: list[Replica],
+        strategy: str = "round_robin",
+        read_your_writes_seconds: float = 5,
+        retry_seconds: float = 30,
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Unknown read strategy {strategy!r}, expected one of {STRATEGIES}"
+            )
+        self.replicas = replicas
+        self.strategy = strategy
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.retry_seconds = retry_seconds
+        self.primary_reads = 0
+        self.replica_reads = 0
+        self._next = itertools.count()
+        # user id -> pinned until; every entry gets the same window, so the
+        # oldest one always sits at the front and expired pins are trimmed
+        # from there.
+        self._pinned: "OrderedDict[int, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def note_write(self, user_id: Optional[int]) -> None:
+        """Send `user_id`'s reads to the primary for the next few seconds."""
+        if not self.replicas or user_id is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._pinned[user_id] = now + self.read_your_writes_seconds
+            self._pinned.move_to_end(user_id)
+            while self._pinned:
+                oldest = next(iter(self._pinned.values()))
+                if oldest > now:
+                    break
+                self._pinned.popitem(last=False)
+
+    def pinned(self, user_id: Optional[int]) -> bool:
+        if user_id is None:
+            return False
+        return self._pinned.get(user_id, 0.0) > time.monotonic()
+
+    def candidates(self, user_id: Optional[int]) -> list[Replica]:
+        """Replicas to try in order; empty means read from the primary."""
+        if not self.replicas or self.pinned(user_id):
+            return []
+        now = time.monotonic()
+        with self._lock:
+            healthy = [r for r in self.replicas if r.down_until <= now]
+            if self.strategy == "least_connections":
+                healthy.sort(key=lambda replica: replica.in_use)
+            elif healthy:
+                start = next(self._next) % len(healthy)
+                healthy = healthy[start:] + healthy[:start]
+        return healthy
+
+    def mark_down(self, replica: Replica) -> None:
+        replica.down_until = time.monotonic() + self.retry_seconds
+
+    @contextmanager
+    def session(self, user_id: Optional[int], primary: Session) -> Iterator[Session]:
+        for replica in self.candidates(user_id):
+            db = replica.session_factory()
+            try:
+                # Connect up front so a dead replica costs a retry here rather
+                # than a 500 in the middle of the handler.
+                db.connection()
+            except DBAPIError:
+                db.close()
+                self.mark_down(replica)
+                continue
+            with self._using(replica):
+                try:
+                    yield db
+                finally:
+                    db.close()
+            return
+        self.primary_reads += 1
+        yield primary
+
+    @asynccontextmanager
+    async def async_session(
+        self, user_id: Optional[int], primary: AsyncSession
+    ) -> AsyncIterator[AsyncSession]:
+        for replica in self.candidates(user_id):
+            if replica.async_session_factory is None:
+                break
+            db = replica.async_session_factory()
+            try:
+                await db.connection()
+            except DBAPIError:
+                await db.close()
+                self.mark_down(replica)
+                continue
+            with self._using(replica):
+                try:
+                    yield db
+                finally:
+                    await db.close()
+            return
+        self.primary_reads += 1
+        yield primary
+
+    @contextmanager
+    def _using(self, replica: Replica) -> Iterator[None]:
+        with self._lock:
+            replica.in_use += 1
+            self.replica_reads += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                replica.in_use -= 1
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            replica.engine.dispose()
+            if replica.async_engine is not None:
+                await replica.async_engine.dispose()
+
+
+read_router = ReplicaRouter(
+    [create_replica(url, settings.async_db) for url in settings.read_urls()],
+    strategy=settings.db_read_strategy,
+    read_your_writes_seconds=settings.db_read_your_writes_seconds,
+    retry_seconds=settings.db_replica_retry_seconds,
+)
@@ -0,0 +1,139 @@
+"""Full-text search over task titles.
+
+SQLite: an external-content FTS5 table (`tasks_fts`) kept in sync by triggers,
+with the owner id as a second indexed column so a search only walks the
+caller's postings. Postgres: a generated `tsvector` column in a GIN index
+together with `owner_id` (btree_gin), for the same reason.
+Both are created right after the `tasks` table (DDL events), so create_all and
+migrations set them up together.
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import (
+    DDL,
+    Select,
+    column,
+    event,
+    func,
+    literal_column,
+    select,
+    table,
+    tuple_,
+)
+
+from app.models.task import Task
+
+tasks_table = Task.__table__
+tasks_fts = table("tasks_fts", column("rowid"))
+
+SEARCH_CONFIG = "simple"  # no stemming: titles mix languages
+SEARCH_DIALECTS = ("sqlite", "postgresql")
+MAX_TERMS = 16
+
+_SQLITE_DDL = (
+    # prefix='2 3' adds prefix indexes, so type-ahead queries ("kau*") stay
+    # index lookups.
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, owner_id, content='tasks', content_rowid='id', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, owner_id) "
+    "VALUES (new.id, new.title, new.owner_id); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, owner_id) "
+    "VALUES ('delete', old.id, old.title, old.owner_id); END",
+    # complete/incomplete do not touch title or owner, so they skip the index.
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, owner_id "
+    "ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, owner_id) "
+    "VALUES ('delete', old.id, old.title, old.owner_id); "
+    "INSERT INTO tasks_fts(rowid, title, owner_id) "
+    "VALUES (new.id, new.title, new.owner_id); END",
+)
+
+_POSTGRES_DDL = (
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_CONFIG}', title)) STORED",
+    # btree_gin lets the plain owner_id column into the GIN index, so the
+    # owner filter is part of the index scan instead of a recheck afterwards.
+    "CREATE EXTENSION IF NOT EXISTS btree_gin",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_owner_search_vector ON tasks "
+    "USING gin (owner_id, search_vector)",
+)
+
+for statement in _SQLITE_DDL:
+    event.listen(
+        tasks_table, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+for statement in _POSTGRES_DDL:
+    event.listen(
+        tasks_table, "after_create", DDL(statement).execute_if(dialect="postgresql")
+    )
+event.listen(
+    tasks_table,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect="sqlite"),
+)
+
+
+def search_terms(q: str) -> list[str]:
+    # Only word characters survive, so user input can never inject FTS5 or
+    # tsquery operators (quotes, NEAR, :, &, |, !, ...).
+    return re.findall(r"\w+", q.lower())[:MAX_TERMS]
+
+
+def _sqlite_match(owner_id: int, terms: list[str]) -> str:
+    # Every term must match; the last one as a prefix for type-ahead.
+    phrases = [f'"{term}"' for term in terms]
+    phrases[-1] += "*"
+    return f'owner_id : "{owner_id}" AND title : ({" ".join(phrases)})'
+
+
+def _postgres_tsquery(terms: list[str]) -> str:
+    return " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+
+
+def search_tasks_query(
+    dialect_name: str,
+    owner_id: int,
+    terms: list[str],
+    limit: int,
+    after: Optional[tuple[float, int]] = None,
+) -> Select:
+    """Ranked search, best match first; `after` is the (score, id) keyset.
+
+    Scores are normalized so that lower is better on both backends, which
+    makes (score, id) ascending a stable pagination order.
+    """
+    if dialect_name == "sqlite":
+        fts = literal_column("tasks_fts")
+        ranked = (
+            select(
+                tasks_fts.c.rowid.label("id"),
+                # Column weights: title counts, the owner filter column doesn't.
+                func.bm25(fts, 1.0, 0.0).label("score"),
+            )
+            .where(fts.op("MATCH")(_sqlite_match(owner_id, terms)))
+            .subquery()
+        )
+    elif dialect_name == "postgresql":
+        # Not mapped on Task: the generated column only exists on Postgres.
+        vector = literal_column("tasks.search_vector")
+        tsquery = func.to_tsquery(SEARCH_CONFIG, _postgres_tsquery(terms))
+        ranked = (
+            select(tasks_table.c.id, (-func.ts_rank(vector, tsquery)).label("score"))
+            .where(tasks_table.c.owner_id == owner_id, vector.op("@@")(tsquery))
+            .subquery()
+        )
+    else:
+        # Routes check SEARCH_DIALECTS first and answer 501.
+        raise ValueError(f"Search is not supported on {dialect_name}")
+
+    query = (
+        select(tasks_table, ranked.c.score)
+        .join(ranked, ranked.c.id == tasks_table.c.id)
+        .where(tasks_table.c.owner_id == owner_id)
+    )
+    if after is not None:
+        query = query.where(tuple_(ranked.c.score, ranked.c.id) > tuple_(*after))
+    return query.order_by(ranked.c.score, ranked.c.id).limit(limit)
@@ -1,11 +1,101 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.core.metrics import TimedQueuePool, metrics
 
-connect_args = (
-    {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
-)
+connect_args = {"check_same_thread": False} if settings.is_sqlite() else {}
+pool_options = {}
+engine_options = {}
+if ":memory:" not in settings.database_url:
+    # In-memory SQLite uses a single shared connection, everything else a
+    # QueuePool that can be sized from the settings.
+    pool_options = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    engine_options.update(pool_options)
+    if settings.metrics_enabled:
+        engine_options["poolclass"] = TimedQueuePool
 
-engine = create_engine(settings.database_url, connect_args=connect_args)
+engine = create_engine(
+    settings.database_url, connect_args=connect_args, **engine_options
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers run alongside a writer; synchronous=NORMAL is durable
+    # in WAL mode except for the last commits on power loss. busy_timeout
+    # makes writers wait for the lock instead of failing with "locked".
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kib)}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    finally:
+        cursor.close()
+
+
+if settings.is_sqlite():
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+
+# Opt-in async engine (ASYNC_DB=true): asyncpg for Postgres, aiosqlite for SQLite.
+async_engine = None
+AsyncSessionLocal = None
+if settings.async_db:
+    # aiosqlite opens one connection per checkout (NullPool), so the pool
+    # settings only apply to asyncpg.
+    async_engine = create_async_engine(
+        settings.async_database_url(),
+        **({} if settings.is_sqlite() else pool_options),
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+    if settings.is_sqlite():
+        event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+
+def create_tables() -> None:
+    """Dev shortcut (DB_AUTO_CREATE=true); deployments run `alembic upgrade head`."""
+    import app.db.base  # noqa: F401  (all models plus the search DDL events)
+
+    Base.metadata.create_all(bind=engine)
+
+
+def warm_up_pool() -> None:
+    # Connect (and run the PRAGMAs) before the first request instead of in it.
+    connections = [engine.connect() for _ in range(_warm_up_size())]
+    for connection in connections:
+        connection.close()
+
+
+async def warm_up_async_pool() -> None:
+    if async_engine is None or settings.is_sqlite():
+        return  # aiosqlite uses NullPool, there is nothing to keep warm
+    connections = [await async_engine.connect() for _ in range(_warm_up_size())]
+    for connection in connections:
+        await connection.close()
+
+
+def _warm_up_size() -> int:
+    return settings.db_pool_size if pool_options else 1
+
+
+async def dispose_engines() -> None:
+    engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+if settings.metrics_enabled:
+    metrics.instrument_engine(engine)
+    if async_engine is not None:
+        metrics.instrument_engine(async_engine.sync_engine)
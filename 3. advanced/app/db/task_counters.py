@@ -0,0 +1,45 @@
+"""Per-user task counters in task_collections (see TaskCollection).
+
+Every task write bumps the owner's row in the same transaction. Shared by
+the sync and async routes, the import and `python -m
+app.scripts.rebuild_task_counters`.
+"""
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.models.task_collection import TaskCollection
+
+collections_table = TaskCollection.__table__
+
+
+def collection_state_statement(owner_id: int):
+    return select(
+        collections_table.c.version,
+        collections_table.c.total,
+        collections_table.c.done,
+        collections_table.c.archived,
+    ).where(collections_table.c.owner_id == owner_id)
+
+
+# INSERT ... ON CONFLICT DO UPDATE creates the row on the user's first write
+# and afterwards bumps the version and applies the counter deltas atomically,
+# in the same transaction as the task write. Written as text because
+# SQLAlchemy 2.0.23 can't cache compiled dialect INSERTs, and recompiling the
+# upsert on every write cost more than running it; the syntax is the same on
+# SQLite and Postgres.
+_bump_collection_sql = text(
+    "INSERT INTO task_collections (owner_id, version, total, done) "
+    "VALUES (:owner_id, 1, :total, :done) "
+    "ON CONFLICT (owner_id) DO UPDATE SET "
+    "version = task_collections.version + 1, "
+    "total = task_collections.total + excluded.total, "
+    "done = task_collections.done + excluded.done"
+)
+
+
+def bump_collection_statement(owner_id: int, total: int = 0, done: int = 0):
+    return _bump_collection_sql.bindparams(owner_id=owner_id, total=total, done=done)
+
+
+def bump_collection(db: Session, owner_id: int, total: int = 0, done: int = 0):
+    db.execute(bump_collection_statement(owner_id, total, done))
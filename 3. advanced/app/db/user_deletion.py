@@ -0,0 +1,97 @@
+"""Delete a user together with their tasks, archived tasks and counters.
+
+tasks, archived_tasks and task_collections reference users with ON DELETE
+CASCADE. Where the database enforces that (Postgres; SQLite only with
+`PRAGMA foreign_keys=ON`), deleting the user row removes everything else in
+the same statement. Otherwise the owned rows go first, in chunks of
+USER_DELETE_BATCH_SIZE with one short transaction each, so SQLite's write
+lock is never held for long. Nothing is loaded into the session either way,
+so memory use doesn't depend on how many tasks there are.
+
+Deleting an already half-deleted user simply continues.
+"""
+import logging
+import time
+from typing import Callable
+
+from sqlalchemy import Table, delete, select, text
+from sqlalchemy.orm import Session
+
+from app.core.auth_cache import auth_cache
+from app.models.archived_task import ArchivedTask
+from app.models.task import Task
+from app.models.task_collection import TaskCollection
+from app.models.user import User
+
+tasks_table = Task.__table__
+archived_table = ArchivedTask.__table__
+collections_table = TaskCollection.__table__
+users_table = User.__table__
+
+logger = logging.getLogger(__name__)
+
+
+def cascades_deletes(db: Session) -> bool:
+    """Does the database apply ON DELETE CASCADE itself?"""
+    if db.get_bind().dialect.name != "sqlite":
+        return True
+    return bool(db.execute(text("PRAGMA foreign_keys")).scalar())
+
+
+def owned_task_count(db: Session, user_id: int) -> int:
+    """Hot plus archived tasks, from the counters instead of COUNT(*)."""
+    total = db.scalar(
+        select(collections_table.c.total).where(
+            collections_table.c.owner_id == user_id
+        )
+    )
+    return total or 0
+
+
+def delete_owned_batch(db: Session, table: Table, user_id: int, batch_size: int) -> int:
+    """Delete up to `batch_size` of the user's rows in `table`; the caller
+    commits."""
+    batch = (
+        select(table.c.id)
+        .where(table.c.owner_id == user_id)
+        .limit(batch_size)
+        .scalar_subquery()
+    )
+    return db.execute(delete(table).where(table.c.id.in_(batch))).rowcount
+
+
+def delete_user(
+    session_factory: Callable[[], Session],
+    user_id: int,
+    batch_size: int,
+    pause: float = 0.0,
+) -> int:
+    """Delete the user and everything they own; returns how many task rows
+    were deleted in batches (0 when the database cascades)."""
+    with session_factory() as db:
+        cascade = cascades_deletes(db)
+    deleted = 0
+    if not cascade:
+        for table in (tasks_table, archived_table):
+            while True:
+                with session_factory() as db:
+                    count = delete_owned_batch(db, table, user_id, batch_size)
+                    db.commit()
+                deleted += count
+                if count < batch_size:
+                    break
+                if pause:
+                    time.sleep(pause)  # let queued writers have the lock
+    with session_factory() as db:
+        if not cascade:
+            db.execute(
+                delete(collections_table).where(
+                    collections_table.c.owner_id == user_id
+                )
+            )
+        db.execute(delete(users_table).where(users_table.c.id == user_id))
+        db.commit()
+    # A Core DELETE skips the ORM event that drops cached tokens.
+    auth_cache.invalidate_user(user_id)
+    logger.info("Deleted user %d (%d task rows in batches)", user_id, deleted)
+    return deleted
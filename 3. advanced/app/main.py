@@ -1,18 +1,61 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import Depends, FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from app.api.api import api_router
+from app.core.auth_cache import auth_cache
+from app.core import events
 from app.core.config import settings
-from app.db.session import Base, engine
-import app.db.base  # noqa: F401
+from app.core.deps import require_metrics_token
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.profiling import ProfilingMiddleware
+from app.core.rate_limit import RateLimitHeadersMiddleware
+from app.core.security import PasswordHasherBusy, password_pool
+from app.db.archive import archive_periodically
+from app.db.group_commit import group_committer
+from app.db.replicas import read_router
+from app.db.session import (
+    create_tables,
+    dispose_engines,
+    warm_up_async_pool,
+    warm_up_pool,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Nothing touches the database at import time; the schema comes from
+    # `alembic upgrade head` (or DB_AUTO_CREATE=true for local hacking).
+    if settings.db_auto_create:
+        await run_in_threadpool(create_tables)
+    await run_in_threadpool(warm_up_pool)
+    await warm_up_async_pool()
+    archiver = None
+    if settings.archive_interval_seconds > 0:
+        archiver = asyncio.create_task(
+            archive_periodically(settings.archive_interval_seconds)
+        )
+    yield
+    if archiver is not None:
+        archiver.cancel()
+        with suppress(asyncio.CancelledError):
+            await archiver
+    events.broker.close()  # ends open /tasks/stream responses
+    await run_in_threadpool(group_committer.close)  # flushes queued writes
+    password_pool.shutdown()
+    await dispose_engines()
+    await read_router.dispose()
 
-# Create tables (for simple setup; for production prefer migrations)
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title=settings.app_name,
     description="Advanced Task API with auth, Postgres-ready DB, and user-owned tasks",
     version=settings.version,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -21,7 +64,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Next-Cursor",
+        "ETag",
+        "X-Total-Count",
+        "RateLimit-Limit",
+        "RateLimit-Remaining",
+        "RateLimit-Reset",
+        "RateLimit-Policy",
+        "Retry-After",
+    ],
 )
+app.add_middleware(RateLimitHeadersMiddleware)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+if settings.profiling_enabled:
+    # Outermost, so the profile covers the other middleware as well.
+    app.add_middleware(ProfilingMiddleware)
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many concurrent password checks, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
 
 
 @app.get("/", tags=["Root"])
@@ -33,4 +101,30 @@ def read_root():
     }
 
 
+if settings.metrics_enabled:
+
+    @app.get(
+        "/metrics",
+        include_in_schema=False,
+        dependencies=[Depends(require_metrics_token)],
+    )
+    def read_metrics():
+        cache_stats = auth_cache.stats()
+        return PlainTextResponse(
+            metrics.render(
+                [
+                    ("auth_cache_hits", "Auth cache hits", cache_stats["hits"]),
+                    ("auth_cache_misses", "Auth cache misses", cache_stats["misses"]),
+                    ("auth_cache_size", "Cached tokens", cache_stats["size"]),
+                    (
+                        "password_hash_pending",
+                        "Queued or running password hashes",
+                        password_pool.pending,
+                    ),
+                ]
+            ),
+            media_type="text/plain; version=0.0.4",
+        )
+
+
 app.include_router(api_router)
@@ -0,0 +1,39 @@
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+
+
+class ArchivedTask(Base):
+    """Completed tasks moved out of `tasks` by app.db.archive.
+
+    Same columns and ids as in `tasks`, so archived tasks read like any other
+    (`?include_archived=true`) while the hot table and its indexes only hold
+    what people still work with. Archived rows are read-only.
+    """
+
+    __tablename__ = "archived_tasks"
+    __table_args__ = (
+        Index("ix_archived_tasks_owner_created_id", "owner_id", "created_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String(200), nullable=False)
+    done = Column(Boolean, nullable=False)
+    version = Column(Integer, nullable=False)
+    owner_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    archived_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
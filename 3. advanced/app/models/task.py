@@ -1,4 +1,13 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    text,
+)
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -7,10 +16,28 @@ from app.db.session import Base
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pagination: WHERE owner_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_tasks_owner_created_id", "owner_id", "created_at", "id"),
+        # The archive job's scan: completed tasks by age (app.db.archive).
+        Index(
+            "ix_tasks_done_updated_at",
+            "updated_at",
+            # Same text as the archive query renders, or SQLite ignores it.
+            sqlite_where=text("done = 1"),
+            postgresql_where=text("done"),
+        ),
+        # Never reuse the id of a deleted (or archived) row on SQLite; ids are
+        # unique across tasks and archived_tasks. Postgres sequences already
+        # behave that way.
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     title = Column(String(200), nullable=False, index=True)
     done = Column(Boolean, default=False, nullable=False)
+    # Bumped on every change that alters the row, used for ETag/If-Match.
+    version = Column(Integer, default=1, server_default="1", nullable=False)
     owner_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
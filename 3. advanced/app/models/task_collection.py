@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer
+
+from app.db.session import Base
+
+
+class TaskCollection(Base):
+    """Per-user bookkeeping for the task list as a whole.
+
+    Every write to the user's tasks bumps `version` and applies its deltas to
+    `total`/`done` in the same transaction, so list ETags and task counts are a
+    primary-key lookup. Archived tasks still count; `archived` says how many
+    of them are archived. `python -m app.scripts.rebuild_task_counters`
+    repairs drift.
+    """
+
+    __tablename__ = "task_collections"
+
+    owner_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    version = Column(BigInteger, default=0, server_default="0", nullable=False)
+    total = Column(BigInteger, default=0, server_default="0", nullable=False)
+    done = Column(BigInteger, default=0, server_default="0", nullable=False)
+    # How many of `total`/`done` live in archived_tasks (all of them done).
+    archived = Column(BigInteger, default=0, server_default="0", nullable=False)
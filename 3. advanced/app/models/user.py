@@ -23,4 +23,11 @@ class User(Base):
         nullable=False,
     )
 
-    tasks = relationship("Task", back_populates="owner", cascade="all, delete-orphan")
+    # passive_deletes: deleting a user leaves the tasks to ON DELETE CASCADE
+    # (or app.db.user_deletion) instead of loading and deleting each one.
+    tasks = relationship(
+        "Task",
+        back_populates="owner",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
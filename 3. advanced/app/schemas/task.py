@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -21,8 +21,50 @@ class TaskUpdate(BaseModel):
 class TaskRead(TaskBase):
     id: int
     owner_id: int
+    version: int
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class TaskStats(BaseModel):
+    total: int
+    done: int
+    pending: int
+
+
+class TaskBulkCreate(BaseModel):
+    items: List[TaskCreate] = Field(..., min_length=1)
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+
+class TaskBulkUpdate(BaseModel):
+    items: List[TaskBulkUpdateItem] = Field(..., min_length=1)
+
+
+class TaskBulkDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1)
+
+
+class TaskBulkResult(BaseModel):
+    id: Optional[int] = None
+    status: Literal["created", "updated", "deleted", "not_found"]
+    task: Optional[TaskRead] = None
+
+
+class TaskImportError(BaseModel):
+    line: int
+    error: str
+
+
+class TaskImportResult(BaseModel):
+    imported: int
+    failed: int
+    elapsed_seconds: float
+    rows_per_second: float
+    errors: List[TaskImportError] = []
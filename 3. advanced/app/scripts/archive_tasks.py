@@ -0,0 +1,36 @@
+"""Move completed tasks older than ARCHIVE_AFTER_DAYS to archived_tasks.
+
+    python -m app.scripts.archive_tasks                  # settings from the env
+    python -m app.scripts.archive_tasks --days 90 --max-batches 10
+"""
+import argparse
+import sys
+
+from app.core.config import settings
+from app.db.archive import archive_completed_tasks
+from app.db.session import SessionLocal
+import app.db.base  # noqa: F401
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=settings.archive_after_days)
+    parser.add_argument("--batch-size", type=int, default=settings.archive_batch_size)
+    parser.add_argument(
+        "--max-batches", type=int, default=None, help="Stop after this many batches"
+    )
+    args = parser.parse_args(argv)
+
+    moved = archive_completed_tasks(
+        SessionLocal,
+        older_than_days=args.days,
+        batch_size=args.batch_size,
+        pause=settings.archive_batch_pause_ms / 1000,
+        max_batches=args.max_batches,
+    )
+    print(f"Archived {moved} task(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
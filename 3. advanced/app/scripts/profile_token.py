@@ -0,0 +1,28 @@
+"""Print an X-Profile token for PROFILING_SECRET (see app.core.profiling).
+
+    TOKEN=$(python -m app.scripts.profile_token --minutes 10)
+    curl -H "X-Profile: $TOKEN" -H "X-Profile-Output: inline" ...
+"""
+import argparse
+import sys
+import time
+
+from app.core.config import settings
+from app.core.profiling import sign_token
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--minutes", type=float, default=15, help="How long the token stays valid"
+    )
+    args = parser.parse_args(argv)
+    if not settings.profiling_secret:
+        print("PROFILING_SECRET is not set", file=sys.stderr)
+        return 1
+    print(sign_token(settings.profiling_secret, int(time.time() + args.minutes * 60)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
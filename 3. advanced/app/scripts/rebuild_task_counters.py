@@ -0,0 +1,108 @@
+"""Verify or rebuild the per-user task counters in task_collections.
+
+    python -m app.scripts.rebuild_task_counters           # fix drift
+    python -m app.scripts.rebuild_task_counters --verify  # report only, exit 1 on drift
+"""
+import argparse
+import sys
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.db.task_counters import bump_collection_statement, collections_table
+from app.models.archived_task import ArchivedTask
+from app.models.task import Task
+import app.db.base  # noqa: F401
+
+
+def _count_tasks(db: Session, model) -> dict[int, tuple[int, int]]:
+    return {
+        owner_id: (total, done or 0)
+        for owner_id, total, done in db.execute(
+            select(
+                model.owner_id,
+                func.count(),
+                func.sum(case((model.done.is_(True), 1), else_=0)),
+            ).group_by(model.owner_id)
+        )
+    }
+
+
+def find_drift(db: Session) -> list[tuple[int, ...]]:
+    """(owner_id, stored total/done/archived, actual total/done/archived) rows.
+
+    Totals include archived tasks."""
+    hot = _count_tasks(db, Task)
+    archived = _count_tasks(db, ArchivedTask)
+    actual = {}
+    for owner_id in hot.keys() | archived.keys():
+        hot_total, hot_done = hot.get(owner_id, (0, 0))
+        archived_total, archived_done = archived.get(owner_id, (0, 0))
+        actual[owner_id] = (
+            hot_total + archived_total,
+            hot_done + archived_done,
+            archived_total,
+        )
+    stored = {
+        owner_id: (total, done, archived_total)
+        for owner_id, total, done, archived_total in db.execute(
+            select(
+                collections_table.c.owner_id,
+                collections_table.c.total,
+                collections_table.c.done,
+                collections_table.c.archived,
+            )
+        )
+    }
+    drift = []
+    for owner_id in sorted(actual.keys() | stored.keys()):
+        expected = actual.get(owner_id, (0, 0, 0))
+        current = stored.get(owner_id, (0, 0, 0))
+        if expected != current:
+            drift.append((owner_id, *current, *expected))
+    return drift
+
+
+def fix_drift(db: Session, drift) -> None:
+    for owner_id, _, _, _, total, done, archived in drift:
+        # Make sure the row exists (and bump the version so list ETags and
+        # X-Total-Count change), then overwrite the counters.
+        db.execute(bump_collection_statement(owner_id))
+        db.execute(
+            update(collections_table)
+            .where(collections_table.c.owner_id == owner_id)
+            .values(total=total, done=done, archived=archived)
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--verify", action="store_true", help="Only report drift, exit 1 if any"
+    )
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        # Counting and fixing in one transaction keeps concurrent writers from
+        # slipping in between on databases with serializable writes (SQLite);
+        # on Postgres run it in a quiet period or re-run --verify afterwards.
+        drift = find_drift(db)
+        for owner_id, total, done, archived, *actual in drift:
+            actual_total, actual_done, actual_archived = actual
+            print(
+                f"owner {owner_id}: stored total={total} done={done} "
+                f"archived={archived}, actual total={actual_total} "
+                f"done={actual_done} archived={actual_archived}"
+            )
+        if args.verify:
+            print(f"{len(drift)} user(s) with drifted counters")
+            return 1 if drift else 0
+        fix_drift(db, drift)
+        db.commit()
+        print(f"Fixed {len(drift)} user(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
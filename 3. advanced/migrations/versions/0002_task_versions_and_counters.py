@@ -0,0 +1,53 @@
+"""task versions and counters
+
+The ETag version column on tasks, the keyset pagination index and the
+per-user task counters, filled from the existing tasks.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 18:44:02.118507
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("tasks") as batch_op:
+        batch_op.add_column(
+            sa.Column("version", sa.Integer(), server_default="1", nullable=False)
+        )
+    op.create_index(
+        "ix_tasks_owner_created_id", "tasks", ["owner_id", "created_at", "id"]
+    )
+
+    op.create_table(
+        "task_collections",
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("total", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("done", sa.BigInteger(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("owner_id"),
+    )
+    op.execute(
+        "INSERT INTO task_collections (owner_id, version, total, done) "
+        "SELECT owner_id, 1, COUNT(*), SUM(CASE WHEN done THEN 1 ELSE 0 END) "
+        "FROM tasks GROUP BY owner_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("task_collections")
+    op.drop_index("ix_tasks_owner_created_id", table_name="tasks")
+    with op.batch_alter_table("tasks") as batch_op:
+        batch_op.drop_column("version")
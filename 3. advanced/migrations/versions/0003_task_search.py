@@ -0,0 +1,70 @@
+"""task search
+
+The title search index: FTS5 with sync triggers on SQLite, a generated
+tsvector column in a GIN index together with owner_id (btree_gin) on
+Postgres. Existing titles are indexed right away.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 18:45:27.904311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same statements as app/db/search.py at the time of this revision; copied so
+# the migration stays fixed when the app code moves on.
+SQLITE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, owner_id, content='tasks', content_rowid='id', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, owner_id) "
+    "VALUES (new.id, new.title, new.owner_id); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, owner_id) "
+    "VALUES ('delete', old.id, old.title, old.owner_id); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, owner_id "
+    "ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, owner_id) "
+    "VALUES ('delete', old.id, old.title, old.owner_id); "
+    "INSERT INTO tasks_fts(rowid, title, owner_id) "
+    "VALUES (new.id, new.title, new.owner_id); END",
+)
+POSTGRES_SEARCH_DDL = (
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', title)) STORED",
+    "CREATE EXTENSION IF NOT EXISTS btree_gin",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_owner_search_vector ON tasks "
+    "USING gin (owner_id, search_vector)",
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_SEARCH_DDL:
+            op.execute(statement)
+        # The triggers only cover later writes.
+        op.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        for statement in POSTGRES_SEARCH_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for trigger in ("tasks_fts_ai", "tasks_fts_ad", "tasks_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS tasks_fts")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_tasks_owner_search_vector")
+        op.execute("ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector")
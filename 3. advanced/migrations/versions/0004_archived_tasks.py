@@ -0,0 +1,100 @@
+"""archived tasks
+
+The archived_tasks table, the counter of archived tasks per user and the
+partial index the archive job scans. On SQLite the tasks table is rebuilt
+with AUTOINCREMENT so ids of archived (or deleted) tasks are never handed
+out again.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 19:16:04.646903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rebuilding tasks drops its triggers; same statements as in 0003.
+SQLITE_SEARCH_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, owner_id) "
+    "VALUES (new.id, new.title, new.owner_id); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, owner_id) "
+    "VALUES ('delete', old.id, old.title, old.owner_id); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, owner_id "
+    "ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, owner_id) "
+    "VALUES ('delete', old.id, old.title, old.owner_id); "
+    "INSERT INTO tasks_fts(rowid, title, owner_id) "
+    "VALUES (new.id, new.title, new.owner_id); END",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "archived_tasks",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("done", sa.Boolean(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_archived_tasks_owner_created_id",
+        "archived_tasks",
+        ["owner_id", "created_at", "id"],
+    )
+
+    with op.batch_alter_table("task_collections") as batch_op:
+        batch_op.add_column(
+            sa.Column("archived", sa.BigInteger(), server_default="0", nullable=False)
+        )
+
+    if op.get_bind().dialect.name == "sqlite":
+        with op.batch_alter_table(
+            "tasks", recreate="always", table_kwargs={"sqlite_autoincrement": True}
+        ):
+            pass
+        for statement in SQLITE_SEARCH_TRIGGERS:
+            op.execute(statement)
+
+    op.create_index(
+        "ix_tasks_done_updated_at",
+        "tasks",
+        ["updated_at"],
+        sqlite_where=sa.text("done = 1"),
+        postgresql_where=sa.text("done"),
+    )
+
+
+def downgrade() -> None:
+    # Archived tasks go back to the hot table; AUTOINCREMENT stays on SQLite.
+    op.execute(
+        "INSERT INTO tasks (id, title, done, version, owner_id, created_at, "
+        "updated_at) SELECT id, title, done, version, owner_id, created_at, "
+        "updated_at FROM archived_tasks"
+    )
+    op.drop_index("ix_tasks_done_updated_at", table_name="tasks")
+    with op.batch_alter_table("task_collections") as batch_op:
+        batch_op.drop_column("archived")
+    op.drop_index("ix_archived_tasks_owner_created_id", table_name="archived_tasks")
+    op.drop_table("archived_tasks")
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import Engine, event, update
+from sqlalchemy.orm import Session
+
+# Point the app at a throwaway SQLite file before app.* gets imported.
+_tmpdir = tempfile.mkdtemp(prefix="tasks-api-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/test.db"
+os.environ["BCRYPT_ROUNDS"] = "5"
+# Off by default, but a local .env may enable it; tests hammer the API from one
+# client, test_rate_limit.py switches it on where needed.
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+# Off by default; the query and timing hooks it installs should run in tests.
+os.environ["METRICS_ENABLED"] = "true"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.auth_cache import auth_cache  # noqa: E402
+from app.db.session import SessionLocal, create_tables  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+# TestClient only runs the lifespan inside `with`, so set up the schema here.
+create_tables()
+
+
+class QueryCounter:
+    """Records the SQL every engine runs while active (sync, async, replicas
+    and the group-commit writer alike)."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(Engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(Engine, "before_cursor_execute", self._record)
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        # The group-commit writer issues its own BEGIN IMMEDIATE; transaction
+        # control isn't a query (pysqlite's implicit BEGIN isn't seen here).
+        if not statement.startswith("BEGIN"):
+            self.statements.append(statement)
+
+
+@contextmanager
+def query_budget(limit: int):
+    """Fail if the block runs more than `limit` statements."""
+    with QueryCounter() as queries:
+        yield queries
+    listing = "\n".join(f"  {statement}" for statement in queries.statements)
+    assert len(queries) <= limit, f"{len(queries)} queries, budget {limit}:\n{listing}"
+
+
+class LazyLoadError(AssertionError):
+    pass
+
+
+def _forbid_lazy_loads(orm_execute_state):
+    # Eager loaders (selectinload etc.) are relationship loads too, but they
+    # don't start from a single instance.
+    if (
+        orm_execute_state.is_relationship_load
+        and orm_execute_state.lazy_loaded_from is not None
+    ):
+        path = orm_execute_state.loader_strategy_path
+        raise LazyLoadError(
+            f"Lazy load of {path.natural_path[-1]} - load it with the query "
+            "(or select the columns) instead of once per object"
+        )
+
+
+@pytest.fixture(autouse=True)
+def strict_loading():
+    # A lazy relationship load while a request is handled is an N+1 in the
+    # making; it fails the request (and with it the test).
+    event.listen(Session, "do_orm_execute", _forbid_lazy_loads)
+    yield
+    event.remove(Session, "do_orm_execute", _forbid_lazy_loads)
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def make_auth_headers(client):
+    def _make_auth_headers():
+        email = f"{uuid.uuid4().hex}@example.com"
+        password = "secret123"
+        response = client.post(
+            "/auth/register", json={"email": email, "password": password}
+        )
+        assert response.status_code == 201
+        response = client.post(
+            "/auth/token", data={"username": email, "password": password}
+        )
+        assert response.status_code == 200
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return _make_auth_headers
+
+
+@pytest.fixture
+def auth_headers(make_auth_headers):
+    return make_auth_headers()
+
+
+@pytest.fixture
+def admin_headers(client, make_auth_headers):
+    headers = make_auth_headers()
+    user_id = client.get("/users/me", headers=headers).json()["id"]
+    users = User.__table__
+    with SessionLocal() as db:
+        db.execute(
+            update(users).where(users.c.id == user_id).values(is_superuser=True)
+        )
+        db.commit()
+    auth_cache.invalidate_user(user_id)  # a Core UPDATE, see app.core.auth_cache
+    return headers
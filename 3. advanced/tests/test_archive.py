@@ -0,0 +1,134 @@
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy import update
+
+from app.db.archive import archive_completed_tasks, tasks_table
+from app.db.session import SessionLocal
+from app.scripts import archive_tasks, rebuild_task_counters
+
+
+def _create(client, headers, title, done=False):
+    task_in = {"title": title, "done": done}
+    response = client.post("/tasks/", json=task_in, headers=headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+def _age(*task_ids):
+    # Pretend the tasks were last touched years ago.
+    with SessionLocal() as db:
+        db.execute(
+            update(tasks_table)
+            .where(tasks_table.c.id.in_(task_ids))
+            .values(updated_at=datetime(2020, 1, 1, tzinfo=timezone.utc))
+        )
+        db.commit()
+
+
+def _titles(response):
+    return [task["title"] for task in response.json()]
+
+
+def test_archive_moves_old_completed_tasks(client, auth_headers):
+    old_done = [
+        _create(client, auth_headers, f"old {i}", done=True) for i in range(3)
+    ]
+    old_open = _create(client, auth_headers, "old but open")
+    recent_done = _create(client, auth_headers, "recent", done=True)
+    _age(*(task["id"] for task in old_done), old_open["id"])
+    stats = client.get("/tasks/stats", headers=auth_headers).json()
+    etag = client.get("/tasks/", headers=auth_headers).headers["ETag"]
+
+    moved = archive_completed_tasks(SessionLocal, older_than_days=30, batch_size=2)
+    assert moved == 3
+
+    params = {"include_total": True}
+    listed = client.get("/tasks/", params=params, headers=auth_headers)
+    assert _titles(listed) == ["recent", "old but open"]
+    assert listed.headers["X-Total-Count"] == "2"
+    assert listed.headers["ETag"] != etag
+    completed = client.get(
+        "/tasks/",
+        params={"status_filter": "completed", "include_total": True},
+        headers=auth_headers,
+    )
+    assert _titles(completed) == ["recent"]
+    assert completed.headers["X-Total-Count"] == "1"
+    # Archived tasks still count in the stats.
+    assert client.get("/tasks/stats", headers=auth_headers).json() == stats
+
+    everything = client.get(
+        "/tasks/",
+        params={"include_archived": True, "include_total": True},
+        headers=auth_headers,
+    )
+    assert _titles(everything) == [
+        "recent",
+        "old but open",
+        "old 2",
+        "old 1",
+        "old 0",
+    ]
+    assert everything.headers["X-Total-Count"] == "5"
+
+    archived_id = old_done[0]["id"]
+    assert client.get(f"/tasks/{archived_id}", headers=auth_headers).status_code == 404
+    response = client.get(
+        f"/tasks/{archived_id}", params={"include_archived": True}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["title"] == "old 0"
+    # Archived tasks are read-only.
+    response = client.patch(f"/tasks/{archived_id}/incomplete", headers=auth_headers)
+    assert response.status_code == 404
+
+    exported = client.get("/tasks/export", headers=auth_headers)
+    assert len(exported.text.splitlines()) == 2
+    exported = client.get(
+        "/tasks/export", params={"include_archived": True}, headers=auth_headers
+    )
+    ids = [json.loads(line)["id"] for line in exported.text.splitlines()]
+    assert ids == sorted(task["id"] for task in [*old_done, old_open, recent_done])
+
+    with SessionLocal() as db:
+        owner_id = old_open["owner_id"]
+        drift = rebuild_task_counters.find_drift(db)
+        assert [row for row in drift if row[0] == owner_id] == []
+
+
+def test_cursor_pages_through_hot_and_archived_tasks(client, auth_headers):
+    tasks = [
+        _create(client, auth_headers, f"task {i}", done=i % 2 == 0) for i in range(6)
+    ]
+    _age(*(task["id"] for task in tasks))
+    archive_completed_tasks(SessionLocal, older_than_days=30, batch_size=100)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, "include_archived": True}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/tasks/", params=params, headers=auth_headers)
+        seen += _titles(response)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == [f"task {i}" for i in reversed(range(6))]
+
+
+def test_archived_ids_are_not_reused(client, auth_headers):
+    task = _create(client, auth_headers, "newest", done=True)
+    _age(task["id"])
+    archive_completed_tasks(SessionLocal, older_than_days=30, batch_size=100)
+    # The archived task had the highest id; SQLite must not hand it out again.
+    assert _create(client, auth_headers, "next")["id"] > task["id"]
+
+
+def test_archive_script(client, auth_headers, capsys):
+    task = _create(client, auth_headers, "script", done=True)
+    _age(task["id"])
+    assert archive_tasks.main(["--days", "30"]) == 0
+    assert "Archived" in capsys.readouterr().out
+    response = client.get(f"/tasks/{task['id']}", headers=auth_headers)
+    assert response.status_code == 404
@@ -0,0 +1,70 @@
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+pytest.importorskip("aiosqlite")
+
+from app.api.api import _prefer_async  # noqa: E402
+from app.api.routes import auth, tasks, users  # noqa: E402
+from app.api.routes.aio import auth as async_auth  # noqa: E402
+from app.api.routes.aio import tasks as async_tasks  # noqa: E402
+from app.api.routes.aio import users as async_users  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.deps import get_async_db  # noqa: E402
+
+
+@pytest.fixture
+def async_client():
+    engine = create_async_engine(settings.async_database_url(), poolclass=NullPool)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(_prefer_async(auth.router, async_auth.router), prefix="/auth")
+    app.include_router(_prefer_async(users.router, async_users.router), prefix="/users")
+    app.include_router(_prefer_async(tasks.router, async_tasks.router), prefix="/tasks")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as client:
+        yield client
+
+
+def test_async_routes_replace_sync_twins():
+    merged = _prefer_async(tasks.router, async_tasks.router)
+    endpoints = {route.endpoint for route in merged.routes}
+    assert async_tasks.list_tasks in endpoints
+    assert tasks.list_tasks not in endpoints
+
+
+def test_async_task_flow(async_client):
+    email = f"{uuid.uuid4().hex}@example.com"
+    response = async_client.post(
+        "/auth/register", json={"email": email, "password": "secret123"}
+    )
+    assert response.status_code == 201
+    token = async_client.post(
+        "/auth/token", data={"username": email, "password": "secret123"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert async_client.get("/users/me", headers=headers).json()["email"] == email
+
+    task = async_client.post("/tasks/", json={"title": "async"}, headers=headers)
+    assert task.status_code == 201
+    task_id = task.json()["id"]
+
+    done = async_client.patch(f"/tasks/{task_id}/complete", headers=headers)
+    assert done.json()["done"] is True
+
+    listed = async_client.get("/tasks/", params={"limit": 1}, headers=headers)
+    assert [t["id"] for t in listed.json()] == [task_id]
+    assert "X-Next-Cursor" in listed.headers
+
+    assert async_client.delete(f"/tasks/{task_id}", headers=headers).status_code == 204
+    assert async_client.get(f"/tasks/{task_id}", headers=headers).status_code == 404
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import uuid
+
+import pytest
+from passlib.context import CryptContext
+
+from app.core.security import PasswordHasherBusy, PasswordWorkerPool, password_pool
+from app.db.session import SessionLocal
+from app.models.user import User
+
+
+def test_login_upgrades_outdated_hash(client):
+    email = f"{uuid.uuid4().hex}@example.com"
+    weak_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+    with SessionLocal() as db:
+        db.add(User(email=email, hashed_password=weak_context.hash("secret123")))
+        db.commit()
+
+    response = client.post(
+        "/auth/token", data={"username": email, "password": "secret123"}
+    )
+    assert response.status_code == 200
+
+    with SessionLocal() as db:
+        stored = db.query(User).filter(User.email == email).one().hashed_password
+    assert stored.startswith("$2b$05$")
+
+
+def test_wrong_password_rejected(client):
+    response = client.post(
+        "/auth/token", data={"username": "nobody@example.com", "password": "nope"}
+    )
+    assert response.status_code == 400
+
+
+def test_pool_rejects_beyond_max_pending():
+    pool = PasswordWorkerPool(workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordHasherBusy):
+            await pool.run(release.wait)
+        release.set()
+        await first
+
+    asyncio.run(scenario())
+    pool.shutdown()
+
+
+def test_pool_restarts_after_shutdown():
+    pool = PasswordWorkerPool(workers=1, max_pending=1)
+    assert asyncio.run(pool.run(sum, [1, 2])) == 3
+    pool.shutdown()
+    assert asyncio.run(pool.run(sum, [3, 4])) == 7
+    pool.shutdown()
+
+
+def test_busy_pool_returns_503(client, monkeypatch):
+    monkeypatch.setattr(password_pool, "max_pending", 0)
+    response = client.post(
+        "/auth/register",
+        json={"email": f"{uuid.uuid4().hex}@example.com", "password": "secret123"},
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
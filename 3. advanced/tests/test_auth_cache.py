@@ -0,0 +1,75 @@
+import time
+
+from app.core.auth_cache import AuthCache, CurrentUser, auth_cache
+from app.db.session import SessionLocal
+from app.models.user import User
+
+
+def test_cache_expires_and_evicts():
+    cache = AuthCache(max_size=2, ttl_seconds=60)
+    alice = CurrentUser(id=1, is_active=True, is_superuser=False)
+    bob = CurrentUser(id=2, is_active=True, is_superuser=False)
+
+    cache.put("a", alice)
+    cache.put("b", bob)
+    assert cache.get("a") == alice
+    cache.put("c", bob)
+    assert cache.get("b") is None
+    assert cache.get("c") == bob
+    assert cache.stats()["size"] == 2
+
+    cache.put("expired", alice, token_exp=int(time.time()) - 1)
+    assert cache.get("expired") is None
+
+
+def test_invalidate_user_drops_all_tokens():
+    cache = AuthCache(max_size=10, ttl_seconds=60)
+    alice = CurrentUser(id=1, is_active=True, is_superuser=False)
+    cache.put("a1", alice)
+    cache.put("a2", alice)
+    cache.invalidate_user(1)
+    assert cache.get("a1") is None and cache.get("a2") is None
+
+
+def test_authenticated_requests_hit_cache(client, auth_headers):
+    auth_cache.clear()
+    hits = auth_cache.hits
+    client.get("/tasks/", headers=auth_headers)
+    client.get("/tasks/", headers=auth_headers)
+    assert auth_cache.hits == hits + 1
+
+
+def test_deactivation_invalidates_cache(client, auth_headers):
+    me = client.get("/users/me", headers=auth_headers).json()
+    assert client.get("/tasks/", headers=auth_headers).status_code == 200
+
+    with SessionLocal() as db:
+        db.get(User, me["id"]).is_active = False
+        db.commit()
+
+    response = client.get("/tasks/", headers=auth_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
+
+
+def test_changes_invalidate_cache_only_after_commit(client, auth_headers):
+    me = client.get("/users/me", headers=auth_headers).json()
+    token = auth_headers["Authorization"].split()[1]
+    active = CurrentUser(id=me["id"], is_active=True, is_superuser=False)
+
+    with SessionLocal() as db:
+        db.get(User, me["id"]).is_active = False
+        db.flush()
+        # A concurrent request still sees the committed, active row.
+        auth_cache.put(token, active)
+        db.commit()
+    assert auth_cache.get(token) is None
+
+    with SessionLocal() as db:
+        db.get(User, me["id"]).is_active = True
+        db.flush()
+        db.rollback()
+    auth_cache.put(token, active)
+    with SessionLocal() as db:
+        db.commit()
+    assert auth_cache.get(token) == active
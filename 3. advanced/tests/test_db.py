@@ -0,0 +1,84 @@
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.session import engine
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+
+def test_sqlite_connections_use_wal_and_busy_timeout():
+    with engine.connect() as connection:
+        journal_mode = connection.execute(text("PRAGMA journal_mode")).scalar()
+        busy_timeout = connection.execute(text("PRAGMA busy_timeout")).scalar()
+        synchronous = connection.execute(text("PRAGMA synchronous")).scalar()
+    assert journal_mode == "wal"
+    assert busy_timeout == settings.sqlite_busy_timeout_ms
+    assert synchronous == 1  # NORMAL
+
+
+def test_pool_is_sized_from_settings():
+    assert engine.pool.size() == settings.db_pool_size
+
+
+def test_migrations_match_models(tmp_path):
+    # A fresh database built only from migrations must equal the models
+    # (`alembic check` fails on any difference) and have the search index.
+    database = tmp_path / "migrated.db"
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{database}"}
+    for command in (["upgrade", "head"], ["check"]):
+        subprocess.run(
+            [sys.executable, "-m", "alembic", *command],
+            cwd=PROJECT_DIR,
+            env=env,
+            check=True,
+            capture_output=True,
+        )
+    with sqlite3.connect(database) as connection:
+        names = {row[0] for row in connection.execute("SELECT name FROM sqlite_master")}
+    assert {"users", "tasks", "task_collections", "tasks_fts"} <= names
+    assert {"tasks_fts_ai", "tasks_fts_ad", "tasks_fts_au"} <= names
+
+
+def test_baseline_database_upgrades_with_its_tasks(tmp_path):
+    # Revision 0001 is the schema `create_all` made before the migrations;
+    # upgrading such a database fills the counters and the search index.
+    database = tmp_path / "baseline.db"
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{database}"}
+
+    def alembic(*command):
+        subprocess.run(
+            [sys.executable, "-m", "alembic", *command],
+            cwd=PROJECT_DIR,
+            env=env,
+            check=True,
+            capture_output=True,
+        )
+
+    alembic("upgrade", "0001")
+    with sqlite3.connect(database) as connection:
+        connection.execute(
+            "INSERT INTO users (id, email, hashed_password, is_active, is_superuser) "
+            "VALUES (1, 'old@example.com', 'x', 1, 0)"
+        )
+        connection.executemany(
+            "INSERT INTO tasks (title, done, owner_id) VALUES (?, ?, 1)",
+            [("buy milk", 0), ("buy bread", 1), ("walk dog", 1)],
+        )
+    alembic("upgrade", "head")
+    alembic("check")
+
+    with sqlite3.connect(database) as connection:
+        counters = connection.execute(
+            "SELECT total, done, archived FROM task_collections WHERE owner_id = 1"
+        ).fetchone()
+        found = connection.execute(
+            "SELECT count(*) FROM tasks_fts WHERE tasks_fts MATCH 'buy'"
+        ).fetchone()
+    assert counters == (3, 2, 0)
+    assert found == (2,)
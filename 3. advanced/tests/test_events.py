@@ -0,0 +1,112 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from app.core import events
+from app.core.events import LocalBroker
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    broker = LocalBroker(max_pending=10)
+    monkeypatch.setattr(events, "broker", broker)
+    return broker
+
+
+def _parse(body):
+    parsed = []
+    for frame in body.split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in frame.splitlines() if ": " in line
+        )
+        if "event" in fields:
+            parsed.append((fields["event"], json.loads(fields["data"])))
+    return parsed
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_stream_pushes_own_task_writes(
+    client, broker, auth_headers, make_auth_headers
+):
+    result = {}
+
+    def listen():
+        response = client.get("/tasks/stream", headers=auth_headers)
+        result["response"] = response
+
+    listener = threading.Thread(target=listen)
+    listener.start()
+    _wait_for(lambda: len(broker) == 1)
+
+    task = client.post("/tasks/", json={"title": "Live"}, headers=auth_headers).json()
+    url = f"/tasks/{task['id']}"
+    client.patch(f"{url}/complete", headers=auth_headers)
+    client.put(url, json={"title": "Live 2"}, headers=auth_headers)
+    client.delete(url, headers=auth_headers)
+    client.post("/tasks/", json={"title": "Not mine"}, headers=make_auth_headers())
+    broker.close()
+    listener.join(5)
+
+    response = result["response"]
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith("retry: ")
+    parsed = _parse(response.text)
+    assert [event for event, _ in parsed] == [
+        "created",
+        "completed",
+        "updated",
+        "deleted",
+    ]
+    assert parsed[0][1] == {"id": task["id"], "task": task}
+    assert parsed[1][1]["task"]["done"] is True
+    assert parsed[2][1]["task"]["title"] == "Live 2"
+    assert parsed[3][1] == {"id": task["id"]}
+    assert len(broker) == 0
+
+
+def test_stream_requires_auth(client):
+    assert client.get("/tasks/stream").status_code == 401
+
+
+def test_publish_from_other_threads_reaches_only_the_owner():
+    async def scenario():
+        broker = LocalBroker(max_pending=10)
+        mine, other = broker.subscribe(1), broker.subscribe(2)
+        await asyncio.to_thread(broker.publish, 1, ["event: a\n\n"])
+        assert await asyncio.wait_for(mine.queue.get(), 1) == "event: a\n\n"
+        assert other.queue.empty()
+        broker.unsubscribe(mine)
+        assert not broker.listening(1)
+
+    asyncio.run(scenario())
+
+
+def test_slow_consumer_is_evicted():
+    async def scenario():
+        broker = LocalBroker(max_pending=2)
+        subscription = broker.subscribe(1)
+        for i in range(3):
+            broker.publish(1, [f"event: {i}\n\n"])
+        await asyncio.sleep(0)  # run the call_soon_threadsafe callbacks
+        return [frame async for frame in subscription.frames(1, 1)]
+
+    assert asyncio.run(scenario()) == ["event: evicted\ndata: {}\n\n"]
+
+
+def test_idle_stream_sends_heartbeats_and_ends():
+    async def scenario():
+        subscription = LocalBroker(max_pending=2).subscribe(1)
+        return [frame async for frame in subscription.frames(0.01, 0.05)]
+
+    frames = asyncio.run(scenario())
+    assert frames and set(frames) == {": ping\n\n"}
@@ -0,0 +1,113 @@
+import threading
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db import group_commit
+from app.db.group_commit import GroupCommitter, writer_sessionmaker
+from app.db.session import SessionLocal
+from app.models.user import User
+
+users_table = User.__table__
+
+
+@pytest.fixture
+def committer(monkeypatch):
+    committer = GroupCommitter(None, max_batch=64, max_wait=0.02)
+    monkeypatch.setattr(settings, "group_commit_enabled", True)
+    monkeypatch.setattr(group_commit, "group_committer", committer)
+    yield committer
+    committer.close()
+
+
+def _add_user(db: Session, email: str) -> int:
+    stmt = insert(users_table).values(email=email, hashed_password="x")
+    return db.execute(stmt.returning(users_table.c.id)).scalar_one()
+
+
+def _fail(db: Session, email: str) -> None:
+    _add_user(db, email)
+    raise ValueError("boom")
+
+
+def _emails(*emails):
+    with SessionLocal() as db:
+        stmt = select(users_table.c.email).where(users_table.c.email.in_(emails))
+        return set(db.execute(stmt).scalars())
+
+
+def test_concurrent_api_writes_share_commits(client, auth_headers, committer):
+    responses = []
+
+    def create(i):
+        task = {"title": f"T{i}"}
+        responses.append(client.post("/tasks/", json=task, headers=auth_headers))
+
+    threads = [threading.Thread(target=create, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [r.status_code for r in responses] == [201] * 20
+    assert committer.writes == 20
+    assert committer.commits < committer.writes
+    stats = client.get("/tasks/stats", headers=auth_headers).json()
+    assert stats == {"total": 20, "done": 0, "pending": 20}
+
+
+def test_task_routes_behave_the_same(client, auth_headers, committer):
+    task = client.post("/tasks/", json={"title": "A"}, headers=auth_headers).json()
+    url = f"/tasks/{task['id']}"
+    done = client.patch(f"{url}/complete", headers=auth_headers)
+    assert done.json()["done"] is True
+    stale = client.put(
+        url, json={"title": "B"}, headers={**auth_headers, "If-Match": '"0-1"'}
+    )
+    assert stale.status_code == 412
+    assert client.delete(url, headers=auth_headers).status_code == 204
+    assert client.delete(url, headers=auth_headers).status_code == 404
+    stats = client.get("/tasks/stats", headers=auth_headers).json()
+    assert stats == {"total": 0, "done": 0, "pending": 0}
+
+
+def test_failed_write_only_fails_its_caller():
+    committer = GroupCommitter(writer_sessionmaker(), max_batch=8, max_wait=0.05)
+    try:
+        ok = committer.submit(_add_user, "gc-ok-1@example.com")
+        bad = committer.submit(_fail, "gc-bad@example.com")
+        ok_too = committer.submit(_add_user, "gc-ok-2@example.com")
+        assert isinstance(ok.result(), int) and isinstance(ok_too.result(), int)
+        with pytest.raises(ValueError):
+            bad.result()
+    finally:
+        committer.close()
+    assert committer.commits == 1
+    emails = ("gc-ok-1@example.com", "gc-ok-2@example.com", "gc-bad@example.com")
+    assert _emails(*emails) == set(emails[:2])
+
+
+def test_failed_batch_commit_falls_back_to_single_commits():
+    failed = []
+
+    class FlakySession(Session):
+        def commit(self):
+            if not failed:
+                failed.append(True)
+                raise RuntimeError("commit failed")
+            super().commit()
+
+    writer_engine = writer_sessionmaker().kw["bind"]
+    factory = sessionmaker(bind=writer_engine, class_=FlakySession)
+    committer = GroupCommitter(factory, max_batch=8, max_wait=0.05)
+    try:
+        futures = [
+            committer.submit(_add_user, f"gc-retry-{i}@example.com") for i in range(3)
+        ]
+        assert all(isinstance(future.result(), int) for future in futures)
+    finally:
+        committer.close()
+    assert committer.commits == 3
+    assert len(_emails(*(f"gc-retry-{i}@example.com" for i in range(3)))) == 3
@@ -0,0 +1,36 @@
+from app.core.config import settings
+from app.core.metrics import Histogram
+
+
+def test_histogram_buckets():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+
+
+def test_metrics_endpoint_reports_routes_and_sql(client, auth_headers):
+    client.get("/tasks/", headers=auth_headers)
+    client.get("/tasks/999999", headers=auth_headers)
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    assert (
+        'http_requests_total{method="GET",route="/tasks/{task_id}",status="404"}'
+        in body
+    )
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/tasks/"' in body
+    assert 'db_queries_per_request_count{route="/tasks/"}' in body
+    assert "db_pool_checked_out" in body
+    assert "auth_cache_hits" in body
+
+
+def test_metrics_token_is_required_when_set(client, monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", "scrape-me")
+    assert client.get("/metrics").status_code == 401
+    wrong = {"Authorization": "Bearer guess"}
+    assert client.get("/metrics", headers=wrong).status_code == 401
+    right = {"Authorization": "Bearer scrape-me"}
+    assert client.get("/metrics", headers=right).status_code == 200
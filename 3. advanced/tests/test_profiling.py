@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.profiling import (
+    ProfilingMiddleware,
+    StackSampler,
+    sign_token,
+    verify_token,
+)
+from app.api.api import api_router
+from app.core.config import settings
+from app.main import app
+
+SECRET = "profiling-secret"
+
+
+def _client(tmp_path, **options):
+    # Not `app`: with PROFILING_ENABLED=true it would profile these requests
+    # a second time.
+    bare = FastAPI()
+    bare.include_router(api_router)
+    options.setdefault("sample_rate", 0.0)
+    profiled = ProfilingMiddleware(
+        bare, secret=SECRET, directory=str(tmp_path), **options
+    )
+    return TestClient(profiled)
+
+
+def _token(minutes=5):
+    return sign_token(SECRET, int(time.time() + minutes * 60))
+
+
+def test_tokens_are_signed_and_expire():
+    assert verify_token(SECRET, _token())
+    assert not verify_token(SECRET, _token(minutes=-1))
+    assert not verify_token("other", _token())
+    assert not verify_token("", sign_token("", int(time.time()) + 60))
+    expires, _, signature = _token().partition(".")
+    assert not verify_token(SECRET, f"{int(expires) + 3600}.{signature}")
+
+
+def test_middleware_only_when_enabled():
+    added = any(m.cls is ProfilingMiddleware for m in app.user_middleware)
+    assert added == settings.profiling_enabled
+
+
+def test_unsigned_requests_are_not_profiled(tmp_path, auth_headers):
+    client = _client(tmp_path)
+    headers = {**auth_headers, "X-Profile": "1.forged"}
+    response = client.get("/tasks/", headers=headers)
+    assert response.status_code == 200
+    assert "X-Profile-File" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_signed_request_returns_speedscope_inline(tmp_path, auth_headers):
+    client = _client(tmp_path)
+    headers = {**auth_headers, "X-Profile": _token(), "X-Profile-Output": "inline"}
+    response = client.get("/tasks/", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["X-Profile-Status"] == "200"
+    profile = response.json()
+    assert profile["$schema"].startswith("https://www.speedscope.app/")
+    assert profile["name"] == "GET /tasks/"
+    assert "frames" in profile["shared"]
+
+
+def test_sampled_requests_are_written_to_disk(tmp_path, auth_headers):
+    client = _client(tmp_path, sample_rate=1.0, fmt="folded")
+    response = client.get("/tasks/", headers=auth_headers)
+    assert response.status_code == 200
+    written = tmp_path / response.headers["X-Profile-File"]
+    assert written.name.endswith(".folded.txt")
+    assert written.exists()
+
+
+def test_tracemalloc_reports_allocations(tmp_path, auth_headers):
+    client = _client(tmp_path)
+    headers = {
+        **auth_headers,
+        "X-Profile": _token(),
+        "X-Profile-Mode": "tracemalloc",
+        "X-Profile-Output": "inline",
+    }
+    response = client.post("/tasks/", json={"title": "traced"}, headers=headers)
+    assert response.headers["X-Profile-Status"] == "201"
+    assert response.text.startswith("tracemalloc: POST /tasks/")
+    assert "peak traced" in response.text
+
+
+def test_sampler_sees_busy_threads():
+    done = threading.Event()
+
+    def busy_loop():
+        while not done.is_set():
+            sum(range(1000))
+
+    worker = threading.Thread(target=busy_loop, name="busy")
+    sampler = StackSampler(interval=0.001)
+    worker.start()
+    sampler.start()
+    time.sleep(0.05)
+    sampler.stop()
+    done.set()
+    worker.join()
+
+    profile = sampler.speedscope("test")
+    names = {frame["name"] for frame in profile["shared"]["frames"]}
+    assert any(name.endswith("busy_loop") for name in names)
+    assert "busy" in [p["name"] for p in profile["profiles"]]
+    assert any(line.startswith("busy;") for line in sampler.folded().splitlines())
+    json.dumps(profile)
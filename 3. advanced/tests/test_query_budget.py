@@ -0,0 +1,122 @@
+"""Every route in api_router has a query budget; going over it fails.
+
+Requests run with a cold auth cache, so the budgets include loading the
+user. When a change legitimately needs another query, raise the budget in
+the same commit and say why.
+"""
+import uuid
+
+import pytest
+from conftest import LazyLoadError, query_budget
+from sqlalchemy import select
+
+from app.api.api import api_router
+from app.core.auth_cache import auth_cache
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.task import Task
+
+PASSWORD = "secret123"
+
+# (method, path) -> (max statements, request kwargs for the scenario)
+BUDGETS = {
+    ("GET", "/health/"): (0, lambda s: {}),
+    # Lookup, INSERT, and the reload of the committed user for the response.
+    ("POST", "/auth/register"): (
+        3,
+        lambda s: {
+            "json": {"email": f"{uuid.uuid4().hex}@example.com", "password": PASSWORD}
+        },
+    ),
+    ("POST", "/auth/token"): (
+        1,
+        lambda s: {"data": {"username": s["email"], "password": PASSWORD}},
+    ),
+    # The auth lookup only keeps a CurrentUser, so the handler loads the row
+    # again; with a warm auth cache it is one query.
+    ("GET", "/users/me"): (2, lambda s: {}),
+    ("PATCH", "/users/{user_id}/deactivate"): (4, lambda s: s["as_admin"]),
+    # Independent of the task count: one DELETE per table (SQLite without
+    # foreign_keys; more batches above USER_DELETE_BATCH_SIZE).
+    ("DELETE", "/users/{user_id}"): (9, lambda s: s["as_admin"]),
+    ("GET", "/tasks/export"): (2, lambda s: {}),
+    ("POST", "/tasks/import"): (
+        3,
+        lambda s: {
+            "content": b'{"title": "imported"}\n{"title": "too"}\n',
+            "headers": {"Content-Type": "application/x-ndjson"},
+        },
+    ),
+    ("POST", "/tasks/"): (3, lambda s: {"json": {"title": "new"}}),
+    # Lookup, one INSERT for all items, counters.
+    ("POST", "/tasks/bulk"): (
+        3,
+        lambda s: {"json": {"items": [{"title": "a"}, {"title": "b"}]}},
+    ),
+    ("PATCH", "/tasks/bulk"): (
+        3,
+        lambda s: {"json": {"items": [{"id": i, "done": True} for i in s["ids"]]}},
+    ),
+    ("DELETE", "/tasks/bulk"): (3, lambda s: {"json": {"ids": s["ids"]}}),
+    ("GET", "/tasks/"): (3, lambda s: {"params": {"include_total": True}}),
+    ("GET", "/tasks/stats"): (2, lambda s: {}),
+    ("GET", "/tasks/search"): (2, lambda s: {"params": {"q": "budget"}}),
+    ("GET", "/tasks/stream"): (1, lambda s: {}),
+    ("GET", "/tasks/{task_id}"): (2, lambda s: {}),
+    ("PUT", "/tasks/{task_id}"): (3, lambda s: {"json": {"title": "changed"}}),
+    ("DELETE", "/tasks/{task_id}"): (3, lambda s: {}),
+    ("PATCH", "/tasks/{task_id}/complete"): (3, lambda s: {}),
+    ("PATCH", "/tasks/{task_id}/incomplete"): (3, lambda s: {}),
+}
+
+
+def _routes():
+    return {
+        (method, route.path) for route in api_router.routes for method in route.methods
+    }
+
+
+def test_every_route_has_a_budget():
+    assert _routes() == set(BUDGETS)
+
+
+@pytest.fixture
+def scenario(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(settings, "stream_max_seconds", 0.01)
+    email = f"{uuid.uuid4().hex}@example.com"
+    client.post("/auth/register", json={"email": email, "password": PASSWORD})
+    token = client.post(
+        "/auth/token", data={"username": email, "password": PASSWORD}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    tasks = [
+        client.post("/tasks/", json={"title": title}, headers=headers).json()
+        for title in ("budget one", "budget two")
+    ]
+    return {
+        "email": email,
+        "headers": headers,
+        "user_id": tasks[0]["owner_id"],
+        "ids": [t["id"] for t in tasks],
+        "as_admin": {"headers": admin_headers},
+    }
+
+
+@pytest.mark.parametrize("method, path", sorted(BUDGETS))
+def test_route_stays_within_query_budget(client, scenario, method, path):
+    budget, make_kwargs = BUDGETS[method, path]
+    kwargs = make_kwargs(scenario)
+    kwargs["headers"] = {**scenario["headers"], **kwargs.get("headers", {})}
+    url = path.format(task_id=scenario["ids"][0], user_id=scenario["user_id"])
+    auth_cache.clear()
+
+    with query_budget(budget):
+        response = client.request(method, url, **kwargs)
+    assert response.status_code < 400, response.text
+
+
+def test_lazy_relationship_loads_fail(client, scenario):
+    with SessionLocal() as db:
+        task = db.scalars(select(Task).where(Task.id == scenario["ids"][0])).one()
+        with pytest.raises(LazyLoadError, match="Task.owner"):
+            task.owner
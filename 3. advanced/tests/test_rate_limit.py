@@ -0,0 +1,96 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import rate_limit
+from app.core.config import settings
+from app.core.rate_limit import MemoryRateLimitBackend, RateLimit
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = MemoryRateLimitBackend(max_keys=1000)
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(rate_limit.limiter, "backend", backend)
+    return backend
+
+
+def test_parse_rate():
+    assert RateLimit.parse("api", "10/minute") == RateLimit("api", 10, 60)
+    assert RateLimit.parse("api", "5 / 30 seconds") == RateLimit("api", 5, 30)
+    with pytest.raises(ValueError):
+        RateLimit.parse("api", "ten per minute")
+
+
+def test_auth_routes_are_limited_per_ip(client, backend):
+    limit = RateLimit.parse("auth", settings.rate_limit_auth).limit
+    form = {"username": "nobody@example.com", "password": "wrong"}
+    for remaining in reversed(range(limit)):
+        response = client.post("/auth/token", data=form)
+        assert response.status_code == 400
+        assert response.headers["RateLimit-Remaining"] == str(remaining)
+
+    response = client.post("/auth/token", data=form)
+    assert response.status_code == 429
+    assert response.headers["RateLimit-Limit"] == str(limit)
+    assert response.headers["RateLimit-Remaining"] == "0"
+    assert response.headers["RateLimit-Policy"] == f"{limit};w=60"
+    assert int(response.headers["Retry-After"]) >= 1
+    # Routes without a limit don't get the headers.
+    assert "RateLimit-Limit" not in client.get("/health/").headers
+
+
+def test_api_routes_are_limited_per_user(
+    client, backend, auth_headers, make_auth_headers, monkeypatch
+):
+    # Freeze the limiter's clock (only its own `time` name, not the event
+    # loop's) so no tokens refill between the requests.
+    now = time.monotonic()
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=lambda: now))
+    client.get("/tasks/", headers=auth_headers)
+    client.get("/tasks/", headers=auth_headers)
+    other = client.get("/tasks/", headers=make_auth_headers())
+    mine = client.get("/tasks/", headers=auth_headers)
+
+    limit = RateLimit.parse("api", settings.rate_limit_api).limit
+    assert int(mine.headers["RateLimit-Remaining"]) == limit - 3
+    assert int(other.headers["RateLimit-Remaining"]) == limit - 1
+    assert any(key.startswith("api:user:") for key in backend._buckets)
+
+
+def test_304_responses_carry_headers(client, backend, auth_headers):
+    response = client.get("/tasks/", headers=auth_headers)
+    response = client.get(
+        "/tasks/", headers={**auth_headers, "If-None-Match": response.headers["ETag"]}
+    )
+    assert response.status_code == 304
+    assert "RateLimit-Remaining" in response.headers
+
+
+def test_bucket_refills_over_time(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    backend = MemoryRateLimitBackend(max_keys=10)
+    limit = RateLimit("test", 2, 10)
+
+    assert backend.hit("k", limit).allowed
+    assert backend.hit("k", limit).allowed
+    blocked = backend.hit("k", limit)
+    assert not blocked.allowed
+    assert blocked.retry_after == pytest.approx(5)
+
+    now[0] += 5
+    assert backend.hit("k", limit).allowed
+    assert not backend.hit("k", limit).allowed
+
+
+def test_memory_is_bounded():
+    backend = MemoryRateLimitBackend(max_keys=3)
+    limit = RateLimit("test", 1, 60)
+    for key in "abcd":
+        backend.hit(key, limit)
+    assert len(backend) == 3
+    # "a" was evicted, so it starts over with a full bucket.
+    assert backend.hit("a", limit).allowed
+    assert not backend.hit("d", limit).allowed
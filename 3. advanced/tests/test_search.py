@@ -0,0 +1,92 @@
+import importlib.util
+from pathlib import Path
+
+from app.api.routes import tasks as task_routes
+from app.db import search
+
+MIGRATIONS = Path(__file__).resolve().parents[1] / "migrations" / "versions"
+
+
+def _create(client, headers, title):
+    response = client.post("/tasks/", json={"title": title}, headers=headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+def _search(client, headers, **params):
+    response = client.get("/tasks/search", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def _titles(response):
+    return [task["title"] for task in response.json()]
+
+
+def test_search_is_ranked_and_owner_scoped(client, auth_headers, make_auth_headers):
+    _create(client, auth_headers, "Milch kaufen")
+    _create(client, auth_headers, "Milch Milch Milch")
+    _create(client, auth_headers, "Auto waschen")
+    _create(client, make_auth_headers(), "Milch beim Nachbarn")
+
+    titles = _titles(_search(client, auth_headers, q="milch"))
+    assert titles == ["Milch Milch Milch", "Milch kaufen"]
+    # All words must match, the last one as a prefix.
+    assert _titles(_search(client, auth_headers, q="Milch kau")) == ["Milch kaufen"]
+
+
+def test_search_index_follows_writes(client, auth_headers):
+    task = _create(client, auth_headers, "Steuererklärung abgeben")
+    assert _titles(_search(client, auth_headers, q="steuererklärung"))
+
+    url = f"/tasks/{task['id']}"
+    client.put(url, json={"title": "Fahrrad reparieren"}, headers=auth_headers)
+    assert _titles(_search(client, auth_headers, q="steuererklärung")) == []
+    assert _titles(_search(client, auth_headers, q="fahrrad")) == ["Fahrrad reparieren"]
+
+    client.delete(url, headers=auth_headers)
+    assert _titles(_search(client, auth_headers, q="fahrrad")) == []
+
+
+def test_search_cursor_pagination(client, auth_headers):
+    created = [_create(client, auth_headers, f"Rechnung {i}") for i in range(5)]
+    seen, params = [], {"q": "rechnung", "limit": 2}
+    while True:
+        response = _search(client, auth_headers, **params)
+        seen += [task["id"] for task in response.json()]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+    assert sorted(seen) == sorted(task["id"] for task in created)
+
+
+def test_search_query_is_sanitized(client, auth_headers):
+    _create(client, auth_headers, "Garten NEAR Haus")
+    for q in ['"garten', "garten AND OR", "garten*)(", "owner_id : 1 OR garten"]:
+        response = client.get("/tasks/search", params={"q": q}, headers=auth_headers)
+        assert response.status_code == 200
+    assert _titles(_search(client, auth_headers, q='"garten" ^haus')) == [
+        "Garten NEAR Haus"
+    ]
+    response = client.get("/tasks/search", params={"q": "***"}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_search_on_unsupported_database_is_501(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(task_routes, "SEARCH_DIALECTS", ("postgresql",))
+    response = client.get("/tasks/search", params={"q": "x"}, headers=auth_headers)
+    assert response.status_code == 501
+
+
+def test_postgres_search_index_covers_the_owner():
+    extension, index = search._POSTGRES_DDL[1:]
+    assert extension == "CREATE EXTENSION IF NOT EXISTS btree_gin"
+    assert index.endswith("ON tasks USING gin (owner_id, search_vector)")
+
+    # The migration keeps its own copy of the DDL; it must build the same index.
+    spec = importlib.util.spec_from_file_location(
+        "task_search_migration", MIGRATIONS / "0003_task_search.py"
+    )
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    assert migration.POSTGRES_SEARCH_DDL == search._POSTGRES_DDL
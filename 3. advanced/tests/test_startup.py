@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.security import password_pool
+from app.db.session import engine
+from app.main import app
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+# Generous for slow CI machines; importing used to also connect and run
+# create_all, which is what this guards against creeping back in.
+IMPORT_BUDGET_SECONDS = 3.0
+
+
+def test_cold_import_is_fast_and_does_not_touch_the_database(tmp_path):
+    database = tmp_path / "untouched.db"
+    script = (
+        "import time; started = time.perf_counter(); import app.main; "
+        "print(time.perf_counter() - started)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=PROJECT_DIR,
+        env={**os.environ, "DATABASE_URL": f"sqlite:///{database}"},
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    assert float(result.stdout) < IMPORT_BUDGET_SECONDS
+    assert not database.exists()
+
+
+def test_lifespan_warms_and_disposes_the_pool():
+    engine.dispose()
+    with TestClient(app) as client:
+        assert engine.pool.checkedin() == settings.db_pool_size
+        assert client.get("/health/").status_code == 200
+        email = f"{uuid.uuid4().hex}@example.com"
+        client.post("/auth/register", json={"email": email, "password": "secret123"})
+        assert password_pool._executor is not None
+    assert engine.pool.checkedin() == 0
+    assert password_pool._executor is None
@@ -0,0 +1,37 @@
+import csv
+import io
+import json
+
+
+def test_export_ndjson_and_csv(client, auth_headers, make_auth_headers):
+    client.post(
+        "/tasks/bulk",
+        json={"items": [{"title": "one"}, {"title": 'two, "quoted"', "done": True}]},
+        headers=auth_headers,
+    )
+    client.post("/tasks/", json={"title": "foreign"}, headers=make_auth_headers())
+
+    response = client.get("/tasks/export", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(row["title"], row["done"]) for row in rows] == [
+        ("one", False),
+        ('two, "quoted"', True),
+    ]
+    listed = client.get("/tasks/", headers=auth_headers).json()
+    assert {row["id"] for row in rows} == {task["id"] for task in listed}
+
+    response = client.get(
+        "/tasks/export", params={"format": "csv"}, headers=auth_headers
+    )
+    assert response.headers["content-type"].startswith("text/csv")
+    records = list(csv.DictReader(io.StringIO(response.text)))
+    assert [record["title"] for record in records] == ["one", 'two, "quoted"']
+
+
+def test_export_rejects_unknown_format(client, auth_headers):
+    response = client.get(
+        "/tasks/export", params={"format": "xml"}, headers=auth_headers
+    )
+    assert response.status_code == 422
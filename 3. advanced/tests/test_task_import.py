@@ -0,0 +1,122 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.api.routes import task_import
+from app.core.config import settings
+
+
+def test_import_ndjson_reports_row_errors(client, auth_headers):
+    body = "\n".join(
+        [
+            '{"title": "first"}',
+            '{"title": "second", "done": true}',
+            '{"title": ""}',
+            "not json",
+            "",
+            '{"title": "last"}',
+        ]
+    )
+    response = client.post(
+        "/tasks/import",
+        content=body.encode(),
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["imported"] == 3
+    assert result["failed"] == 2
+    assert [error["line"] for error in result["errors"]] == [3, 4]
+    assert result["rows_per_second"] > 0
+
+    titles = {
+        task["title"] for task in client.get("/tasks/", headers=auth_headers).json()
+    }
+    assert titles == {"first", "second", "last"}
+
+
+def test_import_csv_round_trips_export(client, auth_headers, make_auth_headers):
+    client.post(
+        "/tasks/bulk",
+        json={
+            "items": [
+                {"title": 'multi\nline, "quoted"', "done": True},
+                {"title": "plain"},
+            ]
+        },
+        headers=auth_headers,
+    )
+    exported = client.get(
+        "/tasks/export", params={"format": "csv"}, headers=auth_headers
+    )
+
+    other_headers = make_auth_headers()
+    response = client.post(
+        "/tasks/import",
+        params={"format": "csv"},
+        content=exported.content,
+        headers=other_headers,
+    )
+    assert response.json()["imported"] == 2
+    imported = client.get("/tasks/", headers=other_headers).json()
+    assert {(task["title"], task["done"]) for task in imported} == {
+        ('multi\nline, "quoted"', True),
+        ("plain", False),
+    }
+
+
+def test_import_requires_known_format(client, auth_headers):
+    response = client.post(
+        "/tasks/import",
+        content=b"title\nx\n",
+        headers={**auth_headers, "Content-Type": "application/octet-stream"},
+    )
+    assert response.status_code == 415
+
+
+def test_import_commits_every_chunk(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "import_chunk_size", 2)
+    commits = []
+
+    def count_commit(session):
+        commits.append(session)
+
+    event.listen(Session, "after_commit", count_commit)
+    try:
+        response = client.post(
+            "/tasks/import",
+            content=b"".join(b'{"title": "t%d"}\n' % n for n in range(5)),
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+        )
+    finally:
+        event.remove(Session, "after_commit", count_commit)
+    assert response.json()["imported"] == 5
+    assert len(commits) == 3
+    stats = client.get("/tasks/stats", headers=auth_headers).json()
+    assert stats["total"] == 5
+
+
+def test_import_csv_errors_name_physical_lines(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(task_import, "MAX_RECORD_CHARS", 20)
+    body = "\n".join(
+        [
+            "title,done",
+            '"two\nlines",true',
+            ",false",  # line 4: empty title
+            '"stray quote,false',  # line 5: never closed
+            "after the stray quote,false",
+            "x" * 30 + ",false",
+            "last,true",
+        ]
+    )
+    response = client.post(
+        "/tasks/import",
+        params={"format": "csv"},
+        content=body.encode(),
+        headers=auth_headers,
+    )
+    result = response.json()
+    assert [error["line"] for error in result["errors"]] == [4, 5]
+    titles = {
+        task["title"] for task in client.get("/tasks/", headers=auth_headers).json()
+    }
+    assert titles == {"two\nlines", "x" * 30, "last"}
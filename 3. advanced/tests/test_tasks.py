@@ -0,0 +1,309 @@
+from conftest import QueryCounter
+
+from app.core.config import settings
+
+
+def _create(client, headers, count):
+    return [
+        client.post("/tasks/", json={"title": f"task {i}"}, headers=headers).json()
+        for i in range(count)
+    ]
+
+
+def test_cursor_pagination_walks_all_tasks(client, auth_headers):
+    created = _create(client, auth_headers, 7)
+
+    seen = []
+    params = {"limit": 3}
+    while True:
+        response = client.get("/tasks/", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        seen.extend(task["id"] for task in response.json())
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        params = {"limit": 3, "cursor": next_cursor}
+
+    assert seen == sorted((task["id"] for task in created), reverse=True)
+
+
+def test_cursor_is_stable_under_concurrent_inserts(client, auth_headers):
+    _create(client, auth_headers, 4)
+    first = client.get("/tasks/", params={"limit": 2}, headers=auth_headers)
+    _create(client, auth_headers, 2)
+    second = client.get(
+        "/tasks/",
+        params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]},
+        headers=auth_headers,
+    )
+    first_ids = [task["id"] for task in first.json()]
+    second_ids = [task["id"] for task in second.json()]
+    assert second_ids == [first_ids[-1] - 1, first_ids[-1] - 2]
+
+
+def test_offset_pagination_still_supported(client, auth_headers):
+    _create(client, auth_headers, 3)
+    response = client.get(
+        "/tasks/", params={"limit": 2, "offset": 2}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+
+def test_invalid_cursor_rejected(client, auth_headers):
+    response = client.get(
+        "/tasks/", params={"cursor": "not-a-cursor"}, headers=auth_headers
+    )
+    assert response.status_code == 400
+    response = client.get(
+        "/tasks/", params={"cursor": "abc", "offset": 1}, headers=auth_headers
+    )
+    assert response.status_code == 400
+
+
+def test_bulk_create_update_delete(client, auth_headers):
+    response = client.post(
+        "/tasks/bulk",
+        json={"items": [{"title": "a"}, {"title": "b", "done": True}, {"title": "c"}]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    results = response.json()
+    assert [r["status"] for r in results] == ["created"] * 3
+    assert [r["task"]["title"] for r in results] == ["a", "b", "c"]
+    ids = [r["id"] for r in results]
+
+    response = client.patch(
+        "/tasks/bulk",
+        json={
+            "items": [
+                {"id": ids[0], "done": True},
+                {"id": ids[2], "done": True},
+                {"id": ids[1], "title": "renamed"},
+                {"id": 999_999, "done": True},
+            ]
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["status"] for r in results] == ["updated"] * 3 + ["not_found"]
+    assert results[0]["task"]["done"] and results[1]["task"]["done"]
+    assert results[2]["task"]["title"] == "renamed"
+
+    response = client.request(
+        "DELETE",
+        "/tasks/bulk",
+        json={"ids": [ids[0], ids[1], 999_999]},
+        headers=auth_headers,
+    )
+    assert [r["status"] for r in response.json()] == ["deleted", "deleted", "not_found"]
+    remaining = client.get("/tasks/", headers=auth_headers).json()
+    assert [task["id"] for task in remaining] == [ids[2]]
+
+
+def test_bulk_create_results_follow_request_order(client, auth_headers):
+    items = [{"title": f"item {i}", "done": i % 3 == 0} for i in range(300)]
+    with QueryCounter() as queries:
+        response = client.post(
+            "/tasks/bulk", json={"items": items}, headers=auth_headers
+        )
+    assert response.status_code == 201
+    inserts = [q for q in queries.statements if q.startswith("INSERT INTO tasks ")]
+    assert len(inserts) == 1
+    results = response.json()
+    assert len(results) == len(items)
+    for item, result in zip(items, results):
+        assert result["task"]["title"] == item["title"]
+        assert result["task"]["done"] == item["done"]
+        assert result["id"] == result["task"]["id"]
+
+
+def test_bulk_is_owner_scoped(client, auth_headers, make_auth_headers):
+    task_id = client.post("/tasks/", json={"title": "mine"}, headers=auth_headers)
+    task_id = task_id.json()["id"]
+    other_headers = make_auth_headers()
+
+    response = client.request(
+        "DELETE", "/tasks/bulk", json={"ids": [task_id]}, headers=other_headers
+    )
+    assert response.json() == [{"id": task_id, "status": "not_found", "task": None}]
+    assert client.get(f"/tasks/{task_id}", headers=auth_headers).status_code == 200
+
+
+def test_bulk_batch_size_limit(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_max_items", 2)
+    response = client.post(
+        "/tasks/bulk",
+        json={"items": [{"title": "a"}, {"title": "b"}, {"title": "c"}]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 413
+
+
+def test_single_task_writes(client, auth_headers, make_auth_headers):
+    task = client.post("/tasks/", json={"title": "write"}, headers=auth_headers).json()
+    url = f"/tasks/{task['id']}"
+
+    updated = client.put(url, json={"title": "renamed"}, headers=auth_headers).json()
+    assert updated["title"] == "renamed" and updated["done"] is False
+    assert client.put(url, json={}, headers=auth_headers).json() == updated
+    assert client.patch(f"{url}/complete", headers=auth_headers).json()["done"]
+    assert not client.patch(f"{url}/incomplete", headers=auth_headers).json()["done"]
+
+    other_headers = make_auth_headers()
+    assert (
+        client.put(url, json={"done": True}, headers=other_headers).status_code == 404
+    )
+    assert client.patch(f"{url}/complete", headers=other_headers).status_code == 404
+    assert client.delete(url, headers=other_headers).status_code == 404
+
+    assert client.delete(url, headers=auth_headers).status_code == 204
+    assert client.delete(url, headers=auth_headers).status_code == 404
+
+
+def test_task_etag_and_conditional_get(client, auth_headers):
+    task = _create(client, auth_headers, 1)[0]
+    url = f"/tasks/{task['id']}"
+
+    first = client.get(url, headers=auth_headers)
+    etag = first.headers["ETag"]
+    assert etag == f'"{task["id"]}-1"'
+    cached = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    client.patch(f"{url}/complete", headers=auth_headers)
+    changed = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["version"] == 2
+    assert changed.headers["ETag"] != etag
+
+
+def test_list_etag_changes_with_collection(client, auth_headers, make_auth_headers):
+    _create(client, auth_headers, 2)
+    first = client.get("/tasks/", headers=auth_headers)
+    etag = first.headers["ETag"]
+    conditional = {**auth_headers, "If-None-Match": etag}
+    assert client.get("/tasks/", headers=conditional).status_code == 304
+    # Another page of the same collection has its own validator.
+    assert client.get("/tasks/?limit=1", headers=conditional).status_code == 200
+
+    # Writes by other users leave the collection untouched.
+    _create(client, make_auth_headers(), 1)
+    assert client.get("/tasks/", headers=conditional).status_code == 304
+
+    _create(client, auth_headers, 1)
+    assert client.get("/tasks/", headers=conditional).status_code == 200
+
+
+def test_if_match_guards_writes(client, auth_headers):
+    task = _create(client, auth_headers, 1)[0]
+    url = f"/tasks/{task['id']}"
+    etag = client.get(url, headers=auth_headers).headers["ETag"]
+
+    updated = client.put(
+        url, json={"title": "mine"}, headers={**auth_headers, "If-Match": etag}
+    )
+    assert updated.status_code == 200
+    assert updated.headers["ETag"] != etag
+
+    stale = {**auth_headers, "If-Match": etag}
+    assert client.put(url, json={"title": "lost"}, headers=stale).status_code == 412
+    assert client.delete(url, headers=stale).status_code == 412
+    assert client.get(url, headers=auth_headers).json()["title"] == "mine"
+
+    fresh = {**auth_headers, "If-Match": updated.headers["ETag"]}
+    assert client.delete(url, headers=fresh).status_code == 204
+    assert client.delete(url, headers=fresh).status_code == 404
+
+
+def _stats(client, headers):
+    return client.get("/tasks/stats", headers=headers).json()
+
+
+def test_stats_follow_every_write_path(client, auth_headers):
+    assert _stats(client, auth_headers) == {"total": 0, "done": 0, "pending": 0}
+
+    a, b = _create(client, auth_headers, 2)
+    bulk = client.post(
+        "/tasks/bulk",
+        json={"items": [{"title": "x", "done": True}, {"title": "y"}]},
+        headers=auth_headers,
+    ).json()
+    client.post(
+        "/tasks/import",
+        content=b'{"title": "i", "done": true}\n',
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert _stats(client, auth_headers) == {"total": 5, "done": 2, "pending": 3}
+
+    client.patch(f"/tasks/{a['id']}/complete", headers=auth_headers)
+    client.patch(f"/tasks/{a['id']}/complete", headers=auth_headers)  # no-op
+    client.put(f"/tasks/{b['id']}", json={"done": True}, headers=auth_headers)
+    client.patch(
+        "/tasks/bulk",
+        json={
+            "items": [
+                {"id": bulk[0]["id"], "done": False},
+                {"id": a["id"], "done": False},
+            ]
+        },
+        headers=auth_headers,
+    )
+    assert _stats(client, auth_headers) == {"total": 5, "done": 2, "pending": 3}
+
+    client.delete(f"/tasks/{b['id']}", headers=auth_headers)
+    client.request(
+        "DELETE", "/tasks/bulk", json={"ids": [a["id"]]}, headers=auth_headers
+    )
+    assert _stats(client, auth_headers) == {"total": 3, "done": 1, "pending": 2}
+
+    listed = client.get(
+        "/tasks/",
+        params={"status_filter": "pending", "include_total": True, "limit": 1},
+        headers=auth_headers,
+    )
+    assert listed.headers["X-Total-Count"] == "2"
+    assert "X-Total-Count" not in client.get("/tasks/", headers=auth_headers).headers
+
+
+def test_rebuild_task_counters_fixes_drift(client, auth_headers, capsys):
+    from sqlalchemy import update
+
+    from app.db.session import SessionLocal
+    from app.db.task_counters import collections_table
+    from app.scripts import rebuild_task_counters
+
+    _create(client, auth_headers, 2)
+    user_id = client.get("/users/me", headers=auth_headers).json()["id"]
+    with SessionLocal() as db:
+        db.execute(
+            update(collections_table)
+            .where(collections_table.c.owner_id == user_id)
+            .values(total=7)
+        )
+        db.commit()
+
+    assert rebuild_task_counters.main(["--verify"]) == 1
+    assert f"owner {user_id}: stored total=7" in capsys.readouterr().out
+    assert rebuild_task_counters.main([]) == 0
+    assert rebuild_task_counters.main(["--verify"]) == 0
+    assert _stats(client, auth_headers)["total"] == 2
+
+
+def test_fast_json_list_is_byte_identical(client, auth_headers, monkeypatch):
+    _create(client, auth_headers, 3)
+    title = 'ä "quoted" \\ \u2028 😀'
+    client.post("/tasks/", json={"title": title, "done": True}, headers=auth_headers)
+    params = {"limit": 3, "include_total": True}
+
+    default = client.get("/tasks/", params=params, headers=auth_headers)
+    monkeypatch.setattr(settings, "fast_json", True)
+    fast = client.get("/tasks/", params=params, headers=auth_headers)
+
+    assert fast.status_code == 200
+    assert fast.content == default.content
+    assert fast.headers["content-type"] == default.headers["content-type"]
+    for header in ("ETag", "X-Next-Cursor", "X-Total-Count"):
+        assert fast.headers[header] == default.headers[header]
@@ -0,0 +1,94 @@
+from conftest import QueryCounter
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.archive import archive_completed_tasks
+from app.db import user_deletion
+from app.db.session import SessionLocal
+from app.db.user_deletion import archived_table, collections_table, tasks_table
+
+
+def _user_id(client, headers) -> int:
+    return client.get("/users/me", headers=headers).json()["id"]
+
+
+def _owned_rows(user_id):
+    with SessionLocal() as db:
+        return [
+            db.scalar(select(func.count()).where(table.c.owner_id == user_id))
+            for table in (tasks_table, archived_table, collections_table)
+        ]
+
+
+def test_admin_routes_need_a_superuser(client, auth_headers, make_auth_headers):
+    victim_id = _user_id(client, make_auth_headers())
+    response = client.delete(f"/users/{victim_id}", headers=auth_headers)
+    assert response.status_code == 403
+    response = client.patch(f"/users/{victim_id}/deactivate", headers=auth_headers)
+    assert response.status_code == 403
+
+
+def test_deactivate_user(client, admin_headers, auth_headers):
+    user_id = _user_id(client, auth_headers)
+    response = client.patch(f"/users/{user_id}/deactivate", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["is_active"] is False
+    # The cached token is dropped with the flush.
+    assert client.get("/users/me", headers=auth_headers).status_code == 400
+
+    admin_id = _user_id(client, admin_headers)
+    response = client.patch(f"/users/{admin_id}/deactivate", headers=admin_headers)
+    assert response.status_code == 400
+    assert client.delete("/users/999999", headers=admin_headers).status_code == 404
+
+
+def test_delete_user_with_few_tasks(client, admin_headers, auth_headers):
+    user_id = _user_id(client, auth_headers)
+    client.post("/tasks/", json={"title": "mine"}, headers=auth_headers)
+
+    response = client.delete(f"/users/{user_id}", headers=admin_headers)
+    assert response.status_code == 204
+    assert _owned_rows(user_id) == [0, 0, 0]
+    assert client.get("/users/me", headers=auth_headers).status_code == 401
+
+
+def test_large_deletions_run_in_batches_in_the_background(
+    client, admin_headers, auth_headers, monkeypatch
+):
+    monkeypatch.setattr(settings, "user_delete_batch_size", 2)
+    monkeypatch.setattr(settings, "user_delete_batch_pause_ms", 0)
+    user_id = _user_id(client, auth_headers)
+    items = [{"title": f"task {i}", "done": i < 3} for i in range(7)]
+    client.post("/tasks/bulk", json={"items": items}, headers=auth_headers)
+    archive_completed_tasks(SessionLocal, older_than_days=-1, batch_size=100)
+    assert _owned_rows(user_id) == [4, 3, 1]
+
+    # TestClient runs background tasks before it returns the response.
+    with QueryCounter() as queries:
+        response = client.delete(f"/users/{user_id}", headers=admin_headers)
+    assert response.status_code == 202
+    assert _owned_rows(user_id) == [0, 0, 0]
+    deletes = [sql for sql in queries.statements if sql.startswith("DELETE FROM tasks")]
+    assert len(deletes) == 3  # 2 + 2 + 0 rows
+    assert client.get("/users/me", headers=auth_headers).status_code == 401
+
+
+def test_delete_relies_on_database_cascade(client, auth_headers):
+    user_id = _user_id(client, auth_headers)
+    client.post("/tasks/", json={"title": "cascaded"}, headers=auth_headers)
+    # Its own engine: the pragma sticks to pooled connections.
+    engine = create_engine(settings.database_url)
+
+    @event.listens_for(engine, "connect")
+    def _enforce_foreign_keys(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    try:
+        cascading = sessionmaker(bind=engine)
+        with cascading() as db:
+            assert user_deletion.cascades_deletes(db)
+        assert user_deletion.delete_user(cascading, user_id, batch_size=1) == 0
+    finally:
+        engine.dispose()
+    assert _owned_rows(user_id) == [0, 0, 0]
@@ -0,0 +1,32 @@
+import importlib
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+TIERS = {
+    "easy": (ROOT / "1. easy", "main"),
+    "intermediate": (ROOT / "2. intermediate", "main"),
+    "advanced": (ROOT / "3. advanced", "app.main"),
+}
+
+# Module names the tiers share ("main", "models", ...) or own ("app").
+_TIER_MODULES = ("main", "models", "schemas", "database", "store", "app")
+
+
+def load_app(tier: str, workdir: Path):
+    """Import one tier's FastAPI app in-process, with its database in workdir."""
+    path, module_name = TIERS[tier]
+    for name in list(sys.modules):
+        if name.split(".", 1)[0] in _TIER_MODULES:
+            del sys.modules[name]
+    sys.path.insert(0, str(path))
+    # intermediate uses ./tasks.db, advanced reads DATABASE_URL.
+    os.chdir(workdir)
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir / 'bench.db'}")
+    # Fresh database per run: let the advanced lifespan create the schema.
+    os.environ.setdefault("DB_AUTO_CREATE", "true")
+    # All simulated clients share one IP and would trip the auth limit.
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    return importlib.import_module(module_name).app
@@ -0,0 +1,85 @@
+"""Benchmark: task creates per second with and without GROUP_COMMIT_ENABLED.
+
+    python -m benchmarks.group_commit --threads 32 --writes 4000
+    python -m benchmarks.group_commit --synchronous FULL   # fsync on every commit
+
+Both runs use the same write path as POST /tasks (insert + counter upsert)
+from a pool of request-like threads against a fresh SQLite database, or
+DATABASE_URL if set.
+"""
+import argparse
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from time import perf_counter
+
+from benchmarks.apps import load_app
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--writes", type=int, default=4000)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--synchronous", default="NORMAL", help="SQLite PRAGMA")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SQLITE_SYNCHRONOUS", args.synchronous)
+    os.environ.setdefault("DB_POOL_SIZE", str(args.threads))
+    load_app("advanced", Path(tempfile.mkdtemp(prefix="bench-group-commit-")))
+    from sqlalchemy import insert
+
+    from app.api.routes.tasks import write_new_task
+    from app.core.config import settings
+    from app.db import group_commit
+    from app.db.group_commit import GroupCommitter, commit_write
+    from app.db.session import SessionLocal, create_tables
+    from app.models.user import User
+    from app.schemas.task import TaskCreate
+
+    create_tables()
+    with SessionLocal() as db:
+        owner_ids = [
+            db.execute(
+                insert(User.__table__)
+                .values(email=f"bench{i}@example.com", hashed_password="x")
+                .returning(User.__table__.c.id)
+            ).scalar_one()
+            for i in range(args.threads)
+        ]
+        db.commit()
+
+    def create(i: int) -> None:
+        with SessionLocal() as db:
+            owner_id = owner_ids[i % len(owner_ids)]
+            commit_write(db, write_new_task, owner_id, TaskCreate(title=f"Task {i}"))
+
+    def measure(enabled: bool) -> float:
+        settings.group_commit_enabled = enabled
+        started = perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            list(pool.map(create, range(args.writes)))
+        return args.writes / (perf_counter() - started)
+
+    committer = GroupCommitter(None, args.max_batch, args.max_wait_ms / 1000)
+    group_commit.group_committer = committer
+    single = measure(False)
+    grouped = measure(True)
+    committer.close()
+
+    print(
+        f"{args.writes} creates, {args.threads} threads, "
+        f"synchronous={settings.sqlite_synchronous}"
+    )
+    print(f"  one commit per write: {single:9.0f} writes/s")
+    print(
+        f"  group commit:         {grouped:9.0f} writes/s "
+        f"({committer.writes / committer.commits:.1f} writes per commit)"
+    )
+    print(f"  speedup: {grouped / single:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
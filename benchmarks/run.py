@@ -0,0 +1,183 @@
+"""Load test for the three API tiers.
+
+    python -m benchmarks.run --tier all --output results.json
+    python -m benchmarks.run --tier advanced --url http://127.0.0.1:8000
+
+Baselines are machine specific and not committed. Save one with --output on
+the reference machine, then compare later runs (same parameters) against it:
+
+    python -m benchmarks.run --tier advanced --output benchmarks/baseline.json
+    python -m benchmarks.run --tier advanced --baseline benchmarks/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from benchmarks.apps import ROOT, TIERS, load_app
+from benchmarks.stats import compare, summarize
+from benchmarks.workload import TIER_CLASSES, run_workload
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tier", choices=[*TIERS, "all"], default="all")
+    parser.add_argument(
+        "--url", help="Benchmark a running server instead of in-process"
+    )
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--tasks", type=int, default=1000, help="Seeded tasks in total")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Compare against these results")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed relative regression vs. the baseline (default 0.2 = 20%%)",
+    )
+    args = parser.parse_args(argv)
+    if args.baseline and not args.baseline.is_file():
+        parser.error(
+            f"baseline {args.baseline} not found; create it first with "
+            f"--output {args.baseline}"
+        )
+    return args
+
+
+async def _benchmark(http: httpx.AsyncClient, tier: str, args) -> dict:
+    runner = TIER_CLASSES[tier](http)
+    clients = await runner.seed(args.users, args.tasks)
+    recorder, elapsed = await run_workload(
+        runner, clients, args.requests, args.concurrency, args.seed
+    )
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(args.requests / elapsed, 1),
+        "ops": {
+            op: summarize(latencies, recorder.errors.get(op, 0))
+            for op, latencies in sorted(recorder.latencies.items())
+        },
+    }
+
+
+async def benchmark_in_process(tier: str, args) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix=f"bench-{tier}-"))
+    app = load_app(tier, workdir)
+    # ASGITransport does not send lifespan events, so run them here.
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as http:
+            return await _benchmark(http, tier, args)
+
+
+async def benchmark_url(tier: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits) as http:
+        return await _benchmark(http, tier, args)
+
+
+def run_tier_subprocess(tier: str, argv: list[str]) -> dict:
+    # Every tier gets a fresh interpreter: they share module names ("main",
+    # "models", ...) and the advanced settings are read once at import.
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as handle:
+        output = Path(handle.name)
+    command = [sys.executable, "-m", "benchmarks.run", *argv, "--tier", tier]
+    command += ["--output", str(output)]
+    subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+    try:
+        return json.loads(output.read_text())["results"][tier]
+    finally:
+        output.unlink()
+
+
+def _strip_options(argv: list[str], *names: str) -> list[str]:
+    stripped, skip = [], False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in names:
+            skip = True
+        elif arg.split("=", 1)[0] not in names:
+            stripped.append(arg)
+    return stripped
+
+
+def print_report(results: dict) -> None:
+    for tier, result in results.items():
+        print(
+            f"\n{tier}: {result['throughput_rps']} req/s "
+            f"({result['elapsed_seconds']} s)"
+        )
+        print(
+            f"  {'op':<10}{'count':>7}{'err':>5}"
+            f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        )
+        for op, s in result["ops"].items():
+            print(
+                f"  {op:<10}{s['count']:>7}{s['errors']:>5}"
+                f"{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}{s['p99_ms']:>10.2f}"
+            )
+
+
+def main(argv=None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    args = parse_args(argv)
+    tiers = list(TIERS) if args.tier == "all" else [args.tier]
+
+    if args.url:
+        results = {tier: asyncio.run(benchmark_url(tier, args)) for tier in tiers}
+    elif len(tiers) == 1:
+        cwd = os.getcwd()
+        try:
+            results = {tiers[0]: asyncio.run(benchmark_in_process(tiers[0], args))}
+        finally:
+            os.chdir(cwd)
+    else:
+        passthrough = _strip_options(argv, "--tier", "--output", "--baseline")
+        results = {tier: run_tier_subprocess(tier, passthrough) for tier in tiers}
+
+    print_report(results)
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "url": args.url,
+            "users": args.users,
+            "tasks": args.tasks,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions against", args.baseline)
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print("\nNo regressions against", args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Microbenchmark: default vs. FAST_JSON serialization of a task list page.
+
+    python -m benchmarks.serialization --rows 100 --iterations 500
+
+Both paths run the same list query against a seeded SQLite database and end
+with the response body bytes; the script checks they are identical.
+"""
+import argparse
+import asyncio
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import List
+
+from benchmarks.apps import load_app
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    load_app("advanced", Path(tempfile.mkdtemp(prefix="bench-serialization-")))
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+    from sqlalchemy import insert
+
+    from app.api.routes.tasks import list_tasks_query, tasks_table
+    from app.core.fast_json import dump_task_rows, only_task_read_columns
+    from app.db.session import SessionLocal, create_tables
+    from app.models.user import User
+    from app.schemas.task import TaskRead
+
+    create_tables()
+    with SessionLocal() as db:
+        owner_id = db.execute(
+            insert(User.__table__)
+            .values(email="bench@example.com", hashed_password="x")
+            .returning(User.__table__.c.id)
+        ).scalar_one()
+        db.execute(
+            insert(tasks_table),
+            [
+                {"title": f"Task {i} – äöü", "done": i % 3 == 0, "owner_id": owner_id}
+                for i in range(args.rows)
+            ],
+        )
+        db.commit()
+
+    query = list_tasks_query(owner_id, None, args.rows, 0, None)
+    field = create_response_field(name="Response_list_tasks", type_=List[TaskRead])
+
+    async def default_body(db) -> bytes:
+        tasks = db.execute(query).scalars().all()
+        content = await serialize_response(field=field, response_content=tasks)
+        return JSONResponse(content).body
+
+    async def fast_body(db) -> bytes:
+        return dump_task_rows(
+            db.execute(only_task_read_columns(query)).all()
+        )
+
+    async def measure(render) -> tuple[float, bytes]:
+        with SessionLocal() as db:
+            body = await render(db)
+            started = perf_counter()
+            for _ in range(args.iterations):
+                await render(db)
+                db.expunge_all()  # like a fresh request session
+            return (perf_counter() - started) / args.iterations, body
+
+    default_seconds, default_bytes = asyncio.run(measure(default_body))
+    fast_seconds, fast_bytes = asyncio.run(measure(fast_body))
+    assert default_bytes == fast_bytes, "fast path output differs"
+
+    print(f"{args.rows} tasks per page, {args.iterations} iterations")
+    print(f"  default (ORM + TaskRead + json): {default_seconds * 1e6:9.1f} µs/page")
+    print(f"  fast    (Core rows + orjson):    {fast_seconds * 1e6:9.1f} µs/page")
+    print(f"  speedup: {default_seconds / fast_seconds:.2f}x, bodies identical")
+
+
+if __name__ == "__main__":
+    main()
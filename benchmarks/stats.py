@@ -0,0 +1,47 @@
+import math
+from typing import Sequence
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: Sequence[float], errors: int) -> dict:
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "errors": errors,
+        "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return human readable regressions of current vs. baseline results."""
+    regressions = []
+    for tier, result in current.items():
+        base = baseline.get(tier)
+        if not base:
+            continue
+        floor = base["throughput_rps"] * (1 - tolerance)
+        if result["throughput_rps"] < floor:
+            regressions.append(
+                f"{tier}: throughput {result['throughput_rps']:.1f} rps "
+                f"< {floor:.1f} (baseline {base['throughput_rps']:.1f})"
+            )
+        for op, summary in result["ops"].items():
+            base_op = base["ops"].get(op)
+            if not base_op or not base_op["count"]:
+                continue
+            ceiling = base_op["p95_ms"] * (1 + tolerance)
+            if summary["p95_ms"] > ceiling:
+                regressions.append(
+                    f"{tier}/{op}: p95 {summary['p95_ms']:.2f} ms "
+                    f"> {ceiling:.2f} (baseline {base_op['p95_ms']:.2f})"
+                )
+    return regressions
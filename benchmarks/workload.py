@@ -0,0 +1,204 @@
+import asyncio
+import random
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Optional
+
+import httpx
+
+# Relative weights of the operations in the mixed workload. "login" only
+# exists in the advanced tier and is dropped for the others.
+OPERATION_WEIGHTS = {
+    "list": 35,
+    "filter": 15,
+    "create": 15,
+    "update": 12,
+    "complete": 10,
+    "delete": 8,
+    "login": 5,
+}
+
+PASSWORD = "benchmark-password"
+SEED_BATCH = 500
+
+
+@dataclass
+class Client:
+    """One simulated user: auth headers plus the task ids it owns."""
+
+    email: Optional[str] = None
+    headers: dict = field(default_factory=dict)
+    task_ids: list[int] = field(default_factory=list)
+
+
+@dataclass
+class Recorder:
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+
+    def record(self, op: str, seconds: float, ok: bool) -> None:
+        self.latencies.setdefault(op, []).append(seconds)
+        if not ok:
+            self.errors[op] = self.errors.get(op, 0) + 1
+
+
+class Tier:
+    """URL layout of one API tier."""
+
+    authenticated = False
+    tasks_path = "/tasks"
+
+    def __init__(self, http: httpx.AsyncClient):
+        self.http = http
+
+    def task_path(self, task_id: int) -> str:
+        return f"{self.tasks_path.rstrip('/')}/{task_id}"
+
+    async def seed(self, users: int, tasks: int) -> list[Client]:
+        client = Client()
+        for index in range(tasks):
+            response = await self.http.post(
+                self.tasks_path, json={"title": f"seed {index}", "done": index % 3 == 0}
+            )
+            response.raise_for_status()
+            client.task_ids.append(response.json()["id"])
+        return [client]
+
+    async def login(self, client: Client) -> Optional[httpx.Response]:
+        """Tiers without auth have nothing to log in to; run_workload never
+        picks "login" for them."""
+        return None
+
+    async def list(self, client: Client) -> httpx.Response:
+        return await self.http.get(self.tasks_path, headers=client.headers)
+
+    async def filter(self, client: Client) -> httpx.Response:
+        return await self.http.get(
+            f"{self.tasks_path.rstrip('/')}/status/pending", headers=client.headers
+        )
+
+
+class SimpleTier(Tier):
+    pass
+
+
+class AdvancedTier(Tier):
+    authenticated = True
+    tasks_path = "/tasks/"
+
+    async def seed(self, users: int, tasks: int) -> list[Client]:
+        clients = []
+        per_user = max(1, tasks // users)
+        for index in range(users):
+            client = Client(email=f"bench{index}@example.com")
+            response = await self.http.post(
+                "/auth/register", json={"email": client.email, "password": PASSWORD}
+            )
+            response.raise_for_status()
+            response = await self.login(client)
+            response.raise_for_status()
+            for start in range(0, per_user, SEED_BATCH):
+                items = [
+                    {"title": f"seed {n}", "done": n % 3 == 0}
+                    for n in range(start, min(per_user, start + SEED_BATCH))
+                ]
+                response = await self.http.post(
+                    "/tasks/bulk", json={"items": items}, headers=client.headers
+                )
+                response.raise_for_status()
+                client.task_ids += [row["id"] for row in response.json()]
+            clients.append(client)
+        return clients
+
+    async def login(self, client: Client) -> httpx.Response:
+        response = await self.http.post(
+            "/auth/token", data={"username": client.email, "password": PASSWORD}
+        )
+        if response.status_code == 200:
+            token = response.json()["access_token"]
+            client.headers = {"Authorization": f"Bearer {token}"}
+        return response
+
+    async def list(self, client: Client) -> httpx.Response:
+        return await self.http.get(
+            self.tasks_path, params={"limit": 50}, headers=client.headers
+        )
+
+    async def filter(self, client: Client) -> httpx.Response:
+        return await self.http.get(
+            self.tasks_path,
+            params={"status_filter": "pending", "limit": 50},
+            headers=client.headers,
+        )
+
+
+TIER_CLASSES = {
+    "easy": SimpleTier,
+    "intermediate": SimpleTier,
+    "advanced": AdvancedTier,
+}
+
+
+async def _run_operation(tier: Tier, client: Client, op: str, rng: random.Random):
+    if op in ("update", "complete", "delete") and not client.task_ids:
+        op = "create"
+    if op == "login":
+        return op, await tier.login(client)
+    if op == "list":
+        return op, await tier.list(client)
+    if op == "filter":
+        return op, await tier.filter(client)
+    if op == "create":
+        response = await tier.http.post(
+            tier.tasks_path,
+            json={"title": f"task {rng.random():.6f}"},
+            headers=client.headers,
+        )
+        if response.status_code == 201:
+            client.task_ids.append(response.json()["id"])
+        return op, response
+    if op == "update":
+        task_id = rng.choice(client.task_ids)
+        return op, await tier.http.put(
+            tier.task_path(task_id),
+            json={"title": f"updated {rng.random():.6f}"},
+            headers=client.headers,
+        )
+    if op == "complete":
+        task_id = rng.choice(client.task_ids)
+        return op, await tier.http.patch(
+            f"{tier.task_path(task_id)}/complete", headers=client.headers
+        )
+    task_id = client.task_ids.pop(rng.randrange(len(client.task_ids)))
+    return op, await tier.http.delete(tier.task_path(task_id), headers=client.headers)
+
+
+async def run_workload(
+    tier: Tier,
+    clients: list[Client],
+    requests: int,
+    concurrency: int,
+    seed: int,
+) -> tuple[Recorder, float]:
+    """Run `requests` mixed operations with `concurrency` workers."""
+    weights = dict(OPERATION_WEIGHTS)
+    if not tier.authenticated:
+        weights.pop("login")
+    ops, op_weights = list(weights), list(weights.values())
+    recorder = Recorder()
+    remaining = requests
+
+    async def worker(index: int) -> None:
+        nonlocal remaining
+        rng = random.Random(seed * 1000 + index)
+        while remaining > 0:
+            remaining -= 1
+            client = clients[rng.randrange(len(clients))]
+            op = rng.choices(ops, op_weights)[0]
+            started = perf_counter()
+            op, response = await _run_operation(tier, client, op, rng)
+            recorder.record(op, perf_counter() - started, response.status_code < 400)
+
+    started = perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    return recorder, perf_counter() - started